@@ -18,12 +18,11 @@ from datetime import datetime
 import requests
 import time
 import subprocess
-import importlib
-import inspect
 from src.data.timeseries_storage import TimeSeriesStorage
+from src.data.indicator_engine import IncrementalIndicators, INDICATOR_COLUMNS
 from src.config.exchange_api import MEXCAPI
 from src.data.advanced_database import AdvancedDatabase
-from src.analysis.forecasting import ForecastingEngine
+from src.analysis._discovery import discover_modules
 from src.data.minute_data_collector import MinuteDataCollector
 
 
@@ -46,6 +45,17 @@ DEFAULT_SYMBOLS = [
 ]
 
 
+# 時間足ごとの1本あたりの分数
+INTERVAL_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '1h': 60,
+    '4h': 240,
+    '1d': 1440
+}
+
+
 # 用語説明の辞書
 GLOSSARY = {
     "ローソク足": """
@@ -213,40 +223,20 @@ def discover_analysis_tools():
         if not dir_path.exists():
             continue
 
-        for py_file in dir_path.glob('*.py'):
-            # __init__.pyや内部モジュールはスキップ
-            if py_file.stem.startswith('_'):
+        # importせずにソースから検出（torch等の重い依存は実行時まで読み込まない）
+        for stem, info in discover_modules(dir_path).items():
+            if 'error' in info or not info['classes']:
                 continue
 
-            module_name = f"{module_prefix}.{py_file.stem}"
+            # モジュールのdocstringから説明を取得
+            module_doc = info['docstring'] or stem
 
-            try:
-                # モジュールをインポート
-                module = importlib.import_module(module_name)
-
-                # クラスを検出
-                classes = []
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    # 外部ライブラリのクラスを除外
-                    if obj.__module__ == module_name:
-                        classes.append({
-                            'name': name,
-                            'docstring': inspect.getdoc(obj) or '説明なし'
-                        })
-
-                if classes:
-                    # モジュールのdocstringから説明を取得
-                    module_doc = inspect.getdoc(module) or py_file.stem
-
-                    tools[py_file.stem] = {
-                        'path': str(py_file.relative_to(analysis_dir.parent)),
-                        'module': module_name,
-                        'classes': classes,
-                        'description': module_doc.split('\n')[0] if module_doc else py_file.stem
-                    }
-            except Exception as e:
-                # インポートエラーは無視（依存関係の問題など）
-                pass
+            tools[stem] = {
+                'path': str(Path(info['path']).relative_to(analysis_dir.parent)),
+                'module': f"{module_prefix}.{stem}",
+                'classes': info['classes'],
+                'description': module_doc.split('\n')[0]
+            }
 
     return tools
 
@@ -274,10 +264,35 @@ def get_available_files():
     return files
 
 
-def load_data(symbol: str, interval: str):
+def load_data(symbol: str, interval: str, start_date=None):
     """データ読み込み"""
     storage = get_storage()
-    return storage.load_price_data(symbol, interval)
+    return storage.load_price_data(symbol, interval, start_date=start_date)
+
+
+def get_display_start(symbol: str, interval: str, bars: int):
+    """
+    直近N本の表示に必要な1分足の読み込み開始時刻
+
+    最終タイムスタンプから逆算し、表示範囲外の期間は読み込まない
+
+    Args:
+        symbol: 銘柄
+        interval: 表示する時間足
+        bars: 表示本数
+
+    Returns:
+        pd.Timestamp（データがなければNone）
+    """
+    storage = get_storage()
+    last_timestamp = storage.get_last_timestamp(symbol, '1m')
+
+    if last_timestamp is None:
+        return None
+
+    # 先頭の足が途中から始まる分、1本多めに読む
+    minutes = INTERVAL_MINUTES.get(interval, 1) * (bars + 1)
+    return last_timestamp - pd.Timedelta(minutes=minutes)
 
 
 def fetch_latest_data(symbol: str):
@@ -388,30 +403,26 @@ def fetch_and_save_news(symbol: str):
         return False, f"❌ エラー: {str(e)}"
 
 
-def calculate_indicators(df, storage):
-    """テクニカル指標計算"""
+def calculate_indicators(df, storage, symbol: str = None, interval: str = None):
+    """
+    テクニカル指標計算
+
+    1分足は保存時に差分更新された指標（全履歴から計算済み）を読むだけにする。
+    まだ指標がない・表示範囲をカバーしていない場合と、変換後の時間足はここで計算する。
+    """
     if df.empty:
         return df
 
-    # RSI
-    df['RSI'] = storage.calculate_rsi(df, period=14)
+    if symbol and interval == '1m':
+        precomputed = storage.load_indicators(symbol, '1m',
+                                              start_date=df.index[0], end_date=df.index[-1])
+        if not precomputed.empty and df.index.isin(precomputed.index).all():
+            return df.join(precomputed[INDICATOR_COLUMNS])
 
-    # MACD
-    macd, signal, hist = storage.calculate_macd(df)
-    df['MACD'] = macd
-    df['MACD_Signal'] = signal
-    df['MACD_Hist'] = hist
-
-    # Bollinger Bands
-    bb_mid, bb_upper, bb_lower = storage.calculate_bollinger_bands(df)
-    df['BB_Mid'] = bb_mid
-    df['BB_Upper'] = bb_upper
-    df['BB_Lower'] = bb_lower
-
-    # 移動平均線
-    df['SMA_20'] = storage.calculate_moving_average(df, window=20)
-    df['SMA_50'] = storage.calculate_moving_average(df, window=50)
-    df['EMA_20'] = storage.calculate_ema(df, span=20)
+    # RSI（Wilder）/ MACD / Bollinger Bands / 移動平均線（保存時の指標と同じ計算）
+    indicators, _ = IncrementalIndicators().compute(df['close'])
+    for column in INDICATOR_COLUMNS:
+        df[column] = indicators[column]
 
     return df
 
@@ -598,14 +609,18 @@ def show_forecast(df, symbol):
     # 予測実行ボタン
     if st.button("🔮 7日間の価格とリスクを予測", key="run_forecast"):
         with st.spinner("予測計算中...（20-30秒かかります）"):
-            engine = ForecastingEngine()
+            # statsmodels / arch は読み込みが重いので予測実行時にimport
+            from src.analysis.forecasting import ForecastingEngine
 
             # 全データを読み込み（予測精度向上のため）
             storage = get_storage()
             full_df = storage.load_price_data(symbol, '1d')
 
+            # 選択したARIMA次数は銘柄ごとにキャッシュし、新しいデータがたまるまで再利用
+            engine = ForecastingEngine(stats_dir=storage.stats_dir)
+
             if len(full_df) >= 100:
-                result = engine.combined_forecast(full_df, periods=7)
+                result = engine.combined_forecast(full_df, periods=7, symbol=symbol, interval='1d')
 
                 # 予測説明
                 st.markdown(engine.explain_forecast(result))
@@ -685,6 +700,17 @@ def show_forecast(df, symbol):
                         forecast_df['下限（95%）'] = [f"${p:,.2f}" for p in result['price_forecast']['conf_int_lower']]
                         forecast_df['上限（95%）'] = [f"${p:,.2f}" for p in result['price_forecast']['conf_int_upper']]
 
+                    # 学習済みのGRUモデルがあれば併記（ダッシュボードでは学習しない。学習はバッチ予測で行う）
+                    try:
+                        from src.analysis.model_registry import ModelRegistry
+                        gru_engine = ModelRegistry(storage.data_dir).load(symbol, '1d', lookback=60, horizon=7)
+                    except ImportError:
+                        gru_engine = None  # torch未インストール
+
+                    if gru_engine is not None and len(full_df) >= gru_engine.lookback:
+                        gru_result = gru_engine.forecast_batch({None: full_df}, periods=7)[None]
+                        forecast_df['GRU予測'] = [f"${p:,.2f}" for p in gru_result['forecast']]
+
                     st.dataframe(forecast_df, width='stretch')
 
                 # ボラティリティ予測
@@ -1203,7 +1229,8 @@ def main():
 
     # データ読み込み（1分足を変換）
     storage = get_storage()
-    df_1m = load_data(selected_symbol, '1m')
+    start_date = get_display_start(selected_symbol, selected_interval, limit)
+    df_1m = load_data(selected_symbol, '1m', start_date=start_date)
 
     if df_1m.empty:
         st.error(f"❌ {selected_symbol}の1分足データがありません")
@@ -1237,7 +1264,7 @@ def main():
             df = df_1m
 
     # データ情報表示
-    st.sidebar.write(f"元データ（1m）: {len(df_1m):,}件")
+    st.sidebar.write(f"読込データ（1m）: {len(df_1m):,}件")
     st.sidebar.write(f"変換後（{selected_interval}）: {len(df):,}件")
     if selected_interval != '1m':
         st.sidebar.caption(f"✅ 1分足から{interval_labels[selected_interval]}に変換済み")
@@ -1246,7 +1273,7 @@ def main():
     df = df.tail(limit)
 
     # テクニカル指標計算
-    df = calculate_indicators(df, storage)
+    df = calculate_indicators(df, storage, selected_symbol, selected_interval)
 
     # 統計情報
     show_statistics(df, selected_symbol)
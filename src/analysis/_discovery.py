@@ -0,0 +1,157 @@
+"""
+分析ツール・指標プラグインの静的検出（キャッシュ付き）
+
+モジュールをimportせずに、ソースのAST（構文木）から
+docstring・クラス・関数・メタデータ定数（INDICATOR_NAME 等）を読み取る。
+torch や statsmodels を使うモジュールも、一覧表示の段階では読み込まない。
+
+検出結果はディレクトリごとの _discovery.json に更新時刻・サイズと一緒に保存し、
+次回以降は変更されたファイルだけを解析し直す。
+
+    src/analysis/_discovery.json
+    src/analysis/indicators/_discovery.json
+"""
+
+import os
+import ast
+import json
+from pathlib import Path
+from typing import Dict
+
+
+CACHE_FILENAME = '_discovery.json'
+
+# キャッシュの形式バージョン（解析内容を変えたら上げる → 全ファイル再解析）
+CACHE_VERSION = 1
+
+
+def scan_module(path: Path) -> Dict:
+    """
+    モジュールを静的に解析
+
+    Args:
+        path: .py ファイルのパス
+
+    Returns:
+        {
+            'docstring': モジュールのdocstring,
+            'classes': [{'name', 'docstring'}],  # トップレベルで定義されたクラス
+            'functions': [関数名],                # トップレベルで定義された関数
+            'constants': {名前: 値},              # リテラルで書かれた大文字の定数
+            'dynamic': [名前],                    # 大文字の定数のうち、リテラルでないもの
+        }
+
+    Raises:
+        SyntaxError: 構文エラーのとき
+    """
+    source = Path(path).read_text(encoding='utf-8')
+    tree = ast.parse(source, filename=str(path))
+
+    info = {
+        'docstring': ast.get_docstring(tree) or '',
+        'classes': [],
+        'functions': [],
+        'constants': {},
+        'dynamic': [],
+    }
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            info['classes'].append({
+                'name': node.name,
+                'docstring': ast.get_docstring(node) or '説明なし'
+            })
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            info['functions'].append(node.name)
+
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Name) or not target.id.isupper():
+                    continue
+                try:
+                    info['constants'][target.id] = ast.literal_eval(node.value)
+                except (ValueError, TypeError, SyntaxError, RecursionError):
+                    # 式で組み立てている定数は、必要になったらimportして読む
+                    info['dynamic'].append(target.id)
+
+    return info
+
+
+def _load_cache(cache_path: Path) -> Dict:
+    """キャッシュを読み込み（壊れている・形式が古い場合は空）"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+
+    return cache.get('modules', {})
+
+
+def _save_cache(cache_path: Path, modules: Dict):
+    """キャッシュをAtomicに書き込み（書き込めない環境では何もしない）"""
+    temp_path = cache_path.parent / f"{CACHE_FILENAME}.tmp.{os.getpid()}"
+
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'modules': modules}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+
+
+def discover_modules(directory, use_cache: bool = True) -> Dict[str, Dict]:
+    """
+    ディレクトリ内のモジュールを静的に検出
+
+    '_' で始まるファイル（__init__.py など）は対象外。
+    前回から更新時刻・サイズが変わっていないファイルはキャッシュの結果を使う。
+
+    Args:
+        directory: 検索するディレクトリ
+        use_cache: False なら全ファイルを解析し直す（キャッシュは更新する）
+
+    Returns:
+        {モジュール名（ファイル名から.pyを除いたもの）: scan_module() の結果 + 'path'}
+        構文エラーのファイルは {'path', 'error'} のみ
+    """
+    directory = Path(directory)
+    cache_path = directory / CACHE_FILENAME
+
+    cached = _load_cache(cache_path) if use_cache else {}
+    modules = {}
+    changed = not use_cache
+
+    for py_file in sorted(directory.glob('*.py')):
+        if py_file.stem.startswith('_'):
+            continue
+
+        stat = py_file.stat()
+        entry = cached.get(py_file.stem)
+
+        if entry is None or entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+            try:
+                info = scan_module(py_file)
+            except (SyntaxError, UnicodeDecodeError) as e:
+                info = {'error': str(e)}
+
+            entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'info': info}
+            changed = True
+
+        modules[py_file.stem] = entry
+
+    # 削除されたファイルがあればキャッシュから外す
+    if changed or set(cached) != set(modules):
+        _save_cache(cache_path, modules)
+
+    return {
+        stem: dict(entry['info'], path=str(directory / f"{stem}.py"))
+        for stem, entry in modules.items()
+    }
@@ -0,0 +1,390 @@
+"""
+全銘柄のバッチ予測
+
+symbols.txt の全銘柄について ARIMA / GARCH / GRU の予測をプロセスプールで実行し、
+結果を予測ストア（src/data/forecast_store.py）に保存する。夜間の cron 実行を想定。
+
+    python -m src.analysis.batch_forecaster                      # 全銘柄・全モデル
+    python -m src.analysis.batch_forecaster --models arima garch  # GRUなし
+    python -m src.analysis.batch_forecaster --run-id 2026-10-18_1d  # 中断した実行を再開
+
+- ジョブは 銘柄 × (ARIMA+GARCH | GRU) 単位。ARIMA と GARCH は1回の combined_forecast で求める
+- 各ワーカーは1度に1銘柄分のデータしか持たず、maxtasksperchild ごとに作り直す（メモリを一定に保つ）
+- 完了したジョブはすぐにストアへ書くので、同じ run_id で再実行すると未完了のジョブだけを実行する
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# BLAS のスレッド数は numpy を読み込む前に決まる（fork したワーカーは親の設定を引き継ぐ）ので、
+# ここで1本にしてプロセス数で並列化する
+for _name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+    os.environ.setdefault(_name, '1')
+
+import io
+import time
+import argparse
+import contextlib
+import multiprocessing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List
+
+from src.data.forecast_store import ForecastStore
+from src.data.minute_data_collector import load_symbols_from_file
+
+
+MODELS = ('arima', 'garch', 'gru')
+
+# ARIMA/GARCH を1回の当てはめでまとめて求めるモデル
+STATS_MODELS = ('arima', 'garch')
+
+# ワーカーを作り直すまでのジョブ数（statsmodels / torch のキャッシュによるメモリ増加を抑える）
+MAX_TASKS_PER_CHILD = 8
+
+# GRU の学習に必要な最低行数
+GRU_MIN_ROWS = 200
+
+DEFAULT_SYMBOLS_FILE = Path(__file__).resolve().parent.parent.parent / 'symbols.txt'
+
+# ワーカープロセス内のストレージ（プロセスごとに1回だけ作る）
+_worker_storage = None
+
+
+def _init_worker(data_dir: str):
+    """ワーカーの初期化（BLASやtorchのスレッドは1本にして、プロセス数で並列化する）"""
+    global _worker_storage
+
+    # 他のモジュールから呼ばれ、numpy が先に読み込まれていた場合は環境変数が効かないので、
+    # 読み込み済みのスレッドプールを直接1本に制限する（threadpoolctl がある場合）
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+    from src.data.timeseries_storage import TimeSeriesStorage
+    _worker_storage = TimeSeriesStorage(data_dir, indicators=False)
+
+
+def _forecast_stats(df, job: Dict) -> Dict:
+    """ARIMA / GARCH の予測（次数・当てはめ済みモデルのキャッシュを使う）"""
+    from src.analysis.forecasting import ForecastingEngine
+
+    start_time = time.monotonic()
+    engine = ForecastingEngine(stats_dir=_worker_storage.stats_dir, workers=1)
+    result = engine.combined_forecast(df, periods=job['horizon'],
+                                      symbol=job['symbol'], interval=job['interval'])
+    fit_seconds = time.monotonic() - start_time
+
+    outputs, errors = {}, {}
+
+    if 'arima' in job['models']:
+        price = result['price_forecast']
+        if price['success']:
+            outputs['arima'] = {'values': price['forecast'], 'lower': price['conf_int_lower'],
+                                'upper': price['conf_int_upper'], 'fit_seconds': fit_seconds}
+        else:
+            errors['arima'] = price['error']
+
+    if 'garch' in job['models']:
+        volatility = result['volatility_forecast']
+        if volatility['success']:
+            outputs['garch'] = {'values': volatility['volatility_forecast'], 'fit_seconds': fit_seconds}
+        else:
+            errors['garch'] = volatility['error']
+
+    return {'outputs': outputs, 'errors': errors}
+
+
+def _forecast_gru(df, job: Dict) -> Dict:
+    """GRU の予測（登録済みモデルを読み込み、定期・ドリフト時だけ学習し直す）"""
+    if len(df) < GRU_MIN_ROWS:
+        return {'outputs': {}, 'errors': {'gru': f'データ不足（最低{GRU_MIN_ROWS}行必要）'}}
+
+    import torch
+    torch.set_num_threads(1)
+    from src.analysis.model_registry import ModelRegistry
+
+    start_time = time.monotonic()
+
+    engine, info = ModelRegistry(_worker_storage.data_dir).get_or_train(
+        job['symbol'], job['interval'], df, lookback=job['gru_lookback'],
+        horizon=job['horizon'], epochs=job['gru_epochs'])
+
+    # 予測時の表示は抑制
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = engine.forecast(df, periods=job['horizon'])
+
+    return {
+        'outputs': {'gru': {'values': result['forecast'], 'fit_seconds': time.monotonic() - start_time,
+                            'note': info['status'] if info['reason'] is None else f"{info['status']}: {info['reason']}"}},
+        'errors': {},
+    }
+
+
+def _run_job(job: Dict) -> Dict:
+    """
+    1ジョブ（1銘柄 × モデル群）を実行（プロセスプールから呼ばれる）
+
+    Returns:
+        {'job', 'outputs': {model: {'values', 'lower', 'upper', 'fit_seconds'}},
+         'errors': {model: メッセージ}, 'data_end'}
+    """
+    result = {'job': job, 'outputs': {}, 'errors': {}, 'data_end': None}
+
+    try:
+        df = _worker_storage.load_price_data(job['symbol'], job['interval'])
+        if df.empty:
+            result['errors'] = {model: 'データなし' for model in job['models']}
+            return result
+
+        result['data_end'] = str(df.index[-1])
+
+        if job['models'] == ('gru',):
+            result.update(_forecast_gru(df, job))
+        else:
+            result.update(_forecast_stats(df, job))
+    except Exception as e:
+        result['errors'] = {model: f"{type(e).__name__}: {e}" for model in job['models']}
+
+    return result
+
+
+def _per_minute(count: int, elapsed_sec: float) -> float:
+    """1分あたりの件数"""
+    return round(count / (elapsed_sec / 60), 2) if elapsed_sec > 0 else 0.0
+
+
+class BatchForecaster:
+    """全銘柄のバッチ予測"""
+
+    def __init__(self, data_dir: str = None, workers: int = None):
+        """
+        Args:
+            data_dir: 時系列データのディレクトリ（デフォルト: src/data/timeseries）
+            workers: 並列プロセス数（デフォルト: CPU数 - 1）
+        """
+        if data_dir is None:
+            data_dir = str(Path(__file__).resolve().parent.parent / 'data' / 'timeseries')
+
+        self.data_dir = data_dir
+        self.store = ForecastStore(data_dir)
+        self.workers = workers or max(1, multiprocessing.cpu_count() - 1)
+
+    def build_jobs(self, symbols: List[str], models, interval: str, horizon: int,
+                   run_id: str, gru_epochs: int = 30, gru_lookback: int = 60) -> List[Dict]:
+        """
+        未完了のジョブを作成（ストアに書き込み済みの 銘柄 × モデル は除く）
+
+        GRU は学習が重いので、ARIMA/GARCH のジョブの後ろにまとめて並べる
+        （ARIMA/GARCH の結果が先に揃う）
+        """
+        completed = self.store.completed_jobs(run_id)
+        stats_jobs, gru_jobs = [], []
+
+        for symbol in symbols:
+            pending = [model for model in models if (symbol, model) not in completed]
+            base = {'symbol': symbol, 'interval': interval, 'horizon': horizon,
+                    'gru_epochs': gru_epochs, 'gru_lookback': gru_lookback}
+
+            stats = tuple(model for model in pending if model in STATS_MODELS)
+            if stats:
+                stats_jobs.append(dict(base, models=stats))
+            if 'gru' in pending:
+                gru_jobs.append(dict(base, models=('gru',)))
+
+        return stats_jobs + gru_jobs
+
+    def run(self, symbols: List[str], models=MODELS, interval: str = '1d', horizon: int = 7,
+            run_id: str = None, gru_epochs: int = 30, gru_lookback: int = 60) -> Dict:
+        """
+        バッチ予測を実行
+
+        Args:
+            symbols: 銘柄リスト
+            models: 実行するモデル（'arima', 'garch', 'gru'）
+            interval: 時間足
+            horizon: 予測期間（本数）
+            run_id: 実行ID（デフォルト: 今日の日付_時間足）。同じIDなら未完了分だけ実行する
+            gru_epochs: GRU の最大エポック数
+            gru_lookback: GRU の入力本数
+
+        Returns:
+            dict: 集計（run_id, written, failed, symbols_completed, elapsed_sec, symbols_per_minute, passes）
+                  再開した場合は前回までの実行と合算し、各回の集計を passes に残す
+                  （written / symbols_completed はストアにある分、failed は今回失敗したジョブ数）
+        """
+        models = tuple(model for model in MODELS if model in models)
+        run_id = run_id or f"{date.today().isoformat()}_{interval}"
+
+        jobs = self.build_jobs(symbols, models, interval, horizon, run_id, gru_epochs, gru_lookback)
+        total_jobs = len(jobs)
+        skipped = len(self.store.completed_jobs(run_id))
+
+        print(f"🔮 バッチ予測: run_id={run_id}")
+        print(f"   銘柄: {len(symbols)}, モデル: {', '.join(models)}, 時間足: {interval}, 期間: {horizon}")
+        print(f"   ジョブ: {total_jobs}件（完了済み {skipped}件はスキップ）, ワーカー: {self.workers}")
+        print()
+
+        # 再開時は最初の開始時刻と、これまでの集計を残す
+        previous_run = self.store.load_run(run_id)
+        started_at = previous_run.get('started_at') or datetime.now().isoformat(timespec='seconds')
+        self.store.save_run(run_id, status='running', started_at=started_at,
+                            config={'symbols': symbols, 'models': list(models), 'interval': interval,
+                                    'horizon': horizon, 'gru_epochs': gru_epochs, 'gru_lookback': gru_lookback})
+
+        # 銘柄ごとの残りジョブ数（0になった時点で1モデルでも保存できていれば、銘柄完了として処理速度に数える）
+        remaining = {}
+        for job in jobs:
+            remaining[job['symbol']] = remaining.get(job['symbol'], 0) + 1
+        written_symbols = set()
+
+        summary = {'jobs': total_jobs, 'written': 0, 'failed': 0, 'symbols_completed': 0}
+        start_time = time.monotonic()
+        status = 'completed'
+
+        pool = multiprocessing.Pool(min(self.workers, max(1, total_jobs)), initializer=_init_worker,
+                                    initargs=(self.data_dir,), maxtasksperchild=MAX_TASKS_PER_CHILD)
+        try:
+            for done, result in enumerate(pool.imap_unordered(_run_job, jobs), 1):
+                job = result['job']
+
+                for model, output in result['outputs'].items():
+                    self.store.save_forecast(run_id, job['symbol'], model, interval,
+                                             output['values'], output.get('lower'), output.get('upper'),
+                                             output['fit_seconds'], result['data_end'])
+                    summary['written'] += 1
+                    written_symbols.add(job['symbol'])
+
+                summary['failed'] += len(result['errors'])
+
+                remaining[job['symbol']] -= 1
+                if remaining[job['symbol']] == 0 and job['symbol'] in written_symbols:
+                    summary['symbols_completed'] += 1
+
+                elapsed_min = (time.monotonic() - start_time) / 60
+                rate = summary['symbols_completed'] / elapsed_min if elapsed_min > 0 else 0.0
+                progress = f"({done}/{total_jobs}, {rate:.1f} 銘柄/分)"
+
+                if result['errors']:
+                    for model, error in result['errors'].items():
+                        print(f"[ERROR] {job['symbol']:<10} {model:<6} {error} {progress}")
+                else:
+                    fit_seconds = max(output['fit_seconds'] for output in result['outputs'].values())
+                    notes = ' '.join(f"[{output['note']}]" for output in result['outputs'].values() if 'note' in output)
+                    print(f"[OK] {job['symbol']:<10} {'+'.join(result['outputs']):<12} "
+                          f"{fit_seconds:6.1f}s {progress} {notes}".rstrip())
+
+            pool.close()
+        except KeyboardInterrupt:
+            status = 'interrupted'
+            print("\n[WARNING] 中断しました。同じ run_id で再実行すると続きから再開します")
+        finally:
+            pool.terminate()
+            pool.join()
+
+        elapsed = time.monotonic() - start_time
+        summary['elapsed_sec'] = round(elapsed, 1)
+        summary['symbols_per_minute'] = _per_minute(summary['symbols_completed'], elapsed)
+
+        if status == 'completed' and summary['failed']:
+            status = 'completed_with_errors'
+
+        total = self._merge_summary(run_id, previous_run.get('summary'), summary)
+        self.store.save_run(run_id, status=status, finished_at=datetime.now().isoformat(timespec='seconds'),
+                            summary=total)
+
+        print()
+        print(f"✅ 今回: {summary['written']}件保存, {summary['failed']}件失敗, "
+              f"{summary['symbols_completed']}銘柄 / {elapsed:.0f}秒 "
+              f"（{summary['symbols_per_minute']:.1f} 銘柄/分）")
+        if len(total['passes']) > 1:
+            print(f"   累計（{len(total['passes'])}回）: {total['written']}件保存, "
+                  f"{total['symbols_completed']}銘柄 / {total['elapsed_sec']:.0f}秒 "
+                  f"（{total['symbols_per_minute']:.1f} 銘柄/分）")
+        print(f"   保存先: {self.store.run_dir(run_id)}")
+
+        return total
+
+    def _merge_summary(self, run_id: str, previous: Dict, current: Dict) -> Dict:
+        """
+        再開前の集計と今回の集計を合算
+
+        保存件数・完了銘柄数はストアにあるファイルから数え直し（再実行で二重に数えない）、
+        経過時間は各回の合計、失敗数は今回（= まだ残っている失敗）を使う
+        """
+        passes = []
+        if previous:
+            # passes のない旧形式の集計は1回分として扱う
+            passes = previous.get('passes') or [{k: v for k, v in previous.items() if k != 'run_id'}]
+        passes.append(current)
+
+        completed = self.store.completed_jobs(run_id)
+        symbols_completed = len({symbol for symbol, _ in completed})
+        elapsed = sum(p.get('elapsed_sec', 0.0) for p in passes)
+
+        return {
+            'run_id': run_id,
+            'written': len(completed),
+            'failed': current['failed'],
+            'symbols_completed': symbols_completed,
+            'elapsed_sec': round(elapsed, 1),
+            'symbols_per_minute': _per_minute(symbols_completed, elapsed),
+            'passes': passes,
+        }
+
+
+def main():
+    if (sys.stdout.encoding or '').lower() != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+
+    parser = argparse.ArgumentParser(
+        description='全銘柄のバッチ予測（ARIMA / GARCH / GRU）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python -m src.analysis.batch_forecaster                           # symbols.txt の全銘柄・全モデル
+  python -m src.analysis.batch_forecaster --models arima garch      # GRUなし（高速）
+  python -m src.analysis.batch_forecaster --symbols BTC ETH --workers 2
+  python -m src.analysis.batch_forecaster --run-id 2026-10-18_1d    # 中断した実行を再開
+  python -m src.analysis.batch_forecaster --list                    # 過去の実行一覧
+        '''
+    )
+    parser.add_argument('--symbols', nargs='+', help='対象銘柄（省略時は --symbols-file）')
+    parser.add_argument('--symbols-file', type=str, default=str(DEFAULT_SYMBOLS_FILE),
+                        help='銘柄リストファイル（デフォルト: symbols.txt）')
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS),
+                        help='実行するモデル（デフォルト: 全て）')
+    parser.add_argument('--interval', type=str, default='1d', help='時間足（デフォルト: 1d）')
+    parser.add_argument('--horizon', type=int, default=7, help='予測期間（デフォルト: 7）')
+    parser.add_argument('--workers', type=int, help='並列プロセス数（デフォルト: CPU数 - 1）')
+    parser.add_argument('--run-id', type=str, help='実行ID（デフォルト: 今日の日付_時間足、同じIDなら再開）')
+    parser.add_argument('--gru-epochs', type=int, default=30, help='GRUの最大エポック数（デフォルト: 30）')
+    parser.add_argument('--list', action='store_true', help='過去の実行一覧を表示')
+
+    args = parser.parse_args()
+    forecaster = BatchForecaster(workers=args.workers)
+
+    if args.list:
+        for run in forecaster.store.list_runs():
+            summary = run.get('summary', {})
+            print(f"{run['run_id']:<20} {run.get('status', '-'):<22} "
+                  f"{summary.get('written', '-')}件 {summary.get('symbols_per_minute', '-')} 銘柄/分")
+        return
+
+    symbols = args.symbols or load_symbols_from_file(args.symbols_file)
+    if not symbols:
+        print("[ERROR] 銘柄がありません")
+        sys.exit(1)
+
+    summary = forecaster.run(symbols, models=args.models, interval=args.interval, horizon=args.horizon,
+                             run_id=args.run_id, gru_epochs=args.gru_epochs)
+
+    if summary['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data.timeseries_storage import TimeSeriesStorage
+from src.data.price_matrix import PriceMatrix
+from src.analysis.streaming_correlation import (
+    StreamingCorrelation,
+    mean_pairwise_correlation,
+    extreme_pairs,
+)
 import pandas as pd
 import numpy as np
 
@@ -16,8 +22,29 @@ import numpy as np
 class CorrelationAnalyzer:
     """銘柄間相関分析"""
 
-    def __init__(self):
-        self.storage = TimeSeriesStorage()
+    def __init__(self, storage: TimeSeriesStorage = None):
+        self.storage = storage or TimeSeriesStorage()
+
+        # 時間足ごとの終値行列（全銘柄分を1回だけ作り、以降は新しい足だけ追記）
+        self.matrices = {}
+
+    def get_price_matrix(self, interval: str = '1d') -> PriceMatrix:
+        """
+        時間足の終値行列を取得（ストレージに新しい足があれば追記してから返す）
+
+        Returns:
+            PriceMatrix
+        """
+        matrix = self.matrices.get(interval)
+        if matrix is None:
+            matrix = PriceMatrix(self.storage, interval)
+            self.matrices[interval] = matrix
+
+        result = matrix.refresh()
+        if result['mode'] == 'build':
+            print(f"[OK] 終値行列を作成: {interval} ({result['symbols']}銘柄 × {result['rows']:,}本)")
+
+        return matrix
 
     def get_multi_symbol_data(self, symbols: list, interval: str = '1d'):
         """
@@ -30,28 +57,24 @@ class CorrelationAnalyzer:
         Returns:
             各銘柄の終値を含むDataFrame
         """
-        data_dict = {}
+        try:
+            matrix = self.get_price_matrix(interval)
+            # 選んだ銘柄の足がある時刻だけを残し、欠損値を前の値で埋める
+            combined_df = matrix.get_frame(symbols)
+        except Exception as e:
+            print(f"✗ 終値行列の読み込みエラー: {e}")
+            return None
+
+        if combined_df is None:
+            combined_df = pd.DataFrame()
 
         for symbol in symbols:
-            try:
-                df = self.storage.load_price_data(symbol, interval)
-                if df is not None and not df.empty:
-                    # 終値だけを取得
-                    data_dict[symbol] = df['close']
-                else:
-                    print(f"⚠️ {symbol}: データが見つかりません")
-            except Exception as e:
-                print(f"✗ {symbol}: エラー {e}")
+            if symbol not in combined_df.columns:
+                print(f"⚠️ {symbol}: データが見つかりません")
 
-        if not data_dict:
+        if combined_df.empty:
             return None
 
-        # 全銘柄のデータを統合（時間軸で結合）
-        combined_df = pd.DataFrame(data_dict)
-
-        # 欠損値を前の値で埋める
-        combined_df = combined_df.fillna(method='ffill')
-
         return combined_df
 
     def calculate_correlation_matrix(self, symbols: list, interval: str = '1d'):
@@ -99,16 +122,7 @@ class CorrelationAnalyzer:
         print()
 
         # 平均相関を計算（対角成分を除く）
-        n = len(corr)
-        total_corr = 0
-        count = 0
-
-        for i in range(n):
-            for j in range(i+1, n):
-                total_corr += corr.iloc[i, j]
-                count += 1
-
-        avg_corr = total_corr / count if count > 0 else 0
+        avg_corr = mean_pairwise_correlation(corr)
 
         print(f"【平均相関係数】: {avg_corr:.3f}")
         print()
@@ -129,34 +143,22 @@ class CorrelationAnalyzer:
 
         print()
 
-        # 最も相関が高いペア
+        # 最も相関が高いペア（正の相関のみ）
         print("【最も連動している銘柄ペア】")
-        max_corr = 0
-        max_pair = None
+        max_pairs = extreme_pairs(corr, limit=1, largest=True, threshold=0)
 
-        for i in range(n):
-            for j in range(i+1, n):
-                if corr.iloc[i, j] > max_corr:
-                    max_corr = corr.iloc[i, j]
-                    max_pair = (corr.index[i], corr.columns[j])
-
-        if max_pair:
-            print(f"  {max_pair[0]} - {max_pair[1]}: {max_corr:.3f}")
+        if max_pairs:
+            sym1, sym2, max_corr = max_pairs[0]
+            print(f"  {sym1} - {sym2}: {max_corr:.3f}")
 
         # 最も相関が低いペア
         print()
         print("【最も独立している銘柄ペア】")
-        min_corr = 1.0
-        min_pair = None
-
-        for i in range(n):
-            for j in range(i+1, n):
-                if corr.iloc[i, j] < min_corr:
-                    min_corr = corr.iloc[i, j]
-                    min_pair = (corr.index[i], corr.columns[j])
+        min_pairs = extreme_pairs(corr, limit=1, largest=False, threshold=1.0)
 
-        if min_pair:
-            print(f"  {min_pair[0]} - {min_pair[1]}: {min_corr:.3f}")
+        if min_pairs:
+            sym1, sym2, min_corr = min_pairs[0]
+            print(f"  {sym1} - {sym2}: {min_corr:.3f}")
 
         print()
 
@@ -247,22 +249,8 @@ class CorrelationAnalyzer:
             print("データ不足のため分析できません")
             return
 
-        # 相関が低いペアを抽出
-        low_corr_pairs = []
-
-        n = len(corr)
-        for i in range(n):
-            for j in range(i+1, n):
-                corr_value = corr.iloc[i, j]
-                if corr_value < threshold:
-                    low_corr_pairs.append((
-                        corr.index[i],
-                        corr.columns[j],
-                        corr_value
-                    ))
-
-        # 相関が低い順にソート
-        low_corr_pairs.sort(key=lambda x: x[2])
+        # 相関が低いペアを抽出（相関が低い順）
+        low_corr_pairs = extreme_pairs(corr, limit=None, largest=False, threshold=threshold)
 
         if low_corr_pairs:
             print("【推奨ペア】（相関が低い順）")
@@ -280,6 +268,106 @@ class CorrelationAnalyzer:
 
         print()
 
+    def create_streaming_engine(self, symbols: list = None, interval: str = '1m',
+                                window: int = None, halflife: float = None,
+                                span: float = None) -> StreamingCorrelation:
+        """
+        ローリング / EWMA 相関エンジンを作成し、過去データで初期化
+
+        以降は update_streaming_engine() で新しい足だけを O(N²) で反映する。
+
+        Args:
+            symbols: 銘柄リスト（省略時は終値行列の全銘柄）
+            interval: 時間足
+            window: 移動窓の本数（window / halflife / span のどれか1つ）
+            halflife: EWMAの半減期（本数）
+            span: EWMAのspan
+
+        Returns:
+            StreamingCorrelation
+        """
+        matrix = self.get_price_matrix(interval)
+        if symbols is None:
+            symbols = matrix.symbols
+
+        engine = StreamingCorrelation(symbols, window=window, halflife=halflife, span=span)
+        prices = matrix.get_frame(symbols)
+
+        if prices is not None and not prices.empty:
+            if window is not None:
+                # 移動窓なら直近 window 本（+ 基準になる1本）だけあればよい
+                prices = prices.iloc[-(window + 1):]
+            engine.fit(prices)
+
+        return engine
+
+    def update_streaming_engine(self, engine: StreamingCorrelation, interval: str = '1m') -> int:
+        """
+        エンジンに新しい足を反映（終値行列に追記された分だけ読む）
+
+        Returns:
+            反映した本数
+        """
+        matrix = self.get_price_matrix(interval)
+        prices = matrix.get_frame(engine.symbols, start_date=engine.last_timestamp)
+
+        if prices is None or prices.empty:
+            return 0
+
+        return engine.update_frame(prices)
+
+    def analyze_rolling_correlation(self, symbols: list = None, interval: str = '1m',
+                                    window: int = 1440, benchmark: str = 'BTC', limit: int = 5):
+        """
+        直近 window 本のローリング相関・ベータを表示
+
+        Args:
+            symbols: 銘柄リスト（省略時は終値行列の全銘柄）
+            interval: 時間足
+            window: 移動窓の本数
+            benchmark: ベータのベンチマーク銘柄
+            limit: 表示するペア数
+        """
+        print("=" * 80)
+        print(f"🔄 ローリング相関分析（直近{window:,}本）")
+        print("=" * 80)
+        print()
+
+        engine = self.create_streaming_engine(symbols, interval, window=window)
+
+        if engine.count < 2:
+            print("データ不足のため分析できません")
+            return
+
+        print(f"分析対象: {len(engine.symbols)}銘柄")
+        print(f"時間足: {interval}")
+        print(f"最終足: {engine.last_timestamp}")
+        print()
+
+        print(f"【平均相関係数】: {engine.mean_correlation():.3f}")
+        print()
+
+        print("【最も連動している銘柄ペア】")
+        for sym1, sym2, value in engine.top_pairs(limit):
+            print(f"  {sym1} - {sym2}: {value:.3f}")
+        print()
+
+        print("【最も独立している銘柄ペア】")
+        for sym1, sym2, value in engine.bottom_pairs(limit):
+            print(f"  {sym1} - {sym2}: {value:.3f}")
+        print()
+
+        if benchmark in engine.symbols:
+            betas = engine.beta(benchmark).drop(benchmark).dropna().sort_values(ascending=False)
+            print(f"【ベータ値（対{benchmark}）】")
+            for symbol, value in betas.head(limit).items():
+                print(f"  {symbol}: {value:.3f}")
+            if len(betas) > limit:
+                print("  ...")
+                for symbol, value in betas.tail(min(limit, len(betas) - limit)).items():
+                    print(f"  {symbol}: {value:.3f}")
+            print()
+
 
 def main():
     import io
@@ -300,6 +388,9 @@ def main():
 
   # 分散投資に適したペアを探す
   python correlation_analyzer.py --diversify BTC ETH XRP DOGE SHIB
+
+  # 全銘柄の1分足ローリング相関（直近1440本 = 1日）と対BTCベータ
+  python correlation_analyzer.py --rolling 1440 --interval 1m
         """
     )
 
@@ -313,6 +404,10 @@ def main():
                        help='分散投資ペア推奨（銘柄リスト）')
     parser.add_argument('--interval', default='1d',
                        help='時間足（デフォルト: 1d）')
+    parser.add_argument('--rolling', type=int, metavar='WINDOW',
+                       help='ローリング相関分析を実行（移動窓の本数）')
+    parser.add_argument('--symbols', nargs='+', metavar='SYMBOL',
+                       help='ローリング相関の対象銘柄（省略時は全銘柄）')
 
     args = parser.parse_args()
 
@@ -327,7 +422,11 @@ def main():
     if args.diversify:
         analyzer.find_diversification_pairs(args.diversify, args.interval)
 
-    if not any([args.market, args.beta, args.diversify]):
+    if args.rolling:
+        analyzer.analyze_rolling_correlation(args.symbols, args.interval, window=args.rolling,
+                                             benchmark=args.benchmark)
+
+    if not any([args.market, args.beta, args.diversify, args.rolling]):
         parser.print_help()
 
 
@@ -10,17 +10,82 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 import pandas as pd
 import numpy as np
+import json
+import time
+import hashlib
+import copy
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
 from statsmodels.tsa.arima.model import ARIMA
 from arch import arch_model
 import warnings
 warnings.filterwarnings('ignore')
 
 
+# ARIMA次数の選択結果のキャッシュ（src/data/timeseries/stats/arima_orders/{symbol}_{interval}.json）
+DEFAULT_STATS_DIR = Path(__file__).resolve().parent.parent / 'data' / 'timeseries' / 'stats'
+ARIMA_ORDER_CACHE_DIRNAME = 'arima_orders'
+
+# 当てはめ済みモデルのパラメータ（プロセスを再起動しても再当てはめせずに済むように保存）
+FITTED_MODEL_CACHE_DIRNAME = 'forecast_models'
+
+# キーごとのファイルにする前の、全キーを1ファイルにまとめた形式（読み込みのみ）
+# バッチ予測の複数ワーカーが同じファイルを読み書きするとエントリが消えるため、1キー = 1ファイルにした
+ARIMA_ORDER_CACHE_FILENAME = 'arima_orders.json'
+FITTED_MODEL_CACHE_FILENAME = 'forecast_models.json'
+
+# 当てはめ済みモデルのキャッシュ（プロセス内。Streamlitの再実行をまたいで保持される）
+# キー: "{symbol}_{interval}" → {'order', 'rows', 'fingerprint', 'fit_rows', 'arima', 'garch', 'forecasts'}
+_fitted_models = {}
+
+# これ以上の長さの系列は、次数探索をプロセスプールで並列化する
+PARALLEL_MIN_ROWS = 500
+
+# 次数探索ワーカーが使う系列（プール起動時に1回だけ渡す）
+_search_prices = None
+
+
+def _init_search_worker(values):
+    """次数探索ワーカーの初期化（系列を受け取っておく）"""
+    global _search_prices
+    warnings.filterwarnings('ignore')
+    _search_prices = values
+
+
+def _fit_arima_aic(order, values=None):
+    """
+    1つの次数でARIMAを当てはめてAICを返す（プロセスプールから呼ばれる）
+
+    Returns:
+        (order, aic)。失敗時は (order, None)
+    """
+    try:
+        fitted = ARIMA(_search_prices if values is None else values, order=order).fit()
+        return order, float(fitted.aic)
+    except Exception:
+        return order, None
+
+
 class ForecastingEngine:
     """ARIMA/GARCH予測エンジン"""
 
-    def __init__(self):
-        pass
+    def __init__(self, stats_dir: str = None, workers: int = None, fit_timeout: float = 30.0):
+        """
+        Args:
+            stats_dir: ARIMA次数キャッシュの保存先（デフォルト: src/data/timeseries/stats）
+            workers: 次数探索の並列プロセス数（デフォルト: CPU数、最大8）
+            fit_timeout: 並列探索時の1回の当てはめのタイムアウト（秒）
+        """
+        self.stats_dir = Path(stats_dir) if stats_dir else DEFAULT_STATS_DIR
+        self.workers = workers or min(8, multiprocessing.cpu_count())
+        self.fit_timeout = fit_timeout
+
+        # 直前の次数探索の統計（fitted / pruned / timeouts / failed / cached / elapsed_sec）
+        self.last_search = {}
+
+        # 直前のモデル当てはめの方法（cached / appended / filtered / warm_refit / refit）と所要時間
+        self.last_fit = {}
 
     def forecast_price_arima(self, df: pd.DataFrame, periods: int = 7, order=(1, 1, 1)):
         """
@@ -53,30 +118,7 @@ class ForecastingEngine:
             model = ARIMA(prices, order=order)
             fitted_model = model.fit()
 
-            # 予測
-            forecast_result = fitted_model.forecast(steps=periods)
-            forecast_values = forecast_result.values if hasattr(forecast_result, 'values') else forecast_result
-
-            # 予測区間を取得（statsmodelsのバージョンによって異なる）
-            try:
-                pred = fitted_model.get_forecast(steps=periods)
-                conf_int = pred.conf_int()
-            except:
-                # 簡易的な信頼区間（±5%）
-                conf_int = pd.DataFrame({
-                    'lower': forecast_values * 0.95,
-                    'upper': forecast_values * 1.05
-                })
-
-            return {
-                'success': True,
-                'forecast': forecast_values.tolist() if hasattr(forecast_values, 'tolist') else list(forecast_values),
-                'conf_int_lower': conf_int.iloc[:, 0].tolist(),
-                'conf_int_upper': conf_int.iloc[:, 1].tolist(),
-                'model_order': order,
-                'aic': fitted_model.aic,
-                'bic': fitted_model.bic,
-            }
+            return self._summarize_arima(fitted_model, periods, order)
 
         except Exception as e:
             return {
@@ -116,19 +158,7 @@ class ForecastingEngine:
             model = arch_model(returns, vol='Garch', p=p, q=q)
             fitted_model = model.fit(disp='off')
 
-            # 予測
-            forecast = fitted_model.forecast(horizon=periods)
-
-            # ボラティリティ予測値（標準偏差）
-            volatility = np.sqrt(forecast.variance.values[-1, :])
-
-            return {
-                'success': True,
-                'volatility_forecast': volatility.tolist(),
-                'mean_volatility': float(volatility.mean()),
-                'current_volatility': float(returns.std()),
-                'model': f'GARCH({p},{q})',
-            }
+            return self._summarize_garch(fitted_model, returns, periods, p, q)
 
         except Exception as e:
             return {
@@ -137,61 +167,411 @@ class ForecastingEngine:
                 'volatility_forecast': []
             }
 
-    def auto_select_arima_order(self, df: pd.DataFrame, max_p=5, max_d=2, max_q=5):
+    def _summarize_arima(self, fitted_model, periods: int, order) -> dict:
+        """当てはめ済みARIMAモデルから予測結果を作成"""
+        # 予測
+        forecast_result = fitted_model.forecast(steps=periods)
+        forecast_values = forecast_result.values if hasattr(forecast_result, 'values') else forecast_result
+
+        # 予測区間を取得（statsmodelsのバージョンによって異なる）
+        try:
+            pred = fitted_model.get_forecast(steps=periods)
+            conf_int = pred.conf_int()
+        except:
+            # 簡易的な信頼区間（±5%）
+            conf_int = pd.DataFrame({
+                'lower': forecast_values * 0.95,
+                'upper': forecast_values * 1.05
+            })
+
+        return {
+            'success': True,
+            'forecast': forecast_values.tolist() if hasattr(forecast_values, 'tolist') else list(forecast_values),
+            'conf_int_lower': conf_int.iloc[:, 0].tolist(),
+            'conf_int_upper': conf_int.iloc[:, 1].tolist(),
+            'model_order': order,
+            'aic': fitted_model.aic,
+            'bic': fitted_model.bic,
+        }
+
+    def _summarize_garch(self, fitted_model, returns: pd.Series, periods: int, p=1, q=1) -> dict:
+        """当てはめ済みGARCHモデルから予測結果を作成"""
+        # 予測
+        forecast = fitted_model.forecast(horizon=periods)
+
+        # ボラティリティ予測値（標準偏差）
+        volatility = np.sqrt(forecast.variance.values[-1, :])
+
+        return {
+            'success': True,
+            'volatility_forecast': volatility.tolist(),
+            'mean_volatility': float(volatility.mean()),
+            'current_volatility': float(returns.std()),
+            'model': f'GARCH({p},{q})',
+        }
+
+    # ========================================
+    # ARIMA次数の自動選択
+    # ========================================
+
+    @staticmethod
+    def _order_grid(max_p: int, max_d: int, max_q: int) -> list:
+        """探索する (p, d, q) の一覧（計算時間を考慮して範囲を制限）"""
+        return [(p, d, q)
+                for p in range(0, min(3, max_p))
+                for d in range(0, min(2, max_d))
+                for q in range(0, min(3, max_q))]
+
+    @staticmethod
+    def _fingerprint(prices: pd.Series) -> str:
+        """系列の指紋（時刻と値のハッシュ）"""
+        digest = hashlib.sha1()
+        digest.update(pd.DatetimeIndex(prices.index).as_unit('ns').asi8.tobytes())
+        digest.update(prices.to_numpy(dtype='float64').tobytes())
+        return digest.hexdigest()[:16]
+
+    def _load_cache_entry(self, dirname: str, legacy_filename: str, key: str):
+        """
+        キャッシュのエントリを読み込み（キーごとのファイル、なければ旧形式の1ファイルから）
+
+        Returns:
+            dict（なければNone）
+        """
+        try:
+            with open(self.stats_dir / dirname / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        try:
+            with open(self.stats_dir / legacy_filename, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == 1:
+                return cache['entries'].get(key)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        return None
+
+    def _save_cache_entry(self, dirname: str, key: str, entry: dict, label: str):
+        """キャッシュのエントリをキーごとのファイルにAtomicに書き込み"""
+        cache_dir = self.stats_dir / dirname
+        cache_path = cache_dir / f"{key}.json"
+        temp_path = cache_dir / f"{key}.json.tmp.{os.getpid()}"
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            # キャッシュなので書けなくても致命的ではない
+            print(f"[WARNING] {label}の書き込みに失敗: {e}")
+
+    def _cached_order(self, key: str, prices: pd.Series, grid: list, refresh_rows: int):
+        """
+        キャッシュ済みの次数を取得
+
+        前回と同じ系列の続き（前回分の指紋が一致）で、増えた行数が refresh_rows 未満なら再利用する
+        """
+        entry = self._load_cache_entry(ARIMA_ORDER_CACHE_DIRNAME, ARIMA_ORDER_CACHE_FILENAME, key)
+        if entry is None or entry.get('grid') != [list(order) for order in grid]:
+            return None
+
+        rows = entry['rows']
+        if len(prices) < rows or len(prices) - rows >= refresh_rows:
+            return None
+
+        if self._fingerprint(prices.iloc[:rows]) != entry['fingerprint']:
+            return None
+
+        return tuple(entry['order'])
+
+    def _fit_stage_parallel(self, pool, orders: list, stats: dict):
+        """
+        次数のバッチをプロセスプールで当てはめ
+
+        orders はワーカー数以下で渡すこと。全件が同時に走り出すので、
+        共通の締め切りがそのまま当てはめ1回ごとの fit_timeout になる。
+
+        Returns:
+            ({order: aic}, タイムアウトがあったか)
+        """
+        pending = [(order, pool.apply_async(_fit_arima_aic, (order,))) for order in orders]
+        deadline = time.monotonic() + self.fit_timeout
+        results, timed_out = {}, False
+
+        for order, async_result in pending:
+            try:
+                _, aic = async_result.get(timeout=max(0.0, deadline - time.monotonic()))
+                results[order] = aic
+                stats['failed' if aic is None else 'fitted'] += 1
+            except multiprocessing.TimeoutError:
+                results[order] = None
+                stats['timeouts'] += 1
+                timed_out = True
+
+        return results, timed_out
+
+    def auto_select_arima_order(self, df: pd.DataFrame, max_p=5, max_d=2, max_q=5,
+                                symbol: str = None, interval: str = None,
+                                parallel: bool = None, prune_aic: float = 10.0,
+                                refresh_rows: int = None):
         """
         AICを最小化するARIMAパラメータを自動選択
 
+        次数の小さい順（p + q）に段階的に当てはめ、1つ小さい次数（親）のAICが
+        その時点の最良より prune_aic 以上悪いものは、より大きな次数を試さない。
+        各段階はプロセスプールで並列に当てはめ、fit_timeout を超えた当てはめは打ち切る。
+        symbol と interval を指定すると、選択結果を stats_dir にキャッシュし、
+        新しいデータが refresh_rows 行たまるまで再利用する。
+
         Args:
             df: 価格データ
             max_p: pの最大値
             max_d: dの最大値
             max_q: qの最大値
+            symbol: 銘柄（キャッシュのキー）
+            interval: 時間足（キャッシュのキー）
+            parallel: 並列探索するか（Noneなら系列の長さとCPU数で自動判定）
+            prune_aic: 枝刈りのAIC差（Noneなら全次数を試す）
+            refresh_rows: この行数以上増えたら選び直す（デフォルト: 系列の5%、最低30行）
 
         Returns:
             tuple: 最適な(p, d, q)
         """
+        start_time = time.monotonic()
         prices = df['close'].dropna()
+        stats = {'fitted': 0, 'pruned': 0, 'timeouts': 0, 'failed': 0, 'cached': False}
+        self.last_search = stats
 
         if len(prices) < 30:
             return (1, 1, 1)  # デフォルト
 
-        best_aic = np.inf
-        best_order = (1, 1, 1)
+        grid = self._order_grid(max_p, max_d, max_q)
+        if refresh_rows is None:
+            refresh_rows = max(30, len(prices) // 20)
+
+        cache_key = f"{symbol}_{interval}" if symbol and interval else None
+        if cache_key:
+            cached = self._cached_order(cache_key, prices, grid, refresh_rows)
+            if cached is not None:
+                stats['cached'] = True
+                stats['elapsed_sec'] = time.monotonic() - start_time
+                return cached
+
+        if parallel is None:
+            parallel = len(prices) >= PARALLEL_MIN_ROWS and self.workers > 1
+
+        values = prices.to_numpy(dtype='float64')
+        aics = {}
+        pool = None
+
+        try:
+            if parallel:
+                pool = multiprocessing.Pool(self.workers, initializer=_init_search_worker, initargs=(values,))
+
+            # p + q の小さい順に段階的に探索
+            for complexity in sorted({p + q for p, _, q in grid}):
+                valid_aics = [aic for aic in aics.values() if aic is not None]
+                best_aic = min(valid_aics) if valid_aics else np.inf
 
-        # グリッドサーチ（計算時間を考慮して範囲を制限）
-        for p in range(0, min(3, max_p)):
-            for d in range(0, min(2, max_d)):
-                for q in range(0, min(3, max_q)):
-                    try:
-                        model = ARIMA(prices, order=(p, d, q))
-                        fitted = model.fit()
-                        if fitted.aic < best_aic:
-                            best_aic = fitted.aic
-                            best_order = (p, d, q)
-                    except:
+                stage = []
+                for p, d, q in grid:
+                    if p + q != complexity:
                         continue
 
+                    parents = [order for order in [(p - 1, d, q), (p, d, q - 1)] if order in grid]
+                    parent_aics = [aics[order] for order in parents if aics.get(order) is not None]
+
+                    # 親がすべて失敗・枝刈り済み、または親の最良でも明らかに悪い → 試さない
+                    if parents and prune_aic is not None and (
+                            not parent_aics or min(parent_aics) > best_aic + prune_aic):
+                        stats['pruned'] += 1
+                        continue
+
+                    stage.append((p, d, q))
+
+                if not stage:
+                    continue
+
+                if pool is not None:
+                    # ワーカー数ずつ投入し、待ち行列にいる間の時間を fit_timeout に含めない
+                    for start in range(0, len(stage), self.workers):
+                        batch = stage[start:start + self.workers]
+                        results, timed_out = self._fit_stage_parallel(pool, batch, stats)
+                        aics.update(results)
+
+                        if timed_out:
+                            # 打ち切った当てはめがワーカーを占有しているので作り直す
+                            pool.terminate()
+                            pool = multiprocessing.Pool(self.workers, initializer=_init_search_worker,
+                                                        initargs=(values,))
+                else:
+                    for order in stage:
+                        _, aic = _fit_arima_aic(order, prices)
+                        aics[order] = aic
+                        stats['failed' if aic is None else 'fitted'] += 1
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        best_aic = np.inf
+        best_order = (1, 1, 1)
+
+        for order in grid:
+            aic = aics.get(order)
+            if aic is not None and aic < best_aic:
+                best_aic = aic
+                best_order = order
+
+        if cache_key and np.isfinite(best_aic):
+            self._save_cache_entry(ARIMA_ORDER_CACHE_DIRNAME, cache_key, {
+                'order': list(best_order),
+                'aic': best_aic,
+                'rows': len(prices),
+                'fingerprint': self._fingerprint(prices),
+                'grid': [list(order) for order in grid],
+                'selected_at': datetime.now().isoformat(timespec='seconds'),
+            }, 'ARIMA次数キャッシュ')
+
+        stats['elapsed_sec'] = time.monotonic() - start_time
         return best_order
 
-    def combined_forecast(self, df: pd.DataFrame, periods: int = 7):
+    # ========================================
+    # 当てはめ済みモデルのキャッシュ
+    # ========================================
+
+    def _fit_models_cached(self, prices: pd.Series, returns: pd.Series, order,
+                           key: str, refresh_rows: int = None):
+        """
+        ARIMA/GARCHモデルをキャッシュを使って当てはめ
+
+        前回当てはめた系列の続き（前回分の指紋が一致）で、同じ次数なら:
+          - 行数が同じ: キャッシュ済みモデルをそのまま使う
+          - 数本増えただけ: パラメータを固定したまま新しい観測で状態を更新（ARIMAは append(refit=False)、
+            プロセス再起動後は保存済みパラメータで filter、GARCHは fix）
+          - 前回の最適化から refresh_rows 行以上増えた: 前回のパラメータを初期値にして再最適化
+
+        Returns:
+            dict: キャッシュエントリ（'arima', 'garch', 'forecasts' など）
+        """
+        start_time = time.monotonic()
+        if refresh_rows is None:
+            refresh_rows = max(30, len(prices) // 20)
+
+        entry = _fitted_models.get(key)
+        if entry is None:
+            saved = self._load_cache_entry(FITTED_MODEL_CACHE_DIRNAME, FITTED_MODEL_CACHE_FILENAME, key)
+            if saved is not None:
+                entry = dict(saved, order=tuple(saved['order']), arima=None, garch=None, forecasts={})
+
+        reusable = (
+            entry is not None
+            and entry['order'] == tuple(order)
+            and entry['rows'] <= len(prices)
+            and self._fingerprint(prices.iloc[:entry['rows']]) == entry['fingerprint']
+        )
+
+        if reusable and entry['rows'] == len(prices) and entry['arima'] is not None:
+            mode = 'cached'
+
+        elif reusable and len(prices) - entry['fit_rows'] < refresh_rows:
+            # パラメータは固定し、状態空間のフィルタで新しい観測だけ反映
+            arima = None
+            if entry['arima'] is not None:
+                try:
+                    arima = entry['arima'].append(prices.iloc[entry['rows']:], refit=False)
+                    mode = 'appended'
+                except Exception:
+                    arima = None  # インデックスが連続していない場合などは全体をフィルタ
+
+            if arima is None:
+                arima = ARIMA(prices, order=order).filter(np.asarray(entry['arima_params']))
+                mode = 'filtered'
+
+            garch = arch_model(returns, vol='Garch', p=1, q=1).fix(np.asarray(entry['garch_params']))
+            entry = dict(entry, arima=arima, garch=garch, rows=len(prices),
+                         fingerprint=self._fingerprint(prices), forecasts={})
+
+        else:
+            # 再最適化（同じ次数の前回パラメータがあれば初期値に使う）
+            if entry is not None and entry['order'] == tuple(order):
+                arima = ARIMA(prices, order=order).fit(start_params=np.asarray(entry['arima_params']))
+                garch = arch_model(returns, vol='Garch', p=1, q=1).fit(
+                    disp='off', starting_values=np.asarray(entry['garch_params']))
+                mode = 'warm_refit'
+            else:
+                arima = ARIMA(prices, order=order).fit()
+                garch = arch_model(returns, vol='Garch', p=1, q=1).fit(disp='off')
+                mode = 'refit'
+
+            entry = {
+                'order': tuple(order),
+                'rows': len(prices),
+                'fit_rows': len(prices),
+                'fingerprint': self._fingerprint(prices),
+                'arima': arima,
+                'garch': garch,
+                'forecasts': {},
+            }
+
+        if mode != 'cached':
+            entry['arima_params'] = [float(v) for v in np.asarray(entry['arima'].params)]
+            entry['garch_params'] = [float(v) for v in np.asarray(entry['garch'].params)]
+            entry['last_timestamp'] = str(prices.index[-1])
+            _fitted_models[key] = entry
+
+            self._save_cache_entry(FITTED_MODEL_CACHE_DIRNAME, key, {
+                name: list(value) if name == 'order' else value
+                for name, value in entry.items()
+                if name not in ('arima', 'garch', 'forecasts')
+            }, 'モデルパラメータ')
+
+        self.last_fit = {'mode': mode, 'elapsed_sec': time.monotonic() - start_time}
+        return entry
+
+    def combined_forecast(self, df: pd.DataFrame, periods: int = 7,
+                          symbol: str = None, interval: str = None):
         """
         ARIMA価格予測 + GARCHボラティリティ予測の統合
 
         Args:
             df: 価格データ
             periods: 予測期間
+            symbol: 銘柄（指定するとARIMA次数と当てはめ済みモデルをキャッシュ）
+            interval: 時間足
 
         Returns:
             dict: 統合予測結果
         """
         # 最適なARIMAパラメータを選択
-        best_order = self.auto_select_arima_order(df)
+        best_order = self.auto_select_arima_order(df, symbol=symbol, interval=interval)
 
-        # ARIMA予測
-        price_forecast = self.forecast_price_arima(df, periods=periods, order=best_order)
+        price_forecast = volatility_forecast = None
+        prices = df['close'].dropna()
+        returns = df['close'].pct_change().dropna() * 100
 
-        # GARCHボラティリティ予測
-        volatility_forecast = self.forecast_volatility_garch(df, periods=periods)
+        if symbol and interval and len(returns) >= 100:
+            try:
+                entry = self._fit_models_cached(prices, returns, best_order, f"{symbol}_{interval}")
+
+                # 同じデータ・同じ期間の予測はキャッシュから返す
+                if periods not in entry['forecasts']:
+                    entry['forecasts'][periods] = (
+                        self._summarize_arima(entry['arima'], periods, best_order),
+                        self._summarize_garch(entry['garch'], returns, periods),
+                    )
+                price_forecast, volatility_forecast = copy.deepcopy(entry['forecasts'][periods])
+            except Exception as e:
+                print(f"[WARNING] キャッシュ済みモデルでの予測に失敗、通常の当てはめに切り替えます: {e}")
+
+        if price_forecast is None:
+            # ARIMA予測
+            price_forecast = self.forecast_price_arima(df, periods=periods, order=best_order)
+
+            # GARCHボラティリティ予測
+            volatility_forecast = self.forecast_volatility_garch(df, periods=periods)
 
         # 統合結果
         result = {
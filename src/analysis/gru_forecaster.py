@@ -11,17 +11,24 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+import json
 import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 import warnings
 warnings.filterwarnings('ignore')
 
 
+# 入力に使うカラム（closeのインデックスは3）
+FEATURE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+CLOSE_INDEX = 3
+
+
 class GRUModel(nn.Module):
     """GRU Neural Network Model"""
 
@@ -72,23 +79,112 @@ class GRUModel(nn.Module):
         return out
 
 
+class GRURollout(nn.Module):
+    """
+    多段予測（学習済みGRUModelの重みを共有）
+
+    入力ウィンドウを1回だけGRUに通し、以降は隠れ状態を引き継いで
+    1ステップ = GRUセル1回の更新で予測を進める。複数銘柄のウィンドウを1つのバッチで処理する。
+    次のステップの入力は、最後の行の close だけを予測値に置き換えたもの（従来の forecast と同じ）。
+
+    TorchScript（torch.jit.script）/ ONNX にそのまま出力できる。
+    """
+
+    def __init__(self, model: GRUModel, periods: int, target_index: int = CLOSE_INDEX):
+        """
+        Args:
+            model: 学習済みモデル
+            periods: 予測ステップ数
+            target_index: 予測値で置き換えるカラム（close）
+        """
+        super(GRURollout, self).__init__()
+
+        self.gru = model.gru
+        self.fc = model.fc
+        self.periods = periods
+        self.target_index = target_index
+
+    def forward(self, x):
+        """
+        Args:
+            x: (batch_size, lookback, input_size) の正規化済みウィンドウ
+
+        Returns:
+            (batch_size, periods) の予測値（正規化済み）
+        """
+        out, hidden = self.gru(x)
+        pred = self.fc(out[:, -1, :])
+
+        preds = [pred]
+        last = x[:, -1, :]
+
+        for _ in range(self.periods - 1):
+            # closeだけ予測値に置き換え、他は最後の値を使う
+            step = torch.cat([last[:, :self.target_index], pred, last[:, self.target_index + 1:]], dim=1)
+            out, hidden = self.gru(step.unsqueeze(1), hidden)
+            pred = self.fc(out[:, -1, :])
+            preds.append(pred)
+
+        return torch.cat(preds, dim=1)
+
+
 class TimeSeriesDataset(Dataset):
-    """時系列データセット"""
+    """
+    時系列のスライディングウィンドウ・データセット
 
-    def __init__(self, X, y):
+    ウィンドウを事前に作らず、__getitem__ で元の系列から切り出す（メモリは系列長に比例）。
+    複数銘柄の系列を連結した data と、銘柄の境界をまたがないウィンドウの開始位置 starts を持つ。
+    訓練/検証/テストのデータセットは同じ data を共有できる。
+    """
+
+    def __init__(self, data, starts, lookback: int, forecast_horizon: int,
+                 groups=None, target_index: int = CLOSE_INDEX):
         """
         Args:
-            X: (num_samples, sequence_length, input_size)
-            y: (num_samples, 1)
+            data: (系列長の合計, input_size) の正規化済みデータ（ndarray / Tensor）
+            starts: ウィンドウの開始位置（data上の行番号）
+            lookback: ウィンドウの長さ
+            forecast_horizon: ウィンドウの最後から何本先を目的変数にするか
+            groups: ウィンドウごとの系列番号（複数銘柄の逆正規化用、省略時は全て0）
+            target_index: 目的変数のカラム
         """
-        self.X = torch.FloatTensor(X)
-        self.y = torch.FloatTensor(y)
+        self.data = torch.as_tensor(data, dtype=torch.float32)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.groups = np.zeros(len(self.starts), dtype=np.int32) if groups is None else np.asarray(groups, dtype=np.int32)
+        self.lookback = lookback
+        self.forecast_horizon = forecast_horizon
+        self.target_index = target_index
 
     def __len__(self):
-        return len(self.X)
+        return len(self.starts)
 
     def __getitem__(self, idx):
-        return self.X[idx], self.y[idx]
+        start = int(self.starts[idx])
+        end = start + self.lookback
+        target = end + self.forecast_horizon - 1
+
+        # Tensorのスライスはビュー（DataLoaderでバッチにまとめるときだけコピーされる）
+        return self.data[start:end], self.data[target, self.target_index:self.target_index + 1]
+
+    def targets(self) -> np.ndarray:
+        """全ウィンドウの目的変数 (num_samples, 1)"""
+        rows = self.starts + self.lookback + self.forecast_horizon - 1
+        return self.data.numpy()[rows, self.target_index:self.target_index + 1]
+
+    def batches(self, batch_size: int = 256):
+        """
+        ウィンドウをバッチ単位で取り出す（推論・評価用）
+
+        stride tricks のビュー (num_windows, lookback, input_size) から、
+        バッチ分の開始位置だけをコピーする
+
+        Yields:
+            (batch_size, lookback, input_size) の ndarray
+        """
+        windows = sliding_window_view(self.data.numpy(), self.lookback, axis=0).transpose(0, 2, 1)
+
+        for i in range(0, len(self.starts), batch_size):
+            yield windows[self.starts[i:i + batch_size]]
 
 
 class GRUForecastingEngine:
@@ -109,6 +205,12 @@ class GRUForecastingEngine:
 
         self.model = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
+
+        # 銘柄ごとのスケーラー（複数銘柄で学習した場合。1銘柄のときは {None: self.scaler}）
+        self.scalers = {}
+
+        # TimeSeriesDataset.groups の番号 → 銘柄
+        self.group_symbols = []
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
         print(f"🔧 GRU Forecasting Engine initialized")
@@ -116,60 +218,85 @@ class GRUForecastingEngine:
         print(f"   Lookback: {lookback} days")
         print(f"   Forecast horizon: {forecast_horizon} days")
 
-    def prepare_data(self, df: pd.DataFrame, train_ratio=0.8):
+    def prepare_data(self, df, train_ratio=0.8, batch_size=32):
         """
         時系列データを学習用に変換
 
+        ウィンドウは作らず、正規化した系列とウィンドウの開始位置だけを持つ（メモリは系列長に比例）。
+        複数銘柄を渡すと、銘柄ごとに正規化・時系列順に分割してから1つの学習データにまとめる
+        （ウィンドウは銘柄の境界をまたがない）。
+
         Args:
-            df: 価格データ（columns: open, high, low, close, volume）
+            df: 価格データ（columns: open, high, low, close, volume）、
+                または {銘柄: 価格データ} の辞書
             train_ratio: 訓練データの割合
+            batch_size: DataLoaderのバッチサイズ
 
         Returns:
-            train_loader, val_loader, test_data
+            train_loader, val_loader, test_dataset
         """
         print("\n📊 Preparing data...")
 
-        # 必要なカラムを抽出
-        data = df[['open', 'high', 'low', 'close', 'volume']].values
-
-        # 正規化（0-1の範囲に）
-        data_normalized = self.scaler.fit_transform(data)
-
-        # シーケンスとターゲットを作成
-        X, y = [], []
-        for i in range(len(data_normalized) - self.lookback - self.forecast_horizon + 1):
-            # 過去lookback日分のデータ
-            X.append(data_normalized[i:i + self.lookback])
-
-            # forecast_horizon日後の終値（正規化済み）
-            target_idx = i + self.lookback + self.forecast_horizon - 1
-            y.append(data_normalized[target_idx, 3])  # close価格のインデックスは3
-
-        X = np.array(X)
-        y = np.array(y).reshape(-1, 1)
-
-        print(f"   Total samples: {len(X)}")
-        print(f"   Input shape: {X.shape}")
-        print(f"   Target shape: {y.shape}")
-
-        # 訓練/検証/テスト分割
-        train_size = int(len(X) * train_ratio)
-        val_size = int(len(X) * 0.1)
-
-        X_train, y_train = X[:train_size], y[:train_size]
-        X_val, y_val = X[train_size:train_size + val_size], y[train_size:train_size + val_size]
-        X_test, y_test = X[train_size + val_size:], y[train_size + val_size:]
-
-        print(f"   Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
+        frames = df if isinstance(df, dict) else {None: df}
+        window = self.lookback + self.forecast_horizon
+
+        segments = []
+        splits = {'train': [], 'val': [], 'test': []}
+        offset = 0
+        self.scalers = {}
+        self.group_symbols = []
+
+        for symbol, frame in frames.items():
+            # 正規化（0-1の範囲に、銘柄ごと）
+            scaler = MinMaxScaler(feature_range=(0, 1))
+            data_normalized = scaler.fit_transform(frame[FEATURE_COLUMNS].values).astype(np.float32)
+
+            num_samples = len(data_normalized) - window + 1
+            if num_samples <= 0:
+                print(f"   [WARNING] {symbol}: データ不足のためスキップ（{len(data_normalized)}行）")
+                continue
+
+            # 訓練/検証/テスト分割（銘柄ごとに時系列順）
+            starts = offset + np.arange(num_samples)
+            train_size = int(num_samples * train_ratio)
+            val_size = int(num_samples * 0.1)
+            group = len(self.group_symbols)
+
+            for name, part in [('train', starts[:train_size]),
+                               ('val', starts[train_size:train_size + val_size]),
+                               ('test', starts[train_size + val_size:])]:
+                splits[name].append((part, np.full(len(part), group)))
+
+            self.scalers[symbol] = scaler
+            self.group_symbols.append(symbol)
+            segments.append(data_normalized)
+            offset += len(data_normalized)
+
+        if not segments:
+            raise ValueError(f"データ不足（最低{window}行必要）")
+
+        if None in self.scalers:
+            self.scaler = self.scalers[None]
+
+        # 全銘柄の系列を1つのTensorに（訓練/検証/テストで共有）
+        data = torch.from_numpy(np.concatenate(segments))
+
+        datasets = {}
+        for name, parts in splits.items():
+            starts = np.concatenate([part for part, _ in parts])
+            groups = np.concatenate([group for _, group in parts])
+            datasets[name] = TimeSeriesDataset(data, starts, self.lookback, self.forecast_horizon, groups)
+
+        print(f"   Series: {len(segments)}, Rows: {len(data)}")
+        print(f"   Total samples: {sum(len(d) for d in datasets.values())}")
+        print(f"   Input shape: (samples, {self.lookback}, {data.shape[1]}) ※ウィンドウは読み出し時に切り出し")
+        print(f"   Train: {len(datasets['train'])}, Val: {len(datasets['val'])}, Test: {len(datasets['test'])}")
 
         # DataLoaderを作成
-        train_dataset = TimeSeriesDataset(X_train, y_train)
-        val_dataset = TimeSeriesDataset(X_val, y_val)
-
-        train_loader = DataLoader(train_dataset, batch_size=32, shuffle=True)
-        val_loader = DataLoader(val_dataset, batch_size=32, shuffle=False)
+        train_loader = DataLoader(datasets['train'], batch_size=batch_size, shuffle=True)
+        val_loader = DataLoader(datasets['val'], batch_size=batch_size, shuffle=False)
 
-        return train_loader, val_loader, (X_test, y_test)
+        return train_loader, val_loader, datasets['test']
 
     def train(self, train_loader, val_loader, epochs=100, learning_rate=0.001):
         """
@@ -201,6 +328,7 @@ class GRUForecastingEngine:
         best_val_loss = float('inf')
         patience = 10
         patience_counter = 0
+        best_state = None
 
         # 訓練ループ
         for epoch in range(epochs):
@@ -249,8 +377,8 @@ class GRUForecastingEngine:
             if val_loss < best_val_loss:
                 best_val_loss = val_loss
                 patience_counter = 0
-                # 最良モデルを保存
-                torch.save(self.model.state_dict(), 'best_gru_model.pth')
+                # 最良モデルをメモリに保存（並列学習でファイルを取り合わないように）
+                best_state = {name: value.detach().clone() for name, value in self.model.state_dict().items()}
             else:
                 patience_counter += 1
 
@@ -259,7 +387,8 @@ class GRUForecastingEngine:
                 break
 
         # 最良モデルをロード
-        self.model.load_state_dict(torch.load('best_gru_model.pth', weights_only=True))
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
         print(f"\n✅ Training completed! Best val loss: {best_val_loss:.6f}")
 
     def evaluate(self, test_data):
@@ -267,24 +396,43 @@ class GRUForecastingEngine:
         テストデータで評価
 
         Args:
-            test_data: (X_test, y_test)
+            test_data: prepare_data() が返すテスト用データセット、または (X_test, y_test)
 
         Returns:
             metrics: dict
         """
         print(f"\n📈 Evaluating model...")
 
-        X_test, y_test = test_data
-
         self.model.eval()
-        with torch.no_grad():
-            X_test_tensor = torch.FloatTensor(X_test).to(self.device)
-            predictions = self.model(X_test_tensor).cpu().numpy()
 
-        # 逆正規化
-        # predictionsとy_testを元のスケールに戻す
-        predictions_denorm = self._denormalize_price(predictions)
-        y_test_denorm = self._denormalize_price(y_test)
+        if isinstance(test_data, TimeSeriesDataset):
+            # バッチ単位で推論し、銘柄ごとのスケーラーで逆正規化
+            with torch.no_grad():
+                predictions = np.concatenate([
+                    self.model(torch.from_numpy(np.ascontiguousarray(batch)).to(self.device)).cpu().numpy()
+                    for batch in test_data.batches()
+                ]) if len(test_data) else np.empty((0, 1), dtype=np.float32)
+
+            y_test = test_data.targets()
+            predictions_denorm = np.empty_like(predictions, dtype=np.float64)
+            y_test_denorm = np.empty_like(y_test, dtype=np.float64)
+
+            for group, symbol in enumerate(self.group_symbols):
+                mask = test_data.groups == group
+                scaler = self.scalers[symbol]
+                predictions_denorm[mask] = self._denormalize_price(predictions[mask], scaler)
+                y_test_denorm[mask] = self._denormalize_price(y_test[mask], scaler)
+        else:
+            X_test, y_test = test_data
+
+            with torch.no_grad():
+                X_test_tensor = torch.FloatTensor(X_test).to(self.device)
+                predictions = self.model(X_test_tensor).cpu().numpy()
+
+            # 逆正規化
+            # predictionsとy_testを元のスケールに戻す
+            predictions_denorm = self._denormalize_price(predictions)
+            y_test_denorm = self._denormalize_price(y_test)
 
         # 評価指標
         mse = np.mean((predictions_denorm - y_test_denorm) ** 2)
@@ -305,13 +453,160 @@ class GRUForecastingEngine:
 
         return metrics
 
-    def forecast(self, df: pd.DataFrame, periods=7):
+    def get_checkpoint(self) -> dict:
+        """
+        学習済みモデルとスケーラーの状態（ModelRegistry で保存する）
+
+        テンソル・数値・文字列だけで構成するので torch.load(weights_only=True) で読める
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        return {
+            'lookback': self.lookback,
+            'forecast_horizon': self.forecast_horizon,
+            'hidden_size': self.hidden_size,
+            'num_layers': self.num_layers,
+            'state_dict': {name: value.detach().cpu() for name, value in self.model.state_dict().items()},
+            'scalers': {symbol: {'data_min': scaler.data_min_.tolist(), 'data_max': scaler.data_max_.tolist()}
+                        for symbol, scaler in self.scalers.items()},
+            'group_symbols': list(self.group_symbols),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: dict):
+        """
+        get_checkpoint() の状態からエンジンを復元（学習し直さずに予測できる）
+
+        Returns:
+            GRUForecastingEngine
+        """
+        engine = cls(lookback=checkpoint['lookback'], forecast_horizon=checkpoint['forecast_horizon'],
+                     hidden_size=checkpoint['hidden_size'], num_layers=checkpoint['num_layers'])
+
+        engine.model = GRUModel(input_size=len(FEATURE_COLUMNS), hidden_size=engine.hidden_size,
+                                num_layers=engine.num_layers)
+        engine.model.load_state_dict(checkpoint['state_dict'])
+        engine.model.to(engine.device).eval()
+
+        # 最小値・最大値の2行で fit し直すと、学習時と同じ変換になる
+        for symbol, state in checkpoint['scalers'].items():
+            engine.scalers[symbol] = MinMaxScaler(feature_range=(0, 1)).fit(
+                np.array([state['data_min'], state['data_max']]))
+
+        if None in engine.scalers:
+            engine.scaler = engine.scalers[None]
+        engine.group_symbols = list(checkpoint['group_symbols'])
+
+        return engine
+
+    def _scaler_for(self, symbol: str, df: pd.DataFrame) -> MinMaxScaler:
+        """
+        銘柄のスケーラーを取得
+
+        学習に含まれない銘柄なら df で新しく正規化する（symbol=None なら self.scaler）
+        """
+        scaler = self.scalers.get(symbol)
+        if scaler is None:
+            if symbol is None:
+                return self.scaler
+            scaler = MinMaxScaler(feature_range=(0, 1)).fit(df[FEATURE_COLUMNS].values)
+            self.scalers[symbol] = scaler
+
+        return scaler
+
+    def _rollout_window(self, x, periods: int):
+        """
+        ウィンドウをずらしながら毎回GRU全体を通す多段予測（従来の方式、バッチ対応）
+
+        Returns:
+            (batch_size, periods) の予測値（正規化済み）
+        """
+        preds = []
+        last = x[:, -1, :]
+
+        for _ in range(periods):
+            pred = self.model(x)
+            preds.append(pred)
+
+            # 次の入力を準備（closeだけ予測値に置き換え、ウィンドウをスライド）
+            next_row = torch.cat([last[:, :CLOSE_INDEX], pred, last[:, CLOSE_INDEX + 1:]], dim=1)
+            x = torch.cat([x[:, 1:, :], next_row.unsqueeze(1)], dim=1)
+
+        return torch.cat(preds, dim=1)
+
+    def forecast_batch(self, frames: dict, periods=7, mode='stateful'):
+        """
+        複数銘柄をまとめて予測（1つのTensorでバッチ推論）
+
+        Args:
+            frames: {銘柄: 最新データ}（各銘柄 lookback 行以上）
+            periods: 予測期間
+            mode: 'stateful' = 隠れ状態を引き継ぐ（1ステップ = GRUセル1回、高速）
+                  'window' = 毎ステップ直近 lookback 行のウィンドウでGRU全体を通し直す（従来の方式）
+
+        Returns:
+            dict: {銘柄: {'forecast', 'current_price', 'forecast_price', 'forecast_change'}}
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        windows, scalers, symbols = [], [], []
+
+        for symbol, df in frames.items():
+            if len(df) < self.lookback:
+                print(f"   [WARNING] {symbol}: データ不足のためスキップ（{len(df)}行 < {self.lookback}）")
+                continue
+
+            scaler = self._scaler_for(symbol, df)
+            recent_data = df[FEATURE_COLUMNS].tail(self.lookback).values
+            windows.append(scaler.transform(recent_data))
+            scalers.append(scaler)
+            symbols.append(symbol)
+
+        if not symbols:
+            return {}
+
+        x = torch.from_numpy(np.stack(windows).astype(np.float32)).to(self.device)
+
+        self.model.eval()
+        with torch.no_grad():
+            if mode == 'stateful':
+                preds = GRURollout(self.model, periods)(x)
+            elif mode == 'window':
+                preds = self._rollout_window(x, periods)
+            else:
+                raise ValueError(f"Unknown mode: {mode}")
+
+        preds = preds.cpu().numpy()
+        results = {}
+
+        for i, (symbol, scaler) in enumerate(zip(symbols, scalers)):
+            # 逆正規化
+            forecasts_denorm = self._denormalize_price(preds[i].reshape(-1, 1), scaler)
+
+            current_price = frames[symbol]['close'].iloc[-1]
+            final_forecast = forecasts_denorm[-1][0]
+
+            results[symbol] = {
+                'forecast': forecasts_denorm.flatten().tolist(),
+                'current_price': float(current_price),
+                'forecast_price': float(final_forecast),
+                'forecast_change': float((final_forecast - current_price) / current_price * 100),
+            }
+
+        return results
+
+    def forecast(self, df: pd.DataFrame, periods=7, symbol: str = None, mode='window'):
         """
         予測実行
 
         Args:
             df: 最新データ
             periods: 予測期間（デフォルト: 7日）
+            symbol: 銘柄（複数銘柄で学習した場合、その銘柄のスケーラーを使う。
+                    学習に含まれない銘柄なら df で新しく正規化する）
+            mode: 'window'（従来の方式）または 'stateful'（隠れ状態を引き継ぐ高速版）
 
         Returns:
             dict: {
@@ -325,69 +620,89 @@ class GRUForecastingEngine:
 
         print(f"\n🔮 Forecasting next {periods} days...")
 
-        # 最新のlookback日分のデータを取得
-        recent_data = df[['open', 'high', 'low', 'close', 'volume']].tail(self.lookback).values
-
-        # 正規化
-        recent_data_normalized = self.scaler.transform(recent_data)
+        result = self.forecast_batch({symbol: df}, periods=periods, mode=mode)[symbol]
 
-        # 予測
-        forecasts = []
-        current_input = recent_data_normalized.copy()
+        print(f"   Current price: ${result['current_price']:,.2f}")
+        print(f"   Forecast ({periods}d): ${result['forecast_price']:,.2f}")
+        print(f"   Change: {result['forecast_change']:+.2f}%")
 
-        self.model.eval()
-        with torch.no_grad():
-            for _ in range(periods):
-                # 入力を準備
-                X = torch.FloatTensor(current_input).unsqueeze(0).to(self.device)
+        return result
 
-                # 予測
-                pred = self.model(X).cpu().numpy()[0, 0]
-                forecasts.append(pred)
-
-                # 次の入力を準備（予測値を使う）
-                # 簡易版: closeだけ予測値に置き換え、他は最後の値を使う
-                next_row = current_input[-1].copy()
-                next_row[3] = pred  # close価格のインデックスは3
-
-                # ウィンドウをスライド
-                current_input = np.vstack([current_input[1:], next_row])
+    def export_inference(self, path: str, periods: int = None, format: str = 'torchscript'):
+        """
+        推論用モデル（GRURollout）を出力
 
-        # 逆正規化
-        forecasts_denorm = self._denormalize_price(np.array(forecasts).reshape(-1, 1))
+        出力先と同じ名前の .json に、入力の作り方（lookback・カラム・銘柄ごとの正規化範囲）を保存する。
+        入力: (batch, lookback, 5) の正規化済みウィンドウ → 出力: (batch, periods) の正規化済み予測値
 
-        current_price = df['close'].iloc[-1]
-        final_forecast = forecasts_denorm[-1][0]
-        forecast_change = ((final_forecast - current_price) / current_price) * 100
+        Args:
+            path: 出力先（例: models/gru.pt, models/gru.onnx）
+            periods: 予測ステップ数（デフォルト: forecast_horizon）
+            format: 'torchscript' または 'onnx'（onnx パッケージが必要）
 
-        print(f"   Current price: ${current_price:,.2f}")
-        print(f"   Forecast ({periods}d): ${final_forecast:,.2f}")
-        print(f"   Change: {forecast_change:+.2f}%")
+        Returns:
+            出力したファイルのパス
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
 
-        return {
-            'forecast': forecasts_denorm.flatten().tolist(),
-            'current_price': float(current_price),
-            'forecast_price': float(final_forecast),
-            'forecast_change': float(forecast_change)
+        periods = periods or self.forecast_horizon
+        rollout = GRURollout(self.model, periods).to('cpu').eval()
+        # バッチサイズ1の例だと固定サイズとして出力されるので2で作る
+        example = torch.zeros(2, self.lookback, len(FEATURE_COLUMNS))
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        if format == 'torchscript':
+            torch.jit.script(rollout).save(path)
+        elif format == 'onnx':
+            try:
+                import onnx  # noqa: F401
+            except ImportError:
+                raise ImportError("ONNX出力には onnx パッケージが必要です（pip install onnx onnxscript）")
+
+            torch.onnx.export(rollout, (example,), path, input_names=['window'], output_names=['forecast'],
+                              dynamic_axes={'window': {0: 'batch'}, 'forecast': {0: 'batch'}})
+        else:
+            raise ValueError(f"Unknown format: {format}")
+
+        self.model.to(self.device)
+
+        metadata = {
+            'format': format,
+            'lookback': self.lookback,
+            'periods': periods,
+            'feature_columns': FEATURE_COLUMNS,
+            'target_index': CLOSE_INDEX,
+            'scalers': {
+                str(symbol): {'data_min': scaler.data_min_.tolist(), 'data_max': scaler.data_max_.tolist()}
+                for symbol, scaler in self.scalers.items()
+            },
         }
+        with open(os.path.splitext(path)[0] + '.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        print(f"[OK] 推論モデルを出力: {path} ({format}, {periods}ステップ)")
+        return path
 
-    def _denormalize_price(self, normalized_value):
+    def _denormalize_price(self, normalized_value, scaler=None):
         """
         正規化された価格を元のスケールに戻す
 
         Args:
             normalized_value: 正規化された値
+            scaler: 使うスケーラー（省略時は self.scaler）
 
         Returns:
             元のスケールの値
         """
         # closeの列だけを逆変換
         # scalerは5次元で学習しているので、ダミーを作る
-        dummy = np.zeros((len(normalized_value), 5))
-        dummy[:, 3] = normalized_value.flatten()  # closeのインデックス
+        dummy = np.zeros((len(normalized_value), len(FEATURE_COLUMNS)))
+        dummy[:, CLOSE_INDEX] = np.asarray(normalized_value).flatten()
 
-        denormalized = self.scaler.inverse_transform(dummy)
-        return denormalized[:, 3].reshape(-1, 1)
+        denormalized = (scaler or self.scaler).inverse_transform(dummy)
+        return denormalized[:, CLOSE_INDEX].reshape(-1, 1)
 
 
 def main():
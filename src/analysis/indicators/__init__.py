@@ -26,45 +26,111 @@ INDICATOR_NAME = "指標名"
 INDICATOR_DESCRIPTION = "指標の説明"
 DEFAULT_PARAMS = {"param1": value1, "param2": value2}
 ```
+
+複数銘柄×複数パラメータをまとめて計算する場合は、任意で calculate_batch を定義する：
+
+```python
+def calculate_batch(ctx, **params):
+    \"\"\"
+    Args:
+        ctx: BatchContext（時刻インデックスが同一の銘柄の 時刻×銘柄 の2次元配列と、共有の中間結果）
+
+    Returns:
+        2次元配列（時刻×銘柄）、または {出力名: 2次元配列}
+    \"\"\"
+    return ctx.rolling('close', params['period'], 'mean')
+```
+
+calculate_batch がない指標は、銘柄ごとに calculate を呼んで結果を揃える。
 """
 
 import os
 import importlib
 import inspect
+import numpy as np
+import pandas as pd
+
+from analysis._discovery import discover_modules
+
+
+# 指標モジュールのパッケージ名
+PACKAGE = 'analysis.indicators'
+
+# メタデータ定数と、指標情報のキー
+METADATA_KEYS = {
+    'INDICATOR_NAME': 'name',
+    'INDICATOR_DESCRIPTION': 'description',
+    'DEFAULT_PARAMS': 'default_params',
+}
+
+
+def import_indicator(indicator_id: str):
+    """指標モジュールをimport（2回目以降は sys.modules から返る）"""
+    return importlib.import_module(f'{PACKAGE}.{indicator_id}')
+
+
+class _LazyCalculate:
+    """
+    指標の calculate 関数の代理
+
+    一覧の取得時にはモジュールをimportせず、初めて計算するときにimportする
+    """
+
+    def __init__(self, indicator_id: str):
+        self.indicator_id = indicator_id
+
+    def __call__(self, df, **params):
+        return import_indicator(self.indicator_id).calculate(df, **params)
+
+    def __repr__(self):
+        return f'<lazy calculate: {PACKAGE}.{self.indicator_id}>'
 
 
 def load_all_indicators():
     """
-    このディレクトリ内の全指標を自動的にロード
+    このディレクトリ内の全指標を検出
+
+    モジュールはimportせず、ソースから静的にメタデータを読む（結果は _discovery.json にキャッシュ）。
+    calculate は初回呼び出し時にモジュールをimportする。
 
     Returns:
         dict: {指標ID: 指標情報}
+            指標情報: {'name', 'description', 'default_params', 'calculate', 'has_batch'}
     """
     indicators = {}
 
     # このディレクトリのパス
     current_dir = os.path.dirname(__file__)
 
-    # 全Pythonファイルをスキャン
-    for filename in os.listdir(current_dir):
-        if filename.endswith('.py') and filename != '__init__.py':
-            module_name = filename[:-3]  # .py を削除
+    for module_name, info in discover_modules(current_dir).items():
+        if 'error' in info:
+            print(f"⚠️ 指標 {module_name} のロード失敗: {info['error']}")
+            continue
 
+        # calculate関数が存在するか確認
+        if 'calculate' not in info['functions']:
+            continue
+
+        indicator = {
+            'name': info['constants'].get('INDICATOR_NAME', module_name),
+            'description': info['constants'].get('INDICATOR_DESCRIPTION', ''),
+            'default_params': info['constants'].get('DEFAULT_PARAMS', {}),
+            'calculate': _LazyCalculate(module_name),
+            'has_batch': 'calculate_batch' in info['functions'],
+        }
+
+        # リテラルで書かれていないメタデータだけはimportして読む
+        dynamic = [name for name in METADATA_KEYS if name in info['dynamic']]
+        if dynamic:
             try:
-                # モジュールをインポート
-                module = importlib.import_module(f'analysis.indicators.{module_name}')
-
-                # calculate関数が存在するか確認
-                if hasattr(module, 'calculate'):
-                    indicators[module_name] = {
-                        'name': getattr(module, 'INDICATOR_NAME', module_name),
-                        'description': getattr(module, 'INDICATOR_DESCRIPTION', ''),
-                        'default_params': getattr(module, 'DEFAULT_PARAMS', {}),
-                        'calculate': module.calculate,
-                        'module': module
-                    }
+                module = import_indicator(module_name)
+                for name in dynamic:
+                    indicator[METADATA_KEYS[name]] = getattr(module, name)
             except Exception as e:
                 print(f"⚠️ 指標 {module_name} のロード失敗: {e}")
+                continue
+
+        indicators[module_name] = indicator
 
     return indicators
 
@@ -106,3 +172,256 @@ def calculate_indicator(indicator_id: str, df, **params):
 
     # 計算実行
     return indicator['calculate'](df, **final_params)
+
+
+class BatchContext:
+    """
+    バッチ計算用のコンテキスト
+
+    時刻インデックスが同一の銘柄のOHLCVを 時刻×銘柄 の2次元配列として持ち、
+    close.diff()・True Range・ローリング窓などの中間結果を指標・パラメータ間で共有する。
+    欠けた時刻をNaNで埋めると diff やローリング窓が銘柄ごとの calculate と食い違うので、
+    インデックスの異なる銘柄は同じコンテキストに入れない（calculate_batch が分けて作る）。
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume', 'quote_volume')
+
+    def __init__(self, frames: dict):
+        """
+        Args:
+            frames: {symbol: DataFrame（OHLCV、DatetimeIndex）}。全銘柄のインデックスが同一であること
+
+        Raises:
+            ValueError: インデックスの異なる銘柄が混ざっている場合
+        """
+        self.symbols = list(frames)
+        self.frames = frames
+
+        index = None
+        for symbol, df in frames.items():
+            if index is None:
+                index = df.index
+            elif not df.index.equals(index):
+                raise ValueError(f"'{symbol}' の時刻インデックスが他の銘柄と一致しません")
+        self.index = index if index is not None else pd.DatetimeIndex([])
+
+        self._fields = {}
+        for field in self.FIELDS:
+            if all(field in df.columns for df in frames.values()):
+                self._fields[field] = np.column_stack([
+                    df[field].to_numpy(dtype='float64') for df in frames.values()
+                ]) if frames else np.empty((0, 0))
+
+        # 中間結果のキャッシュ {キー: 2次元配列}
+        self._cache = {}
+        self.cache_hits = 0
+
+    def get(self, key: str) -> np.ndarray:
+        """列名（close など）またはキャッシュ済み中間結果の名前から配列を取得"""
+        if key in self._fields:
+            return self._fields[key]
+        if key in self._cache:
+            return self._cache[key]
+        raise KeyError(f"'{key}' はOHLCV列にも中間結果にもありません")
+
+    def cached(self, key, func):
+        """
+        中間結果をキャッシュ付きで計算
+
+        Args:
+            key: キャッシュキー（同じキーなら2回目以降は計算しない）
+            func: 引数なしで2次元配列を返す関数
+        """
+        if key in self._cache:
+            self.cache_hits += 1
+            return self._cache[key]
+
+        value = func()
+        self._cache[key] = value
+        return value
+
+    def diff(self, field: str = 'close') -> np.ndarray:
+        """1本前との差分（先頭行はNaN）"""
+        def compute():
+            values = self.get(field)
+            result = np.full_like(values, np.nan)
+            result[1:] = values[1:] - values[:-1]
+            return result
+
+        return self.cached(f'diff:{field}', compute)
+
+    def shift(self, field: str = 'close', periods: int = 1) -> np.ndarray:
+        """periods本前の値（先頭はNaN）"""
+        def compute():
+            values = self.get(field)
+            result = np.full_like(values, np.nan)
+            result[periods:] = values[:-periods]
+            return result
+
+        return self.cached(f'shift:{field}:{periods}', compute)
+
+    def true_range(self) -> np.ndarray:
+        """True Range = max(high - low, |high - 前のclose|, |low - 前のclose|)"""
+        def compute():
+            high, low = self.get('high'), self.get('low')
+            prev_close = self.shift('close')
+            # 先頭行は前のcloseがないので high - low のみ（pandas の max(axis=1) と同じ扱い）
+            return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        return self.cached('true_range', compute)
+
+    def rolling(self, key: str, window: int, op: str = 'mean') -> np.ndarray:
+        """
+        ローリング集計（全銘柄の列をまとめて計算）
+
+        Args:
+            key: 列名または中間結果の名前
+            window: 窓幅
+            op: 'mean' / 'std' / 'min' / 'max' / 'sum'
+        """
+        def compute():
+            frame = pd.DataFrame(self.get(key))
+            return getattr(frame.rolling(window=window), op)().to_numpy()
+
+        return self.cached(f'rolling:{op}:{key}:{window}', compute)
+
+    def register(self, key: str, values: np.ndarray) -> np.ndarray:
+        """指標の途中結果を中間結果として登録（rolling 等の入力に使えるようにする）"""
+        self._cache[key] = values
+        return values
+
+
+def _param_label(indicator_id: str, params: dict) -> str:
+    """結果の列名に使うラベル（例: atr(period=14)）"""
+    if not params:
+        return indicator_id
+    args = ','.join(f'{key}={value}' for key, value in sorted(params.items()))
+    return f'{indicator_id}({args})'
+
+
+def _calculate_per_symbol(ctx: BatchContext, indicator: dict, params: dict) -> dict:
+    """calculate_batch のない指標を銘柄ごとに計算し、時刻×銘柄の配列に揃える"""
+    outputs = {}
+    for j, (symbol, df) in enumerate(ctx.frames.items()):
+        result = indicator['calculate'](df, **params)
+        if isinstance(result, pd.Series):
+            series_by_name = {None: result}
+        else:
+            series_by_name = {column: result[column] for column in result.columns}
+
+        for name, series in series_by_name.items():
+            values = series.reindex(ctx.index).to_numpy(dtype='float64')
+            outputs.setdefault(name, np.full((len(ctx.index), len(ctx.symbols)), np.nan))[:, j] = values
+
+    return outputs
+
+
+def _group_by_index(frames: dict) -> list:
+    """時刻インデックスが同一の銘柄ごとに frames を分ける（元の順序を保つ）"""
+    groups = []
+    for symbol, df in frames.items():
+        for group in groups:
+            if next(iter(group.values())).index.equals(df.index):
+                group[symbol] = df
+                break
+        else:
+            groups.append({symbol: df})
+    return groups
+
+
+def _calculate_group(ctx: BatchContext, specs: list, indicators: dict) -> tuple:
+    """1つのコンテキスト（同一インデックスの銘柄群）で全指標を計算し、(ラベル, 配列) を返す"""
+    labels, columns = [], []
+
+    for indicator_id, params in specs:
+        indicator = indicators[indicator_id]
+        final_params = indicator['default_params'].copy()
+        final_params.update(params)
+
+        if indicator['has_batch']:
+            outputs = import_indicator(indicator_id).calculate_batch(ctx, **final_params)
+            if not isinstance(outputs, dict):
+                outputs = {None: outputs}
+        else:
+            outputs = _calculate_per_symbol(ctx, indicator, final_params)
+
+        base_label = _param_label(indicator_id, final_params)
+        for name, values in outputs.items():
+            labels.append(base_label if name is None else f'{base_label}.{name}')
+            columns.append(values)
+
+    return labels, columns
+
+
+def calculate_batch(frames: dict, specs, indicators: dict = None) -> pd.DataFrame:
+    """
+    複数の指標 × 複数のパラメータ × 複数の銘柄を一括計算
+
+    時刻インデックスが同一の銘柄をまとめた2次元配列の上で計算し、close.diff() や True Range、
+    ローリング窓などの中間結果は指標・パラメータをまたいで共有する（calculate_batch を持つ指標のみ）。
+    インデックスの異なる銘柄は別々に計算してから時刻の和集合に並べるので、
+    各銘柄の値は銘柄ごとの calculate と一致し、その銘柄にない時刻はNaNになる。
+
+    Args:
+        frames: {symbol: DataFrame（OHLCV）}
+        specs: [(指標ID, {パラメータ}), ...] または {指標ID: [{パラメータ}, ...]}
+               パラメータはデフォルトとマージされる
+        indicators: load_all_indicators() の結果（省略時はロードする）
+
+    Returns:
+        横長のDataFrame（インデックス: 時刻、列: MultiIndex (symbol, 指標ラベル)）
+        指標ラベルは 'atr(period=14)'、複数出力なら 'stochastic(d_period=3,k_period=14).stoch_k'
+
+    Example:
+        wide = calculate_batch(
+            {'BTC': df_btc, 'ETH': df_eth},
+            {'atr': [{'period': p} for p in (7, 14, 28)], 'obv': [{}]},
+        )
+        wide['BTC']['atr(period=14)']
+    """
+    if indicators is None:
+        indicators = load_all_indicators()
+
+    if isinstance(specs, dict):
+        specs = [(indicator_id, params) for indicator_id, param_list in specs.items()
+                 for params in param_list]
+
+    for indicator_id, _ in specs:
+        if indicator_id not in indicators:
+            raise ValueError(f"指標 '{indicator_id}' が見つかりません")
+
+    # 全銘柄の時刻の和集合（結果を並べる先）
+    index = None
+    for df in frames.values():
+        index = df.index if index is None else index.union(df.index)
+    if index is None:
+        index = pd.DatetimeIndex([])
+
+    symbols = list(frames)
+    labels, blocks = [], {}
+
+    for group in _group_by_index(frames):
+        ctx = BatchContext(group)
+        labels, columns = _calculate_group(ctx, specs, indicators)
+        if not columns:
+            break
+
+        # (時刻, 銘柄, 指標) に積み、和集合の時刻に並べる
+        stacked = np.stack(columns, axis=2)
+        if not ctx.index.equals(index):
+            positions = index.get_indexer(ctx.index)
+            expanded = np.full((len(index),) + stacked.shape[1:], np.nan)
+            expanded[positions] = stacked
+            stacked = expanded
+
+        for j, symbol in enumerate(ctx.symbols):
+            blocks[symbol] = stacked[:, j, :]
+
+    if not blocks:
+        return pd.DataFrame(index=index)
+
+    # 列を (symbol, 指標) の順に並べる
+    wide = np.concatenate([blocks[symbol] for symbol in symbols], axis=1)
+    column_index = pd.MultiIndex.from_product([symbols, labels], names=['symbol', 'indicator'])
+
+    return pd.DataFrame(wide, index=index, columns=column_index)
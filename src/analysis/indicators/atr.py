@@ -34,6 +34,21 @@ def calculate(df, period=14, **kwargs):
     return atr
 
 
+def calculate_batch(ctx, period=14, **kwargs):
+    """
+    ATRを全銘柄まとめて計算（True Range は期間違いのATR間で共有）
+
+    Args:
+        ctx: BatchContext
+        period: ATRの期間
+
+    Returns:
+        ndarray: ATR値（時刻×銘柄）
+    """
+    ctx.true_range()
+    return ctx.rolling('true_range', period, 'mean')
+
+
 # メタデータ
 INDICATOR_NAME = "ATR（Average True Range）"
 INDICATOR_DESCRIPTION = "ボラティリティを測定（値が大きいほど価格変動が激しい）"
@@ -5,6 +5,7 @@ OBV（On Balance Volume）指標
 """
 
 import pandas as pd
+import numpy as np
 
 
 def calculate(df, **kwargs):
@@ -27,9 +28,8 @@ def calculate(df, **kwargs):
     # 上昇 → +volume
     # 下落 → -volume
     # 変化なし → 0
-    signed_volume = df['volume'].copy()
-    signed_volume[price_change < 0] = -signed_volume[price_change < 0]
-    signed_volume[price_change == 0] = 0
+    # （先頭行は前日がないので +volume）
+    signed_volume = df['volume'] * np.sign(price_change).fillna(1)
 
     # 累積出来高
     obv = signed_volume.cumsum()
@@ -37,6 +37,24 @@ def calculate(df, **kwargs):
     return obv
 
 
+def calculate_batch(ctx, **kwargs):
+    """
+    OBVを全銘柄まとめて計算（close の差分は他の指標と共有）
+
+    Args:
+        ctx: BatchContext
+
+    Returns:
+        ndarray: OBV値（時刻×銘柄）
+    """
+    direction = np.sign(ctx.diff('close'))
+    direction[np.isnan(direction)] = 1
+    signed_volume = ctx.get('volume') * direction
+
+    # 欠けている時刻（NaN）は pandas の cumsum と同様に飛ばして累積
+    return pd.DataFrame(signed_volume).cumsum().to_numpy()
+
+
 # メタデータ
 INDICATOR_NAME = "OBV（On Balance Volume）"
 INDICATOR_DESCRIPTION = "出来高でトレンドの強さを測定（上昇トレンド時はOBVも上昇）"
@@ -5,6 +5,7 @@
 """
 
 import pandas as pd
+import numpy as np
 
 
 def calculate(df, k_period=14, d_period=3, **kwargs):
@@ -37,6 +38,31 @@ def calculate(df, k_period=14, d_period=3, **kwargs):
     return result
 
 
+def calculate_batch(ctx, k_period=14, d_period=3, **kwargs):
+    """
+    ストキャスティクスを全銘柄まとめて計算（同じ k_period の %K は %D の期間違いで共有）
+
+    Args:
+        ctx: BatchContext
+        k_period: %K の期間
+        d_period: %D の期間
+
+    Returns:
+        dict: {'stoch_k': ndarray, 'stoch_d': ndarray}（時刻×銘柄）
+    """
+    def compute_k():
+        low_min = ctx.rolling('low', k_period, 'min')
+        high_max = ctx.rolling('high', k_period, 'max')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 * (ctx.get('close') - low_min) / (high_max - low_min)
+
+    k_key = f'stoch_k:{k_period}'
+    k = ctx.cached(k_key, compute_k)
+    d = ctx.rolling(k_key, d_period, 'mean')
+
+    return {'stoch_k': k, 'stoch_d': d}
+
+
 # メタデータ
 INDICATOR_NAME = "ストキャスティクス"
 INDICATOR_DESCRIPTION = "買われすぎ・売られすぎを判定（%K > 80: 買われすぎ、%K < 20: 売られすぎ）"
@@ -0,0 +1,298 @@
+"""
+GRU予測モデルのレジストリ
+
+学習済みの重みとスケーラーをローカルに保存し、ダッシュボードやバッチ予測では
+学習し直さずに読み込む（小さなチェックポイントなので読み込みは数ミリ秒）。
+
+保存形式:
+    data/timeseries/models/gru/BTC_1d_L60_H7/_registry.json        # 登録済みバージョン（最新が末尾）
+    data/timeseries/models/gru/BTC_1d_L60_H7/3f2a9c1e0b7d4a56.pt   # 学習データの指紋ごとのチェックポイント
+
+- キーは 銘柄・時間足・lookback・horizon + 学習データの指紋
+- get_or_train() は最新バージョンを読み込み、次の場合だけ学習し直す
+    - 定期: 学習から max_age_days 日以上たった
+    - ドリフト: 学習後に増えたデータでの誤差（MAPE）が、学習時のテスト誤差の drift_ratio 倍を超えた
+    - 学習に使ったデータが書き換わった（前回分の指紋が一致しない）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import json
+import time
+import hashlib
+import argparse
+import contextlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+
+from src.analysis.gru_forecaster import GRUForecastingEngine, TimeSeriesDataset, FEATURE_COLUMNS
+
+
+REGISTRY_FILENAME = '_registry.json'
+
+# 1つのキーで残すチェックポイントの数（古いものから削除）
+KEEP_VERSIONS = 3
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """学習データの指紋（時刻と入力カラムの値のハッシュ）"""
+    digest = hashlib.sha1()
+    digest.update(pd.DatetimeIndex(df.index).as_unit('ns').asi8.tobytes())
+    digest.update(df[FEATURE_COLUMNS].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ModelRegistry:
+    """GRU予測モデルのレジストリ"""
+
+    def __init__(self, data_dir: str = None):
+        """
+        Args:
+            data_dir: 保存先ディレクトリ（デフォルト: src/data/timeseries）
+        """
+        if data_dir is None:
+            data_dir = Path(__file__).resolve().parent.parent / 'data' / 'timeseries'
+
+        self.base_dir = Path(data_dir) / 'models' / 'gru'
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _key_dir(self, symbol: str, interval: str, lookback: int, horizon: int) -> Path:
+        return self.base_dir / f"{symbol}_{interval}_L{lookback}_H{horizon}"
+
+    # ========================================
+    # 登録情報
+    # ========================================
+
+    def _load_entries(self, key_dir: Path) -> List[Dict]:
+        """登録済みバージョンの一覧（古い順）"""
+        try:
+            with open(key_dir / REGISTRY_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)['versions']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _save_entries(self, key_dir: Path, entries: List[Dict]):
+        """登録情報をAtomicに書き込み"""
+        temp_path = key_dir / f"{REGISTRY_FILENAME}.tmp.{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'versions': entries}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, key_dir / REGISTRY_FILENAME)
+
+    def latest(self, symbol: str, interval: str, lookback: int = 60, horizon: int = 7) -> Optional[Dict]:
+        """最新バージョンの登録情報（なければNone）"""
+        entries = self._load_entries(self._key_dir(symbol, interval, lookback, horizon))
+        return entries[-1] if entries else None
+
+    def list_models(self) -> List[Dict]:
+        """全キーの最新バージョン"""
+        models = []
+        for key_dir in sorted(self.base_dir.iterdir()):
+            entries = self._load_entries(key_dir) if key_dir.is_dir() else []
+            if entries:
+                models.append(dict(entries[-1], key=key_dir.name, versions=len(entries)))
+        return models
+
+    # ========================================
+    # 保存・読み込み
+    # ========================================
+
+    def register(self, symbol: str, interval: str, engine: GRUForecastingEngine,
+                 df: pd.DataFrame, metrics: Dict = None) -> Dict:
+        """
+        学習済みモデルを登録
+
+        Args:
+            engine: 学習済みエンジン
+            df: 学習に使ったデータ（指紋・行数・最終時刻を記録）
+            metrics: evaluate() の結果（ドリフト判定の基準に test_mape を使う）
+
+        Returns:
+            登録情報
+        """
+        key_dir = self._key_dir(symbol, interval, engine.lookback, engine.forecast_horizon)
+        key_dir.mkdir(parents=True, exist_ok=True)
+
+        fingerprint = data_fingerprint(df)
+        filepath = key_dir / f"{fingerprint}.pt"
+        temp_path = key_dir / f"{filepath.name}.tmp.{os.getpid()}"
+
+        torch.save(engine.get_checkpoint(), temp_path)
+        os.replace(temp_path, filepath)
+
+        entry = {
+            'fingerprint': fingerprint,
+            'file': filepath.name,
+            'symbol': symbol,
+            'interval': interval,
+            'lookback': engine.lookback,
+            'horizon': engine.forecast_horizon,
+            'rows': len(df),
+            'data_end': str(df.index[-1]),
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'test_mape': float(metrics['mape']) if metrics and np.isfinite(metrics['mape']) else None,
+        }
+
+        entries = [e for e in self._load_entries(key_dir) if e['fingerprint'] != fingerprint]
+        entries.append(entry)
+
+        # 古いチェックポイントを削除
+        for old in entries[:-KEEP_VERSIONS]:
+            (key_dir / old['file']).unlink(missing_ok=True)
+        entries = entries[-KEEP_VERSIONS:]
+
+        self._save_entries(key_dir, entries)
+        return entry
+
+    def load(self, symbol: str, interval: str, lookback: int = 60, horizon: int = 7,
+             fingerprint: str = None) -> Optional[GRUForecastingEngine]:
+        """
+        登録済みモデルを読み込み
+
+        Args:
+            fingerprint: 学習データの指紋（省略時は最新バージョン）
+
+        Returns:
+            GRUForecastingEngine（未登録ならNone）
+        """
+        key_dir = self._key_dir(symbol, interval, lookback, horizon)
+        entries = self._load_entries(key_dir)
+
+        if fingerprint is not None:
+            entries = [e for e in entries if e['fingerprint'] == fingerprint]
+        if not entries:
+            return None
+
+        checkpoint = torch.load(key_dir / entries[-1]['file'], map_location='cpu', weights_only=True)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            return GRUForecastingEngine.from_checkpoint(checkpoint)
+
+    # ========================================
+    # 再学習の判定
+    # ========================================
+
+    def recent_mape(self, engine: GRUForecastingEngine, df: pd.DataFrame, trained_rows: int) -> Tuple[float, int]:
+        """
+        学習後に増えたデータでの誤差
+
+        目的変数（horizon 本先の終値）が学習データより後にあるウィンドウだけで評価する
+
+        Returns:
+            (MAPE, 評価したウィンドウ数)
+        """
+        window = engine.lookback + engine.forecast_horizon
+        first_start = max(0, trained_rows - window + 1)
+        num_samples = len(df) - first_start - window + 1
+
+        if num_samples <= 0:
+            return float('nan'), 0
+
+        data = engine.scaler.transform(df[FEATURE_COLUMNS].values[first_start:]).astype(np.float32)
+        dataset = TimeSeriesDataset(data, np.arange(num_samples), engine.lookback, engine.forecast_horizon)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = engine.evaluate(dataset)
+
+        return float(metrics['mape']), num_samples
+
+    def needs_retrain(self, entry: Optional[Dict], df: pd.DataFrame,
+                      engine: GRUForecastingEngine = None, max_age_days: float = 7,
+                      drift_ratio: float = 1.5, min_drift_samples: int = 5) -> Optional[str]:
+        """
+        再学習が必要か判定
+
+        Returns:
+            再学習の理由（不要ならNone）
+        """
+        if entry is None:
+            return '未登録'
+
+        if len(df) < entry['rows'] or data_fingerprint(df.iloc[:entry['rows']]) != entry['fingerprint']:
+            return '学習データが変更された'
+
+        trained_at = datetime.fromisoformat(entry['trained_at'])
+        if datetime.now() - trained_at >= timedelta(days=max_age_days):
+            return f"定期再学習（{max_age_days:g}日経過）"
+
+        if engine is not None and entry.get('test_mape') is not None:
+            mape, samples = self.recent_mape(engine, df, entry['rows'])
+            if samples >= min_drift_samples and mape > entry['test_mape'] * drift_ratio:
+                return f"ドリフト（直近MAPE {mape:.2f}% > 学習時 {entry['test_mape']:.2f}% × {drift_ratio:g}）"
+
+        return None
+
+    def get_or_train(self, symbol: str, interval: str, df: pd.DataFrame, lookback: int = 60,
+                     horizon: int = 7, epochs: int = 30, max_age_days: float = 7,
+                     drift_ratio: float = 1.5) -> Tuple[GRUForecastingEngine, Dict]:
+        """
+        登録済みモデルを読み込み、必要なときだけ学習し直して登録
+
+        Args:
+            df: 最新の価格データ
+            epochs: 学習する場合の最大エポック数
+            max_age_days: この日数がたったら再学習
+            drift_ratio: 直近の誤差が学習時のテスト誤差のこの倍率を超えたら再学習
+
+        Returns:
+            (エンジン, {'status': 'loaded' | 'trained', 'reason', 'fingerprint', 'elapsed_sec'})
+        """
+        start_time = time.monotonic()
+
+        entry = self.latest(symbol, interval, lookback, horizon)
+        engine = self.load(symbol, interval, lookback, horizon) if entry else None
+        reason = self.needs_retrain(entry, df, engine, max_age_days, drift_ratio)
+
+        if reason is None:
+            return engine, {'status': 'loaded', 'reason': None, 'fingerprint': entry['fingerprint'],
+                            'elapsed_sec': time.monotonic() - start_time}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = GRUForecastingEngine(lookback=lookback, forecast_horizon=horizon)
+            train_loader, val_loader, test_dataset = engine.prepare_data(df)
+            engine.train(train_loader, val_loader, epochs=epochs)
+            metrics = engine.evaluate(test_dataset) if len(test_dataset) else None
+
+        entry = self.register(symbol, interval, engine, df, metrics)
+
+        return engine, {'status': 'trained', 'reason': reason, 'fingerprint': entry['fingerprint'],
+                        'elapsed_sec': time.monotonic() - start_time}
+
+
+def main():
+    if (sys.stdout.encoding or '').lower() != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(
+        description='GRU予測モデルのレジストリ',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python -m src.analysis.model_registry             # 登録済みモデルの一覧
+  python -m src.analysis.model_registry --symbol BTC
+        '''
+    )
+    parser.add_argument('--symbol', type=str, help='銘柄で絞り込み')
+
+    args = parser.parse_args()
+    models = [m for m in ModelRegistry().list_models() if not args.symbol or m['symbol'] == args.symbol]
+
+    if not models:
+        print("[WARNING] 登録済みモデルがありません")
+        return
+
+    print(f"{'キー':<24} {'学習日時':<20} {'データ末尾':<20} {'行数':>7} {'テストMAPE':>10} {'版数':>4}")
+    for m in models:
+        mape = f"{m['test_mape']:.2f}%" if m['test_mape'] is not None else '-'
+        print(f"{m['key']:<24} {m['trained_at']:<20} {m['data_end'][:19]:<20} {m['rows']:>7} {mape:>10} {m['versions']:>4}")
+
+
+if __name__ == '__main__':
+    main()
@@ -47,14 +47,14 @@ class NewsCollector:
                     'sentiment': news.get('sentiment', 'neutral'),
                     'importance_score': news.get('importance_score', 0.5),
                     'impact_score': news.get('impact_score', 0.5),
-                    'keywords': news.get('keywords', [symbol, name]),
                 }
 
-                news_id = self.db.add_news(news_entry)
+                # 抽出したキーワードも含めて保存（埋め込みは add_news が同じトランザクションで作る）
+                keywords = news.get('keywords', [symbol, name])
+                extracted = self._extract_keywords(news_entry['title'], news_entry['content'])
+                news_entry['keywords'] = list(dict.fromkeys(list(keywords) + extracted))
 
-                # キーワード抽出してembeddingsテーブルに保存
-                keywords = self._extract_keywords(news_entry['title'], news_entry['content'])
-                self.db.add_news_embedding(news_id, keywords)
+                self.db.add_news(news_entry)
 
                 count += 1
                 print(f"  [OK] ニュース保存: {news_entry['title'][:50]}...")
@@ -14,15 +14,67 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data.advanced_database import AdvancedDatabase
 from datetime import datetime, timedelta
+import re
+import json
 import math
+import time
+import argparse
 from typing import List, Dict, Optional
 
+import numpy as np
+import pandas as pd
+
+
+# 時間減衰曲線（経過日数がこの日数以下なら係数、当日は 1.0、どれにも当てはまらなければ 0.1）
+TIME_DECAY_STEPS = [
+    (1, 0.95),   # 1日前
+    (3, 0.9),    # 3日前
+    (7, 0.8),    # 1週間前
+    (14, 0.6),   # 2週間前
+    (30, 0.4),   # 1ヶ月前
+    (90, 0.2),   # 3ヶ月前
+]
+TIME_DECAY_TODAY = 1.0
+TIME_DECAY_MIN = 0.1
+
+# センチメントによる影響力の補正
+SENTIMENT_MULTIPLIERS = {
+    'very_positive': 1.2,
+    'positive': 1.1,
+    'neutral': 1.0,
+    'negative': 1.1,
+    'very_negative': 1.2,
+}
+
+SCORE_COLUMNS = ['relevance_score', 'importance_score', 'impact_score', 'time_decay_factor', 'final_score']
+
+# 公開日時がタイムゾーン付きか（例: 2026-10-18T09:00:00+09:00, ...Z）
+_TZ_SUFFIX_PATTERN = r'[T ]\d{2}:\d{2}.*(?:Z|[+-]\d{2}:?\d{2})$'
+
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """
+    小数3桁に丸める（calculate_final_score の round(x, 3) と同じ結果）
+
+    numpy の丸めは 1000倍してから偶数丸めするので、ちょうど .5 付近の値だけ round() で丸め直す
+    """
+    rounded = np.round(values, 3)
+    scaled = np.abs(values) * 1000
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties:
+        rounded[i] = round(float(values[i]), 3)
+    return rounded
+
 
 class ScoringEngine:
     """ニューススコアリングエンジン"""
 
-    def __init__(self):
-        self.db = AdvancedDatabase()
+    def __init__(self, db_path: str = None):
+        """
+        Args:
+            db_path: DBファイルのパス（デフォルト: src/data/advanced_trading.db）
+        """
+        self.db = AdvancedDatabase(db_path)
 
         # 重要キーワードの重み付け
         self.high_impact_keywords = {
@@ -40,6 +92,13 @@ class ScoringEngine:
             'ハードフォーク': 0.7,
         }
 
+        # キーワード列（JSON文字列）の要素に完全一致する正規表現（非ASCIIはエスケープ形式も）
+        self.keyword_matchers = [
+            (re.compile('|'.join(dict.fromkeys(re.escape(json.dumps(keyword, ensure_ascii=escape))
+                                               for escape in (True, False)))), weight)
+            for keyword, weight in self.high_impact_keywords.items()
+        ]
+
     def calculate_time_decay_factor(self, published_date: str) -> float:
         """
         時間減衰係数を計算
@@ -61,21 +120,11 @@ class ScoringEngine:
 
         # 時間減衰曲線
         if days_old == 0:
-            return 1.0  # 今日
-        elif days_old <= 1:
-            return 0.95  # 1日前
-        elif days_old <= 3:
-            return 0.9   # 3日前
-        elif days_old <= 7:
-            return 0.8   # 1週間前
-        elif days_old <= 14:
-            return 0.6   # 2週間前
-        elif days_old <= 30:
-            return 0.4   # 1ヶ月前
-        elif days_old <= 90:
-            return 0.2   # 3ヶ月前
-        else:
-            return 0.1   # それ以前
+            return TIME_DECAY_TODAY
+        for max_days, factor in TIME_DECAY_STEPS:
+            if days_old <= max_days:
+                return factor
+        return TIME_DECAY_MIN
 
     def calculate_relevance_score(self, news: Dict, target_symbol: str) -> float:
         """
@@ -150,14 +199,7 @@ class ScoringEngine:
 
         # センチメントによる補正
         sentiment = news.get('sentiment', 'neutral')
-        sentiment_multiplier = {
-            'very_positive': 1.2,
-            'positive': 1.1,
-            'neutral': 1.0,
-            'negative': 1.1,
-            'very_negative': 1.2,
-        }
-        multiplier = sentiment_multiplier.get(sentiment, 1.0)
+        multiplier = SENTIMENT_MULTIPLIERS.get(sentiment, 1.0)
 
         return min(base_score * multiplier, 1.0)
 
@@ -192,6 +234,162 @@ class ScoringEngine:
             'final_score': round(final_score, 3),
         }
 
+    # ========================================
+    # 一括スコアリング
+    # ========================================
+
+    def _parse_published_dates(self, published: pd.Series) -> pd.Series:
+        """公開日時をまとめてパース（タイムゾーン付きはローカル時刻に変換、パースできなければNaT）"""
+        published = published.astype('string')
+        has_tz = published.str.contains(_TZ_SUFFIX_PATTERN, regex=True, na=False).to_numpy()
+
+        parsed = pd.Series(pd.NaT, index=published.index, dtype='datetime64[ns]')
+        if (~has_tz).any():
+            parsed[~has_tz] = pd.to_datetime(published[~has_tz], format='ISO8601', errors='coerce')
+        if has_tz.any():
+            local_tz = datetime.now().astimezone().tzinfo
+            aware = pd.to_datetime(published[has_tz].str.replace('Z', '+00:00', regex=False),
+                                   format='ISO8601', utc=True, errors='coerce')
+            parsed[has_tz] = aware.dt.tz_convert(local_tz).dt.tz_localize(None)
+
+        return parsed
+
+    def score_news_frame(self, news: pd.DataFrame, target_symbol: str = None) -> pd.DataFrame:
+        """
+        ニュースをまとめてスコアリング（calculate_final_score の配列版）
+
+        Args:
+            news: ニュースの行（symbol, title, content, keywords, importance_score,
+                  impact_score, sentiment, published_date）
+            target_symbol: 対象銘柄シンボル（Noneの場合は各ニュースのsymbolを使用）
+
+        Returns:
+            SCORE_COLUMNS のDataFrame（news と同じindex）
+        """
+        count = len(news)
+        symbols = news['symbol'].fillna('').astype(str).to_numpy(dtype=object)
+        targets = symbols if target_symbol is None else np.full(count, target_symbol, dtype=object)
+
+        # 関連性: 銘柄一致 + タイトル・本文に銘柄名（各列の小文字化は1回だけ）
+        targets_lower = [target.lower() for target in targets]
+        titles = news['title'].fillna('').astype(str).str.lower().tolist()
+        contents = news['content'].fillna('').astype(str).str.lower().tolist()
+
+        in_title = np.fromiter((t in title for t, title in zip(targets_lower, titles)), dtype=bool, count=count)
+        in_content = np.fromiter((t in content for t, content in zip(targets_lower, contents)), dtype=bool, count=count)
+        relevance = np.minimum(np.where(symbols == targets, 0.5, 0.0) + 0.3 * in_title + 0.2 * in_content, 1.0)
+
+        # 重要性: DBの重要性スコア + 重要キーワード1つにつき 重み × 0.1
+        keywords = news['keywords'].fillna('').astype(str)
+        keyword_bonus = np.zeros(count)
+        for pattern, weight in self.keyword_matchers:
+            keyword_bonus += keywords.str.count(pattern).to_numpy() * (weight * 0.1)
+        importance = np.minimum(news['importance_score'].fillna(0.5).to_numpy(dtype=float) + keyword_bonus, 1.0)
+
+        # 影響力: DBの影響力スコア × センチメント補正
+        multiplier = news['sentiment'].map(SENTIMENT_MULTIPLIERS).fillna(1.0).to_numpy(dtype=float)
+        impact = np.minimum(news['impact_score'].fillna(0.5).to_numpy(dtype=float) * multiplier, 1.0)
+
+        # 時間減衰: 経過日数（切り捨て）で段階的に（パースできない日時は当日扱い）
+        published = self._parse_published_dates(news['published_date'])
+        elapsed = (pd.Timestamp(datetime.now()) - published).to_numpy()
+        days_old = np.floor(elapsed / np.timedelta64(1, 'D'))
+        days_old[np.isnan(days_old)] = 0
+
+        time_decay = np.select(
+            [days_old == 0] + [days_old <= max_days for max_days, _ in TIME_DECAY_STEPS],
+            [TIME_DECAY_TODAY] + [factor for _, factor in TIME_DECAY_STEPS],
+            default=TIME_DECAY_MIN,
+        )
+
+        # 最終スコア = 関連性 × 重要性 × 影響力 × 時間減衰
+        final = relevance * importance * impact * time_decay
+
+        columns = zip(SCORE_COLUMNS, (relevance, importance, impact, time_decay, final))
+        return pd.DataFrame({name: _round3(values) for name, values in columns}, index=news.index)
+
+    def load_recent_news_all(self, days_back: int = 30, limit_per_coin: int = 100) -> pd.DataFrame:
+        """
+        全銘柄の最近のニュースを1クエリで列指向に読み込み
+
+        Args:
+            days_back: 何日前までのニュースを対象とするか
+            limit_per_coin: 1銘柄あたりの件数（新しい順、Noneなら全件）
+
+        Returns:
+            ニュースのDataFrame（limit_per_coin 指定時は銘柄・新しい順）
+        """
+        columns = '''n.id, n.symbol, n.title, n.content, n.keywords, n.importance_score,
+                     n.impact_score, n.sentiment, n.published_date'''
+
+        if limit_per_coin is None:
+            # 全件ならインデックス経由のランダムアクセスより表の順次スキャンが速い
+            return pd.read_sql_query(f'''
+                SELECT {columns}
+                FROM news n NOT INDEXED
+                WHERE n.symbol IS NOT NULL
+                AND n.published_date >= (SELECT datetime('now', '-' || ? || ' days'))
+            ''', self.db.conn, params=(days_back,))
+
+        # 銘柄ごとに (symbol, published_date) インデックスから新しい順に limit 件だけ引く
+        return pd.read_sql_query(f'''
+            SELECT {columns}
+            FROM (SELECT DISTINCT symbol FROM news WHERE symbol IS NOT NULL) s
+            JOIN news n ON n.id IN (
+                SELECT m.id FROM news m
+                WHERE m.symbol = s.symbol
+                AND m.published_date >= datetime('now', '-' || ? || ' days')
+                ORDER BY m.published_date DESC
+                LIMIT ?
+            )
+            ORDER BY n.symbol, n.published_date DESC
+        ''', self.db.conn, params=(days_back, limit_per_coin))
+
+    def score_all_coins(self, days_back: int = 30, limit_per_coin: int = 100,
+                        save: bool = True) -> pd.DataFrame:
+        """
+        全銘柄のニュースを一括でスコアリングし、銘柄ごとの平均を保存
+
+        銘柄ごとに score_all_news_for_coin + save_scoring_results を呼ぶのと同じ結果を、
+        1回の読み込み・配列演算・1回の一括INSERTで求める
+
+        Args:
+            days_back: 何日前までのニュースを対象とするか
+            limit_per_coin: 1銘柄あたりの件数（新しい順、Noneなら全件）
+            save: scoring_history に保存するか
+
+        Returns:
+            銘柄ごとの平均スコア（symbol, SCORE_COLUMNS, news_count、最終スコアの高い順）
+        """
+        news = self.load_recent_news_all(days_back, limit_per_coin)
+        if news.empty:
+            return pd.DataFrame(columns=['symbol'] + SCORE_COLUMNS + ['news_count'])
+
+        scores = self.score_news_frame(news)
+        scores['symbol'] = news['symbol']
+
+        # save_scoring_results と同じく、銘柄ごとに最終スコアの高い順に足して平均（浮動小数の足し順まで揃える）
+        scores = scores.sort_values('symbol', kind='stable')
+        symbols = scores['symbol'].to_numpy(dtype=object)
+        bounds = np.r_[0, np.flatnonzero(symbols[1:] != symbols[:-1]) + 1, len(symbols)]
+        values = {column: scores[column].tolist() for column in SCORE_COLUMNS}
+
+        results = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            order = sorted(range(start, end), key=values['final_score'].__getitem__, reverse=True)
+            result = {'symbol': symbols[start]}
+            for column in SCORE_COLUMNS:
+                result[column] = round(sum(values[column][i] for i in order) / len(order), 3)
+            result['news_count'] = len(order)
+            results.append(result)
+
+        results.sort(key=lambda result: result['final_score'], reverse=True)
+
+        if save:
+            self.db.add_scoring_results(results)
+
+        return pd.DataFrame(results, columns=['symbol'] + SCORE_COLUMNS + ['news_count'])
+
     def score_all_news_for_coin(self, symbol: str, days_back: int = 30) -> List[Dict]:
         """
         特定銘柄の全ニュースをスコアリング
@@ -205,15 +403,11 @@ class ScoringEngine:
         """
         # ニュースを取得
         news_list = self.db.get_recent_news(symbol, limit=100, days=days_back)
+        if not news_list:
+            return []
 
-        scored_news = []
-        for news in news_list:
-            scores = self.calculate_final_score(dict(news), symbol)
-
-            news_with_score = dict(news)
-            news_with_score.update(scores)
-
-            scored_news.append(news_with_score)
+        scores = self.score_news_frame(pd.DataFrame(news_list), symbol)
+        scored_news = [dict(news, **score) for news, score in zip(news_list, scores.to_dict('records'))]
 
         # 最終スコアでソート（降順）
         scored_news.sort(key=lambda x: x['final_score'], reverse=True)
@@ -338,19 +532,56 @@ class ScoringAnalyzer:
         self.engine.close()
 
 
-if __name__ == '__main__':
-    # テスト実行
-    print("="*60)
-    print("スコアリングエンジン - テスト")
-    print("="*60)
-
-    analyzer = ScoringAnalyzer()
+def main():
+    parser = argparse.ArgumentParser(
+        description='ニューススコアリングエンジン',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python -m src.analysis.scoring_engine                 # BTCのニュース影響力分析
+  python -m src.analysis.scoring_engine --symbol ETH
+  python -m src.analysis.scoring_engine --all           # 全銘柄を一括で再スコアリングして保存
+  python -m src.analysis.scoring_engine --all --days 90 --no-save
+        '''
+    )
+    parser.add_argument('--symbol', type=str, default='BTC', help='分析する銘柄（デフォルト: BTC）')
+    parser.add_argument('--all', action='store_true', help='全銘柄を一括でスコアリング')
+    parser.add_argument('--days', type=int, default=None,
+                        help='何日前までのニュースを対象とするか（デフォルト: 単一銘柄 365、--all 30）')
+    parser.add_argument('--no-save', action='store_true', help='--all の結果を保存しない')
+
+    args = parser.parse_args()
+
+    if not args.all:
+        print("="*60)
+        print("スコアリングエンジン - テスト")
+        print("="*60)
+
+        analyzer = ScoringAnalyzer()
+        analyzer.analyze_news_impact(args.symbol, days_back=args.days or 365)
+        print(f"\n[OK] 分析完了")
+        analyzer.close()
+        return
+
+    engine = ScoringEngine()
+    start_time = time.perf_counter()
+    summary = engine.score_all_coins(days_back=args.days or 30, save=not args.no_save)
+    elapsed = time.perf_counter() - start_time
+
+    if summary.empty:
+        print("[WARNING] 対象のニュースがありません")
+    else:
+        print(f"{'銘柄':<10} {'最終':>6} {'関連性':>6} {'重要性':>6} {'影響力':>6} {'時間減衰':>6} {'件数':>6}")
+        for row in summary.head(20).itertuples():
+            print(f"{row.symbol:<10} {row.final_score:>6.3f} {row.relevance_score:>6.3f} "
+                  f"{row.importance_score:>6.3f} {row.impact_score:>6.3f} {row.time_decay_factor:>6.3f} "
+                  f"{row.news_count:>6}")
+
+        saved = '保存しました' if not args.no_save else '保存していません'
+        print(f"\n[OK] {len(summary)}銘柄 / {int(summary['news_count'].sum())}件を {elapsed:.2f}秒でスコアリング（{saved}）")
+
+    engine.close()
 
-    # テスト用ダミーニュース（実際にはDB内のニュースを使用）
-    test_symbol = 'BTC'
 
-    result = analyzer.analyze_news_impact(test_symbol)
-
-    print(f"\n[OK] 分析完了")
-
-    analyzer.close()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+ローリング・ストリーミング相関エンジン
+
+全銘柄の 時刻×銘柄 のリターンから、相関係数行列・ベータを
+新しい足が来るたびに O(N²) で更新する（全履歴からの再計算をしない）。
+
+保持する集計（N×N、対象の2銘柄が両方とも値を持つ足だけを数える = pandas の pairwise と同じ）:
+    K[i, j] = 件数（重み合計）
+    A[i, j] = Σ x_i      （j も有効な足）
+    Q[i, j] = Σ x_i²     （j も有効な足）
+    P[i, j] = Σ x_i x_j
+
+    cov[i, j] = (P - A ∘ Aᵀ / K) / (K - 1)
+    corr[i, j] = (P - A ∘ Aᵀ / K) / sqrt((Q - A² / K) ∘ (Qᵀ - Aᵀ² / K))
+
+- window: 直近 window 本の単純な移動窓（古い足を引き算する。誤差の蓄積を防ぐため窓1周ごとに集計し直す）
+- halflife / span: 指数加重（EWMA。集計に (1 - alpha) を掛けてから新しい足を足す）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+
+def upper_triangle(corr) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    相関行列の上三角（対角を除く）
+
+    Returns:
+        (行番号, 列番号, 値) の配列
+    """
+    values = np.asarray(corr, dtype='float64')
+    rows, cols = np.triu_indices(values.shape[0], k=1)
+    return rows, cols, values[rows, cols]
+
+
+def mean_pairwise_correlation(corr) -> float:
+    """平均相関係数（対角を除く上三角の平均、NaNは除く）"""
+    _, _, values = upper_triangle(corr)
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else 0.0
+
+
+def extreme_pairs(corr, symbols: List[str] = None, limit: int = 5,
+                  largest: bool = True, threshold: float = None) -> List[Tuple[str, str, float]]:
+    """
+    相関が最も高い（低い）銘柄ペア
+
+    Args:
+        corr: 相関行列（DataFrame または N×N 配列）
+        symbols: 銘柄名（corr が DataFrame なら省略可）
+        limit: 件数（Noneなら全件）
+        largest: True なら高い順、False なら低い順
+        threshold: 指定時、largest=False ならこの値未満、True ならこの値より大きいペアだけ
+
+    Returns:
+        [(銘柄1, 銘柄2, 相関係数), ...]
+    """
+    if symbols is None:
+        symbols = list(corr.columns)
+
+    rows, cols, values = upper_triangle(corr)
+    valid = ~np.isnan(values)
+    if threshold is not None:
+        valid &= (values > threshold) if largest else (values < threshold)
+
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+    keys = -values if largest else values
+
+    if limit is not None and limit < len(keys):
+        # 上位 limit 件だけを部分ソート
+        selected = np.argpartition(keys, limit)[:limit]
+        order = selected[np.argsort(keys[selected], kind='stable')]
+    else:
+        order = np.argsort(keys, kind='stable')
+
+    return [(symbols[rows[k]], symbols[cols[k]], float(values[k])) for k in order]
+
+
+class StreamingCorrelation:
+    """
+    ローリング / EWMA 相関係数行列（全銘柄、足ごとに O(N²) で更新）
+
+    使い方:
+        engine = StreamingCorrelation(symbols, window=1440)
+        engine.fit(prices)                      # 過去データで初期化（ベクトル化）
+        engine.update(latest_prices)            # 新しい足ごとに更新
+        engine.correlation()                    # N×N 相関行列
+        engine.beta('BTC')                      # 各銘柄の対BTCベータ
+    """
+
+    def __init__(self, symbols: List[str], window: int = None, halflife: float = None,
+                 span: float = None, min_periods: int = 2):
+        """
+        Args:
+            symbols: 銘柄（列の順番）
+            window: 移動窓の本数（window / halflife / span のどれか1つを指定）
+            halflife: EWMAの半減期（本数）
+            span: EWMAのspan（pandas の ewm(span=...) と同じ）
+            min_periods: これ未満の件数のペアはNaN
+        """
+        if sum(v is not None for v in (window, halflife, span)) != 1:
+            raise ValueError("window / halflife / span のどれか1つを指定してください")
+
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = max(2, min_periods)
+
+        if halflife is not None:
+            self.alpha = 1 - np.exp(np.log(0.5) / halflife)
+        elif span is not None:
+            self.alpha = 2.0 / (span + 1)
+        else:
+            self.alpha = None
+
+        n = len(self.symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        # 集計（N×N）
+        self.K = np.zeros((n, n))
+        self.A = np.zeros((n, n))
+        self.Q = np.zeros((n, n))
+        self.P = np.zeros((n, n))
+
+        # 移動窓の足（リングバッファ、NaN = 値なし）
+        if self.window is not None:
+            self._buffer = np.full((self.window, n), np.nan)
+            self._position = 0
+            self._since_resync = 0
+
+        self.count = 0
+        self.last_prices = np.full(n, np.nan)
+        self.last_timestamp = None
+
+    # ========================================
+    # 集計の更新
+    # ========================================
+
+    @staticmethod
+    def _terms(x: np.ndarray):
+        """1本分（または複数本分）の足から (V, X, X²) を作る（NaN → 0、V = 有効フラグ）"""
+        valid = ~np.isnan(x)
+        values = np.where(valid, x, 0.0)
+        return valid.astype('float64'), values, values * values
+
+    def _add(self, returns: np.ndarray, sign: float = 1.0):
+        """1本分のリターンを集計に加える（sign=-1 なら取り除く）"""
+        v, x, x2 = self._terms(returns)
+        self.K += sign * np.outer(v, v)
+        self.A += sign * np.outer(x, v)
+        self.Q += sign * np.outer(x2, v)
+        self.P += sign * np.outer(x, x)
+
+    def _resync(self):
+        """リングバッファから集計をまとめて計算し直す（引き算による誤差の蓄積を消す）"""
+        v, x, x2 = self._terms(self._buffer)
+        self.K = v.T @ v
+        self.A = x.T @ v
+        self.Q = x2.T @ v
+        self.P = x.T @ x
+        self._since_resync = 0
+
+    def update_returns(self, returns, timestamp=None):
+        """
+        1本分のリターンで更新（O(N²)）
+
+        Args:
+            returns: 銘柄順のリターン（NaN = その足はなし）。Series なら銘柄名で並べ替える
+            timestamp: 足の時刻
+        """
+        if isinstance(returns, pd.Series):
+            returns = returns.reindex(self.symbols)
+        returns = np.asarray(returns, dtype='float64')
+
+        if self.window is not None:
+            # 窓から押し出される足を引いてから新しい足を足す
+            oldest = self._buffer[self._position]
+            if not np.isnan(oldest).all():
+                self._add(oldest, sign=-1.0)
+
+            self._buffer[self._position] = returns
+            self._position = (self._position + 1) % self.window
+            self._add(returns)
+
+            self._since_resync += 1
+            if self._since_resync >= self.window:
+                self._resync()
+        else:
+            decay = 1.0 - self.alpha
+            for matrix in (self.K, self.A, self.Q, self.P):
+                matrix *= decay
+
+            v, x, x2 = self._terms(returns)
+            self.K += self.alpha * np.outer(v, v)
+            self.A += self.alpha * np.outer(x, v)
+            self.Q += self.alpha * np.outer(x2, v)
+            self.P += self.alpha * np.outer(x, x)
+
+        self.count += 1
+        if timestamp is not None:
+            self.last_timestamp = pd.Timestamp(timestamp)
+
+    def update(self, prices, timestamp=None):
+        """
+        1本分の価格で更新（直前の価格からリターンを計算）
+
+        Args:
+            prices: 銘柄順の価格（NaN = その足はなし → 直前の価格を引き継ぐ）
+            timestamp: 足の時刻
+        """
+        if isinstance(prices, pd.Series):
+            prices = prices.reindex(self.symbols)
+        prices = np.asarray(prices, dtype='float64')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = prices / self.last_prices - 1.0
+
+        self.update_returns(returns, timestamp)
+        self.last_prices = np.where(np.isnan(prices), self.last_prices, prices)
+
+    def update_frame(self, prices: pd.DataFrame):
+        """
+        複数の足で順に更新（last_timestamp 以前の足は無視）
+
+        Args:
+            prices: DatetimeIndex・銘柄列の価格DataFrame
+
+        Returns:
+            更新した本数
+        """
+        if self.last_timestamp is not None:
+            prices = prices[prices.index > self.last_timestamp]
+
+        values = prices.reindex(columns=self.symbols).to_numpy(dtype='float64')
+        for timestamp, row in zip(prices.index, values):
+            self.update(row, timestamp)
+
+        return len(values)
+
+    def fit(self, prices: pd.DataFrame):
+        """
+        過去の価格で初期化（足ごとのループではなく行列積でまとめて計算）
+
+        Args:
+            prices: DatetimeIndex・銘柄列の価格DataFrame（時刻順）
+        """
+        values = prices.reindex(columns=self.symbols).to_numpy(dtype='float64')
+        if len(values) == 0:
+            return self
+
+        # 直前の価格（欠けている足は前の価格を引き継ぐ）からのリターン
+        filled = pd.DataFrame(values).ffill().to_numpy()
+        previous = np.vstack([self.last_prices, filled[:-1]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = values / previous - 1.0
+
+        if self.window is not None:
+            tail = returns[-self.window:]
+            self._buffer[:] = np.nan
+            self._buffer[:len(tail)] = tail
+            self._position = len(tail) % self.window
+            self._resync()
+        else:
+            # 新しい足ほど重い指数加重（古い集計も同じ割合で減衰させる）
+            n_rows = len(returns)
+            weights = self.alpha * (1.0 - self.alpha) ** np.arange(n_rows - 1, -1, -1)
+            decay = (1.0 - self.alpha) ** n_rows
+
+            v, x, x2 = self._terms(returns)
+            self.K = decay * self.K + (v * weights[:, None]).T @ v
+            self.A = decay * self.A + (x * weights[:, None]).T @ v
+            self.Q = decay * self.Q + (x2 * weights[:, None]).T @ v
+            self.P = decay * self.P + (x * weights[:, None]).T @ x
+
+        self.count += len(values)
+        # 期間中に一度も値がない銘柄は、それまでの価格を引き継ぐ
+        self.last_prices = np.where(np.isnan(filled[-1]), self.last_prices, filled[-1])
+        self.last_timestamp = pd.Timestamp(prices.index[-1])
+
+        return self
+
+    # ========================================
+    # 結果
+    # ========================================
+
+    def _moments(self):
+        """(中心化した共分散の分子, 各ペアでの分散の分子 i側, j側, 件数)"""
+        K = self.K
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cross = self.P - self.A * self.A.T / K
+            var_i = self.Q - self.A * self.A / K
+            var_j = var_i.T
+
+        # 件数が足りないペアはNaN（EWMA の K は重みの合計なので、足の本数で判定する）
+        if self.window is not None:
+            too_few = K < self.min_periods
+        else:
+            too_few = (K <= 0) | (self.count < self.min_periods)
+
+        return cross, var_i, var_j, K, too_few
+
+    def correlation(self, as_frame: bool = True):
+        """
+        相関係数行列
+
+        Returns:
+            DataFrame（as_frame=False なら N×N 配列）
+        """
+        cross, var_i, var_j, _, too_few = self._moments()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cross / np.sqrt(var_i * var_j)
+
+        corr[too_few] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        valid_diagonal = ~np.isnan(np.diagonal(corr))
+        np.fill_diagonal(corr, np.where(valid_diagonal, 1.0, np.nan))
+
+        if not as_frame:
+            return corr
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def covariance(self, as_frame: bool = True):
+        """共分散行列（移動窓は不偏、EWMAは重み付き）"""
+        cross, _, _, K, too_few = self._moments()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = cross / (K - 1) if self.window is not None else cross / K
+
+        cov[too_few] = np.nan
+
+        if not as_frame:
+            return cov
+        return pd.DataFrame(cov, index=self.symbols, columns=self.symbols)
+
+    def beta(self, benchmark: str) -> pd.Series:
+        """
+        各銘柄のベータ値（対ベンチマーク）
+
+        beta_i = Cov(i, benchmark) / Var(benchmark)（両方に値がある足だけで計算）
+        """
+        b = self._index[benchmark]
+        cross, _, var_j, _, too_few = self._moments()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = cross[:, b] / var_j[:, b]
+
+        beta[too_few[:, b]] = np.nan
+        return pd.Series(beta, index=self.symbols, name=f'beta_{benchmark}')
+
+    def mean_correlation(self) -> float:
+        """平均相関係数（全ペア）"""
+        return mean_pairwise_correlation(self.correlation(as_frame=False))
+
+    def top_pairs(self, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """最も連動しているペア"""
+        return extreme_pairs(self.correlation(as_frame=False), self.symbols, limit, largest=True)
+
+    def bottom_pairs(self, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """最も独立しているペア"""
+        return extreme_pairs(self.correlation(as_frame=False), self.symbols, limit, largest=False)
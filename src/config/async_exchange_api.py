@@ -0,0 +1,294 @@
+"""
+取引所API連携（非同期版）
+1つのイベントループから数十件のリクエストを並行に投げるためのクライアント
+
+同期版（exchange_api.py）と同じメソッド名・戻り値で、レスポンス変換も共通の関数を使う。
+
+使い方:
+    async with AsyncMEXCAPI() as api:
+        stats = await api.get_24h_stats_many(['BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.config.exchange_api import (
+    APIClientBase,
+    RETRY_STATUS_CODES,
+    parse_price,
+    parse_24h_stats,
+    parse_klines,
+    parse_balances,
+    select_trending,
+    select_pumping,
+)
+
+
+class AsyncExchangeAPI(APIClientBase):
+    """
+    取引所API基底クラス（非同期版）
+
+    - aiohttp.ClientSession を1つ持ち、TCPConnector の接続プールを使い回す
+    - リトライ・バックオフ・レイテンシ集計は同期版と共通
+    - レートリミッターは acquire_async でイベントループを止めずに待つ
+    """
+
+    def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
+        """
+        Args:
+            api_key: APIキー
+            api_secret: APIシークレット
+            **kwargs: 接続設定（APIClientBase を参照）
+        """
+        super().__init__(api_key, api_secret, **kwargs)
+
+        # セッションはイベントループ上で作る必要があるので初回リクエスト時に作成
+        self.session = None
+
+    def _client_timeout(self) -> aiohttp.ClientTimeout:
+        """timeout 設定を aiohttp 形式に変換"""
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(total=self.timeout)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """セッションを取得（なければ作成）"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self._client_timeout())
+        return self.session
+
+    async def close(self):
+        """セッションを閉じる"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _request(self, method: str, url: str, params: Dict = None, headers: Dict = None,
+                       max_retries: int = None):
+        """
+        リクエストを送りJSONを返す
+
+        429/418/5xx と接続エラーはバックオフしてリトライする
+
+        Args:
+            method: 'GET' / 'POST'
+            url: リクエストURL
+            params: クエリパラメータ
+            headers: 追加ヘッダー
+            max_retries: リトライ回数（省略時はインスタンス設定。署名付きは0を指定）
+
+        Raises:
+            aiohttp.ClientError: リトライしても失敗した場合
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+        path = urlparse(url).path
+        session = self._get_session()
+
+        # aiohttp はクエリに数値を渡せないので文字列化
+        if params:
+            params = {key: str(value) for key, value in params.items()}
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None and self.EXCHANGE:
+                await self.rate_limiter.acquire_async(self._request_weight(path, params))
+
+            start = time.perf_counter()
+            try:
+                async with session.request(method, url, params=params, headers=headers) as response:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    should_retry = response.status in RETRY_STATUS_CODES and attempt < max_retries
+                    self._record_latency(path, elapsed_ms, error=response.status >= 400, retry=should_retry)
+
+                    if not should_retry:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+
+                    delay = self._backoff_delay(attempt, response.headers.get('Retry-After'))
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self._record_latency(path, (time.perf_counter() - start) * 1000,
+                                     error=True, retry=attempt < max_retries)
+                if attempt >= max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+
+            else:
+                if self.rate_limiter is not None and response.status in (418, 429):
+                    self.rate_limiter.penalize(delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ========================================
+    # 市場データ（認証不要）
+    # ========================================
+
+    async def get_all_tickers(self) -> List[Dict]:
+        """
+        全銘柄の24時間統計を一括取得（生データ）
+
+        Raises:
+            aiohttp.ClientError: 取得失敗時
+        """
+        return await self._request('GET', f'{self.BASE_URL}/api/v3/ticker/24hr')
+
+    async def get_price(self, symbol: str) -> float:
+        """現在価格を取得（認証不要）"""
+        try:
+            data = await self._request('GET', f'{self.BASE_URL}/api/v3/ticker/price',
+                                       params={'symbol': symbol})
+            return parse_price(data)
+        except Exception as e:
+            print(f"[NG] 価格取得エラー: {symbol}: {e}")
+            return None
+
+    async def get_24h_stats(self, symbol: str) -> Dict:
+        """24時間統計を取得（認証不要）"""
+        try:
+            data = await self._request('GET', f'{self.BASE_URL}/api/v3/ticker/24hr',
+                                       params={'symbol': symbol})
+            return parse_24h_stats(data)
+        except Exception as e:
+            print(f"[NG] 統計取得エラー: {symbol}: {e}")
+            return None
+
+    async def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> List:
+        """ローソク足データを取得（認証不要）"""
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'limit': limit
+        }
+
+        try:
+            data = await self._request('GET', f'{self.BASE_URL}/api/v3/klines', params=params)
+            return parse_klines(data)
+        except Exception as e:
+            print(f"[NG] ローソク足取得エラー: {symbol}: {e}")
+            return None
+
+    async def get_trending_coins(self, min_volume_usdt: float = 100000) -> List[Dict]:
+        """トレンドコインを取得（出来高が多い順）"""
+        try:
+            return select_trending(await self.get_all_tickers(), min_volume_usdt)
+        except Exception as e:
+            print(f"[NG] トレンドコイン取得エラー: {e}")
+            return []
+
+    async def find_pumping_coins(self, min_change_percent: float = 10.0) -> List[Dict]:
+        """急騰中のコインを探す"""
+        try:
+            return select_pumping(await self.get_all_tickers(), min_change_percent)
+        except Exception as e:
+            print(f"[NG] 急騰コイン検索エラー: {e}")
+            return []
+
+    # ========================================
+    # 複数銘柄の並行取得
+    # ========================================
+
+    async def get_prices_many(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        複数銘柄の現在価格を並行取得
+
+        Returns:
+            {symbol: price}（取得失敗はNone）
+        """
+        results = await asyncio.gather(*(self.get_price(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    async def get_24h_stats_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        複数銘柄の24時間統計を並行取得
+
+        Returns:
+            {symbol: stats}（取得失敗はNone）
+        """
+        results = await asyncio.gather(*(self.get_24h_stats(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    async def get_klines_many(self, symbols: List[str], interval: str = '1h',
+                              limit: int = 100) -> Dict[str, List]:
+        """
+        複数銘柄のローソク足を並行取得
+
+        Returns:
+            {symbol: klines}（取得失敗はNone）
+        """
+        results = await asyncio.gather(*(self.get_klines(symbol, interval, limit) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    # ========================================
+    # 取引（要認証）
+    # ========================================
+
+    async def _order(self, symbol: str, side: str, quantity: float) -> Dict:
+        """成行注文"""
+        if not self.api_key or not self.api_secret:
+            return {'error': 'API Key/Secretが設定されていません'}
+
+        params = self._signed_params({
+            'symbol': symbol,
+            'side': side,
+            'type': 'MARKET',
+            'quantity': quantity,
+        })
+        headers = {self.API_KEY_HEADER: self.api_key}
+
+        try:
+            return await self._request('POST', f'{self.BASE_URL}/api/v3/order',
+                                       params=params, headers=headers, max_retries=0)
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def buy(self, symbol: str, quantity: float) -> Dict:
+        """成行買い注文（要認証）"""
+        return await self._order(symbol, 'BUY', quantity)
+
+    async def sell(self, symbol: str, quantity: float) -> Dict:
+        """成行売り注文（要認証）"""
+        return await self._order(symbol, 'SELL', quantity)
+
+    async def get_account_balance(self) -> Dict:
+        """アカウント残高を取得（要認証）"""
+        if not self.api_key or not self.api_secret:
+            return {'error': 'API Key/Secretが設定されていません'}
+
+        params = self._signed_params({})
+        headers = {self.API_KEY_HEADER: self.api_key}
+
+        try:
+            data = await self._request('GET', f'{self.BASE_URL}/api/v3/account',
+                                       params=params, headers=headers, max_retries=0)
+            return parse_balances(data)
+        except Exception as e:
+            return {'error': str(e)}
+
+
+class AsyncBinanceAPI(AsyncExchangeAPI):
+    """Binance API（非同期版）"""
+
+    BASE_URL = 'https://api.binance.com'
+    EXCHANGE = 'binance'
+    API_KEY_HEADER = 'X-MBX-APIKEY'
+
+
+class AsyncMEXCAPI(AsyncExchangeAPI):
+    """MEXC API（非同期版）"""
+
+    BASE_URL = 'https://api.mexc.com'
+    EXCHANGE = 'mexc'
+    API_KEY_HEADER = 'X-MEXC-APIKEY'
@@ -4,22 +4,335 @@ Binance, MEXCなどの主要取引所に対応
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import hmac
 import hashlib
-from typing import Dict, List, Optional
-from urllib.parse import urlencode
+import random
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urlparse
 import json
 import os
 
 
-class ExchangeAPI:
-    """取引所API基底クラス"""
+# リトライ対象のHTTPステータス（レート超過・サーバーエラー）
+RETRY_STATUS_CODES = {418, 429, 500, 502, 503, 504}
 
-    def __init__(self, api_key: str = None, api_secret: str = None):
+
+# ========================================
+# レスポンス変換（同期版・非同期版で共通）
+# ========================================
+
+def parse_price(data: Dict) -> float:
+    """ticker/price のレスポンスから価格を取り出す"""
+    return float(data['price'])
+
+
+def parse_24h_stats(data: Dict) -> Dict:
+    """ticker/24hr（1銘柄）のレスポンスを統計dictに変換"""
+    return {
+        'symbol': data['symbol'],
+        'price': float(data['lastPrice']),
+        'price_change_percent': float(data['priceChangePercent']),
+        'high': float(data['highPrice']),
+        'low': float(data['lowPrice']),
+        'volume': float(data['volume']),
+        'quote_volume': float(data['quoteVolume']),
+    }
+
+
+def parse_klines(klines: List) -> List[Dict]:
+    """klines のレスポンスをdictのリストに変換"""
+    return [
+        {
+            'timestamp': k[0],
+            'open': float(k[1]),
+            'high': float(k[2]),
+            'low': float(k[3]),
+            'close': float(k[4]),
+            'volume': float(k[5]),
+        }
+        for k in klines
+    ]
+
+
+def _ticker_summary(item: Dict) -> Dict:
+    """全銘柄ticker の1件を一覧用dictに変換"""
+    return {
+        'symbol': item['symbol'],
+        'price': float(item['lastPrice']),
+        'change_percent': float(item['priceChangePercent']),
+        'volume_usdt': float(item['quoteVolume']),
+    }
+
+
+def select_trending(tickers: List[Dict], min_volume_usdt: float) -> List[Dict]:
+    """全銘柄tickerからUSDT建て・出来高上位50件を抽出"""
+    usdt_pairs = [
+        _ticker_summary(item)
+        for item in tickers
+        if item['symbol'].endswith('USDT') and float(item['quoteVolume']) > min_volume_usdt
+    ]
+
+    # 出来高順にソート
+    usdt_pairs.sort(key=lambda x: x['volume_usdt'], reverse=True)
+
+    return usdt_pairs[:50]  # トップ50
+
+
+def select_pumping(tickers: List[Dict], min_change_percent: float) -> List[Dict]:
+    """全銘柄tickerからUSDT建て・変動率が閾値以上のものを抽出"""
+    pumping = [
+        _ticker_summary(item)
+        for item in tickers
+        if item['symbol'].endswith('USDT') and
+        float(item['priceChangePercent']) >= min_change_percent
+    ]
+
+    # 変動率順にソート
+    pumping.sort(key=lambda x: x['change_percent'], reverse=True)
+
+    return pumping
+
+
+def parse_balances(data: Dict) -> Dict:
+    """account のレスポンスから残高のある資産だけを取り出す"""
+    return {
+        asset['asset']: {
+            'free': float(asset['free']),
+            'locked': float(asset['locked']),
+        }
+        for asset in data['balances']
+        if float(asset['free']) > 0 or float(asset['locked']) > 0
+    }
+
+
+class APIClientBase:
+    """
+    取引所APIクライアントの共通部分（同期版・非同期版で共有）
+
+    - 接続設定（プールサイズ・タイムアウト・リトライ）
+    - ジッター付き指数バックオフの待機時間
+    - エンドポイントごとのレイテンシ集計
+    - リクエスト署名
+    """
+
+    # 取引所ごとの既定URL（base_url 引数で差し替え可能。ローカルのスタブサーバー等）
+    BASE_URL = None
+
+    # レートリミッターのウェイト表で使う取引所名
+    EXCHANGE = None
+
+    # 認証付きリクエストのAPIキーヘッダー名
+    API_KEY_HEADER = None
+
+    def __init__(self, api_key: str = None, api_secret: str = None,
+                 pool_size: int = 20,
+                 timeout: Union[float, Tuple[float, float]] = (5, 15),
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 10.0,
+                 rate_limiter=None,
+                 base_url: str = None):
+        """
+        Args:
+            api_key: APIキー
+            api_secret: APIシークレット
+            pool_size: 接続プールのサイズ（同時接続数の上限）
+            timeout: タイムアウト秒（数値 または (接続, 読み込み) のタプル）
+            max_retries: 429/5xx・接続エラー時の最大リトライ回数
+            backoff_base: バックオフの基準秒（base * 2^n の範囲でランダムに待つ）
+            backoff_max: 指数バックオフの上限秒（Retry-After の指定には適用しない）
+            rate_limiter: 共有レートリミッター（src.config.rate_limiter、省略可）
+            base_url: 接続先URL（省略時は取引所の既定URL）
+        """
         self.api_key = api_key
         self.api_secret = api_secret
 
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter
+
+        if base_url is not None:
+            self.BASE_URL = base_url.rstrip('/')
+
+        # エンドポイント別レイテンシ {path: {'count', 'errors', 'retries', 'total_ms', 'max_ms'}}
+        self.latency_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _sign_request(self, params: Dict) -> str:
+        """リクエストに署名"""
+        query_string = urlencode(params)
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'),
+            query_string.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return signature
+
+    def _signed_params(self, params: Dict) -> Dict:
+        """timestamp と署名を付けたパラメータを返す"""
+        params = dict(params)
+        params['timestamp'] = int(time.time() * 1000)
+        params['signature'] = self._sign_request(params)
+        return params
+
+    def _request_weight(self, path: str, params: Dict = None) -> int:
+        """レートリミッターに払うウェイト"""
+        from src.config.rate_limiter import request_weight
+        return request_weight(self.EXCHANGE, path, params)
+
+    def _backoff_delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        リトライ前の待機秒数（Full Jitter 方式）
+
+        Retry-After があればその秒数をそのまま待つ（backoff_max で切り詰めると取引所の指定より早く
+        再送して IP BAN を招くため、上限は指数バックオフ側だけにかける）
+
+        Args:
+            attempt: 何回目のリトライか（0始まり）
+            retry_after: Retry-After ヘッダーの値
+        """
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record_latency(self, path: str, elapsed_ms: float, error: bool = False, retry: bool = False):
+        """レイテンシを集計"""
+        with self._stats_lock:
+            stats = self.latency_stats.setdefault(
+                path, {'count': 0, 'errors': 0, 'retries': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            if error:
+                stats['errors'] += 1
+            if retry:
+                stats['retries'] += 1
+
+    def get_latency_stats(self) -> Dict:
+        """
+        エンドポイント別のレイテンシ統計を取得
+
+        Returns:
+            {path: {'count', 'errors', 'retries', 'avg_ms', 'max_ms'}}
+        """
+        with self._stats_lock:
+            return {
+                path: {
+                    'count': stats['count'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'avg_ms': stats['total_ms'] / stats['count'] if stats['count'] else 0.0,
+                    'max_ms': stats['max_ms'],
+                }
+                for path, stats in self.latency_stats.items()
+            }
+
+
+class ExchangeAPI(APIClientBase):
+    """
+    取引所API基底クラス
+
+    - 接続プール付きのSessionを持ち、Keep-AliveでTCP/TLSハンドシェイクを再利用する
+    - 429/5xx・接続エラーはジッター付き指数バックオフでリトライ
+    - エンドポイントごとのレイテンシを集計
+    """
+
+    def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
+        """
+        Args:
+            api_key: APIキー
+            api_secret: APIシークレット
+            **kwargs: 接続設定（APIClientBase を参照）
+        """
+        super().__init__(api_key, api_secret, **kwargs)
+
+        # 接続プール付きセッション（リトライは自前で行うのでアダプタ側は0）
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        """セッションを閉じる"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request(self, method: str, url: str, params: Dict = None, headers: Dict = None,
+                 max_retries: int = None) -> requests.Response:
+        """
+        プール済みセッションでリクエストを送る
+
+        429/418/5xx と接続エラーはバックオフしてリトライし、最後のレスポンスを返す
+        （ステータスの判定は呼び出し側の raise_for_status に任せる）
+
+        Args:
+            method: 'GET' / 'POST'
+            url: リクエストURL
+            params: クエリパラメータ
+            headers: 追加ヘッダー
+            max_retries: リトライ回数（省略時はインスタンス設定。署名付きは0を指定）
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+        path = urlparse(url).path
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None and self.EXCHANGE:
+                self.rate_limiter.acquire(self._request_weight(path, params))
+
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, params=params, headers=headers,
+                                                timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record_latency(path, (time.perf_counter() - start) * 1000,
+                                     error=True, retry=attempt < max_retries)
+                if attempt >= max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            should_retry = response.status_code in RETRY_STATUS_CODES and attempt < max_retries
+            self._record_latency(path, elapsed_ms, error=response.status_code >= 400, retry=should_retry)
+
+            if not should_retry:
+                return response
+
+            delay = self._backoff_delay(attempt, response.headers.get('Retry-After'))
+            if self.rate_limiter is not None and response.status_code in (418, 429):
+                self.rate_limiter.penalize(delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def get_all_tickers(self) -> List[Dict]:
+        """
+        全銘柄の24時間統計を一括取得（生データ）
+
+        Raises:
+            requests.exceptions.RequestException: 取得失敗時
+        """
+        url = f'{self.BASE_URL}/api/v3/ticker/24hr'
+        response = self._request('GET', url)
+        response.raise_for_status()
+        return response.json()
+
     def get_price(self, symbol: str) -> float:
         """現在価格を取得"""
         raise NotImplementedError
@@ -45,19 +358,11 @@ class BinanceAPI(ExchangeAPI):
     """Binance API"""
 
     BASE_URL = 'https://api.binance.com'
+    EXCHANGE = 'binance'
+    API_KEY_HEADER = 'X-MBX-APIKEY'
 
-    def __init__(self, api_key: str = None, api_secret: str = None):
-        super().__init__(api_key, api_secret)
-
-    def _sign_request(self, params: Dict) -> str:
-        """リクエストに署名"""
-        query_string = urlencode(params)
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+    def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
+        super().__init__(api_key, api_secret, **kwargs)
 
     def get_price(self, symbol: str) -> float:
         """現在価格を取得（認証不要）"""
@@ -65,10 +370,9 @@ class BinanceAPI(ExchangeAPI):
         params = {'symbol': symbol}
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            data = response.json()
-            return float(data['price'])
+            return parse_price(response.json())
         except Exception as e:
             print(f"❌ 価格取得エラー: {e}")
             return None
@@ -79,19 +383,9 @@ class BinanceAPI(ExchangeAPI):
         params = {'symbol': symbol}
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            data = response.json()
-
-            return {
-                'symbol': data['symbol'],
-                'price': float(data['lastPrice']),
-                'price_change_percent': float(data['priceChangePercent']),
-                'high': float(data['highPrice']),
-                'low': float(data['lowPrice']),
-                'volume': float(data['volume']),
-                'quote_volume': float(data['quoteVolume']),
-            }
+            return parse_24h_stats(response.json())
         except Exception as e:
             print(f"❌ 統計取得エラー: {e}")
             return None
@@ -110,23 +404,9 @@ class BinanceAPI(ExchangeAPI):
         }
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            klines = response.json()
-
-            # フォーマット変換
-            formatted = []
-            for k in klines:
-                formatted.append({
-                    'timestamp': k[0],
-                    'open': float(k[1]),
-                    'high': float(k[2]),
-                    'low': float(k[3]),
-                    'close': float(k[4]),
-                    'volume': float(k[5]),
-                })
-
-            return formatted
+            return parse_klines(response.json())
         except Exception as e:
             print(f"❌ ローソク足取得エラー: {e}")
             return None
@@ -136,26 +416,10 @@ class BinanceAPI(ExchangeAPI):
         url = f'{self.BASE_URL}/api/v3/ticker/24hr'
 
         try:
-            response = requests.get(url)
+            response = self._request('GET', url)
             response.raise_for_status()
-            data = response.json()
-
             # USDT建てのみフィルタ & 出来高でソート
-            usdt_pairs = [
-                {
-                    'symbol': item['symbol'],
-                    'price': float(item['lastPrice']),
-                    'change_percent': float(item['priceChangePercent']),
-                    'volume_usdt': float(item['quoteVolume']),
-                }
-                for item in data
-                if item['symbol'].endswith('USDT') and float(item['quoteVolume']) > min_volume_usdt
-            ]
-
-            # 出来高順にソート
-            usdt_pairs.sort(key=lambda x: x['volume_usdt'], reverse=True)
-
-            return usdt_pairs[:50]  # トップ50
+            return select_trending(response.json(), min_volume_usdt)
         except Exception as e:
             print(f"❌ トレンドコイン取得エラー: {e}")
             return []
@@ -165,26 +429,9 @@ class BinanceAPI(ExchangeAPI):
         url = f'{self.BASE_URL}/api/v3/ticker/24hr'
 
         try:
-            response = requests.get(url)
+            response = self._request('GET', url)
             response.raise_for_status()
-            data = response.json()
-
-            pumping = [
-                {
-                    'symbol': item['symbol'],
-                    'price': float(item['lastPrice']),
-                    'change_percent': float(item['priceChangePercent']),
-                    'volume_usdt': float(item['quoteVolume']),
-                }
-                for item in data
-                if item['symbol'].endswith('USDT') and
-                float(item['priceChangePercent']) >= min_change_percent
-            ]
-
-            # 変動率順にソート
-            pumping.sort(key=lambda x: x['change_percent'], reverse=True)
-
-            return pumping
+            return select_pumping(response.json(), min_change_percent)
         except Exception as e:
             print(f"❌ 急騰コイン検索エラー: {e}")
             return []
@@ -195,22 +442,16 @@ class BinanceAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/order'
-        timestamp = int(time.time() * 1000)
-
-        params = {
+        params = self._signed_params({
             'symbol': symbol,
             'side': 'BUY',
             'type': 'MARKET',
             'quantity': quantity,
-            'timestamp': timestamp,
-        }
-
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MBX-APIKEY': self.api_key}
+        })
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.post(url, params=params, headers=headers)
+            response = self._request('POST', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -222,22 +463,16 @@ class BinanceAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/order'
-        timestamp = int(time.time() * 1000)
-
-        params = {
+        params = self._signed_params({
             'symbol': symbol,
             'side': 'SELL',
             'type': 'MARKET',
             'quantity': quantity,
-            'timestamp': timestamp,
-        }
-
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MBX-APIKEY': self.api_key}
+        })
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.post(url, params=params, headers=headers)
+            response = self._request('POST', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -249,28 +484,13 @@ class BinanceAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/account'
-        timestamp = int(time.time() * 1000)
-
-        params = {'timestamp': timestamp}
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MBX-APIKEY': self.api_key}
+        params = self._signed_params({})
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = self._request('GET', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
-            data = response.json()
-
-            balances = {
-                asset['asset']: {
-                    'free': float(asset['free']),
-                    'locked': float(asset['locked']),
-                }
-                for asset in data['balances']
-                if float(asset['free']) > 0 or float(asset['locked']) > 0
-            }
-
-            return balances
+            return parse_balances(response.json())
         except Exception as e:
             return {'error': str(e)}
 
@@ -279,19 +499,11 @@ class MEXCAPI(ExchangeAPI):
     """MEXC API"""
 
     BASE_URL = 'https://api.mexc.com'
+    EXCHANGE = 'mexc'
+    API_KEY_HEADER = 'X-MEXC-APIKEY'
 
-    def __init__(self, api_key: str = None, api_secret: str = None):
-        super().__init__(api_key, api_secret)
-
-    def _sign_request(self, params: Dict) -> str:
-        """リクエストに署名"""
-        query_string = urlencode(params)
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+    def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
+        super().__init__(api_key, api_secret, **kwargs)
 
     def get_price(self, symbol: str) -> float:
         """現在価格を取得（認証不要）"""
@@ -299,10 +511,9 @@ class MEXCAPI(ExchangeAPI):
         params = {'symbol': symbol}
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            data = response.json()
-            return float(data['price'])
+            return parse_price(response.json())
         except Exception as e:
             print(f"[NG] 価格取得エラー: {e}")
             return None
@@ -313,19 +524,9 @@ class MEXCAPI(ExchangeAPI):
         params = {'symbol': symbol}
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            data = response.json()
-
-            return {
-                'symbol': data['symbol'],
-                'price': float(data['lastPrice']),
-                'price_change_percent': float(data['priceChangePercent']),
-                'high': float(data['highPrice']),
-                'low': float(data['lowPrice']),
-                'volume': float(data['volume']),
-                'quote_volume': float(data['quoteVolume']),
-            }
+            return parse_24h_stats(response.json())
         except Exception as e:
             print(f"[NG] 統計取得エラー: {e}")
             return None
@@ -344,23 +545,9 @@ class MEXCAPI(ExchangeAPI):
         }
 
         try:
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
-            klines = response.json()
-
-            # フォーマット変換
-            formatted = []
-            for k in klines:
-                formatted.append({
-                    'timestamp': k[0],
-                    'open': float(k[1]),
-                    'high': float(k[2]),
-                    'low': float(k[3]),
-                    'close': float(k[4]),
-                    'volume': float(k[5]),
-                })
-
-            return formatted
+            return parse_klines(response.json())
         except Exception as e:
             print(f"[NG] ローソク足取得エラー: {e}")
             return None
@@ -370,26 +557,10 @@ class MEXCAPI(ExchangeAPI):
         url = f'{self.BASE_URL}/api/v3/ticker/24hr'
 
         try:
-            response = requests.get(url)
+            response = self._request('GET', url)
             response.raise_for_status()
-            data = response.json()
-
             # USDT建てのみフィルタ & 出来高でソート
-            usdt_pairs = [
-                {
-                    'symbol': item['symbol'],
-                    'price': float(item['lastPrice']),
-                    'change_percent': float(item['priceChangePercent']),
-                    'volume_usdt': float(item['quoteVolume']),
-                }
-                for item in data
-                if item['symbol'].endswith('USDT') and float(item['quoteVolume']) > min_volume_usdt
-            ]
-
-            # 出来高順にソート
-            usdt_pairs.sort(key=lambda x: x['volume_usdt'], reverse=True)
-
-            return usdt_pairs[:50]  # トップ50
+            return select_trending(response.json(), min_volume_usdt)
         except Exception as e:
             print(f"[NG] トレンドコイン取得エラー: {e}")
             return []
@@ -399,26 +570,9 @@ class MEXCAPI(ExchangeAPI):
         url = f'{self.BASE_URL}/api/v3/ticker/24hr'
 
         try:
-            response = requests.get(url)
+            response = self._request('GET', url)
             response.raise_for_status()
-            data = response.json()
-
-            pumping = [
-                {
-                    'symbol': item['symbol'],
-                    'price': float(item['lastPrice']),
-                    'change_percent': float(item['priceChangePercent']),
-                    'volume_usdt': float(item['quoteVolume']),
-                }
-                for item in data
-                if item['symbol'].endswith('USDT') and
-                float(item['priceChangePercent']) >= min_change_percent
-            ]
-
-            # 変動率順にソート
-            pumping.sort(key=lambda x: x['change_percent'], reverse=True)
-
-            return pumping
+            return select_pumping(response.json(), min_change_percent)
         except Exception as e:
             print(f"[NG] 急騰コイン検索エラー: {e}")
             return []
@@ -429,22 +583,16 @@ class MEXCAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/order'
-        timestamp = int(time.time() * 1000)
-
-        params = {
+        params = self._signed_params({
             'symbol': symbol,
             'side': 'BUY',
             'type': 'MARKET',
             'quantity': quantity,
-            'timestamp': timestamp,
-        }
-
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MEXC-APIKEY': self.api_key}
+        })
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.post(url, params=params, headers=headers)
+            response = self._request('POST', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -456,22 +604,16 @@ class MEXCAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/order'
-        timestamp = int(time.time() * 1000)
-
-        params = {
+        params = self._signed_params({
             'symbol': symbol,
             'side': 'SELL',
             'type': 'MARKET',
             'quantity': quantity,
-            'timestamp': timestamp,
-        }
-
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MEXC-APIKEY': self.api_key}
+        })
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.post(url, params=params, headers=headers)
+            response = self._request('POST', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -483,28 +625,13 @@ class MEXCAPI(ExchangeAPI):
             return {'error': 'API Key/Secretが設定されていません'}
 
         url = f'{self.BASE_URL}/api/v3/account'
-        timestamp = int(time.time() * 1000)
-
-        params = {'timestamp': timestamp}
-        params['signature'] = self._sign_request(params)
-
-        headers = {'X-MEXC-APIKEY': self.api_key}
+        params = self._signed_params({})
+        headers = {self.API_KEY_HEADER: self.api_key}
 
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = self._request('GET', url, params=params, headers=headers, max_retries=0)
             response.raise_for_status()
-            data = response.json()
-
-            balances = {
-                asset['asset']: {
-                    'free': float(asset['free']),
-                    'locked': float(asset['locked']),
-                }
-                for asset in data['balances']
-                if float(asset['free']) > 0 or float(asset['locked']) > 0
-            }
-
-            return balances
+            return parse_balances(response.json())
         except Exception as e:
             return {'error': str(e)}
 
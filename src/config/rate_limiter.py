@@ -0,0 +1,215 @@
+"""
+取引所APIのレート制限管理
+トークンバケット方式で、スレッド間（およびイベントループ内）で共有するリクエストウェイト上限を守る
+"""
+
+import threading
+import time
+from typing import Dict
+
+
+# 取引所ごとのウェイト上限
+#   capacity: バケット容量（= 期間あたりの上限ウェイト）
+#   period: 補充期間（秒）
+#   safety: 実際に使う割合（他のスクリプトやサーバー側の誤差ぶんの余裕）
+EXCHANGE_LIMITS = {
+    # Binance Spot: REQUEST_WEIGHT 6000 / 1分（IPごと）
+    'binance': {'capacity': 6000, 'period': 60.0, 'safety': 0.8},
+    # MEXC Spot v3: 500 / 10秒（IPごと）
+    'mexc': {'capacity': 500, 'period': 10.0, 'safety': 0.8},
+}
+
+# エンドポイントごとの固定ウェイト（未登録は1）
+ENDPOINT_WEIGHTS = {
+    'binance': {
+        '/api/v3/ping': 1,
+        '/api/v3/time': 1,
+        '/api/v3/ticker/price': 2,       # symbol指定なし: 4
+        '/api/v3/ticker/24hr': 2,        # symbol指定なし: 80
+        '/api/v3/exchangeInfo': 20,
+        '/api/v3/account': 20,
+        '/api/v3/order': 1,
+    },
+    'mexc': {
+        '/api/v3/ticker/price': 1,
+        '/api/v3/ticker/24hr': 1,        # symbol指定なし: 40
+        '/api/v3/klines': 1,
+        '/api/v3/exchangeInfo': 10,
+        '/api/v3/account': 10,
+        '/api/v3/order': 1,
+    },
+}
+
+# symbol指定なし（全銘柄）のときのウェイト
+ALL_SYMBOLS_WEIGHTS = {
+    'binance': {
+        '/api/v3/ticker/price': 4,
+        '/api/v3/ticker/24hr': 80,
+    },
+    'mexc': {
+        '/api/v3/ticker/24hr': 40,
+    },
+}
+
+
+def binance_klines_weight(limit: int) -> int:
+    """Binance klines のウェイト（limitにより変動）"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def request_weight(exchange: str, path: str, params: Dict = None) -> int:
+    """
+    リクエスト1回あたりのウェイトを計算
+
+    Args:
+        exchange: 'binance' または 'mexc'
+        path: エンドポイントのパス（例: /api/v3/klines）
+        params: クエリパラメータ
+
+    Returns:
+        ウェイト
+    """
+    exchange = exchange.lower()
+    params = params or {}
+
+    if exchange == 'binance' and path == '/api/v3/klines':
+        return binance_klines_weight(int(params.get('limit', 500)))
+
+    if 'symbol' not in params and path in ALL_SYMBOLS_WEIGHTS.get(exchange, {}):
+        return ALL_SYMBOLS_WEIGHTS[exchange][path]
+
+    return ENDPOINT_WEIGHTS.get(exchange, {}).get(path, 1)
+
+
+class TokenBucketRateLimiter:
+    """
+    トークンバケット方式のレートリミッター（スレッドセーフ）
+
+    - capacity ぶんのトークンが period 秒かけて一定速度で補充される
+    - acquire(weight) はトークンが足りるまで待ってから消費する
+    - サーバーから返ってきた使用済みウェイト（X-MBX-USED-WEIGHT-1M 等）で補正できる
+    """
+
+    def __init__(self, capacity: float, period: float, safety: float = 1.0):
+        """
+        Args:
+            capacity: 期間あたりの上限ウェイト
+            period: 補充期間（秒）
+            safety: 上限のうち実際に使う割合（0〜1）
+        """
+        self.capacity = capacity * safety
+        self.period = period
+        self.refill_rate = self.capacity / period
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 統計
+        self.total_weight = 0
+        self.total_wait = 0.0
+
+    @classmethod
+    def for_exchange(cls, exchange: str) -> 'TokenBucketRateLimiter':
+        """取引所のプリセットから作成"""
+        limits = EXCHANGE_LIMITS[exchange.lower()]
+        return cls(limits['capacity'], limits['period'], limits['safety'])
+
+    def _refill(self):
+        """経過時間ぶんのトークンを補充（ロック取得済みで呼ぶ）"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def _try_acquire(self, weight: float) -> float:
+        """
+        トークンを消費できれば消費して0を、足りなければ必要な待機秒数を返す
+        """
+        # 容量より大きいウェイトは永遠に待つことになるので容量で打ち切る
+        weight = min(weight, self.capacity)
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= weight:
+                self._tokens -= weight
+                self.total_weight += weight
+                return 0.0
+            wait = (weight - self._tokens) / self.refill_rate
+            self.total_wait += wait
+            return wait
+
+    def acquire(self, weight: float = 1):
+        """
+        ウェイトぶんのトークンを消費（足りなければ待機）
+
+        Args:
+            weight: リクエストのウェイト
+        """
+        # ロックの外で待つ（他スレッドの補正・取得を妨げない）
+        while True:
+            wait = self._try_acquire(weight)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: float = 1):
+        """
+        acquire の非同期版（イベントループを止めずに待機）
+
+        Args:
+            weight: リクエストのウェイト
+        """
+        # 同期版だけを使うCLIの起動を軽くするため、asyncio はここで読み込む
+        import asyncio
+
+        while True:
+            wait = self._try_acquire(weight)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def sync_used_weight(self, used_weight: float, capacity: float = None):
+        """
+        サーバー側の使用済みウェイトでバケットを補正
+
+        Args:
+            used_weight: サーバーが報告した現在の使用済みウェイト
+            capacity: サーバー側の上限（省略時はプリセットの上限から逆算）
+        """
+        if capacity is None:
+            capacity = self.capacity
+        remaining = capacity - used_weight
+
+        with self._lock:
+            self._refill()
+            # サーバーの方が厳しいときだけ合わせる
+            if remaining < self._tokens:
+                self._tokens = max(remaining, 0.0)
+
+    def penalize(self, seconds: float):
+        """
+        429（レート超過）を受けたとき、指定秒数は新規リクエストを止める
+
+        Args:
+            seconds: Retry-After 等で指定された待機秒数
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = -seconds * self.refill_rate
+
+    def get_stats(self) -> Dict:
+        """統計を取得"""
+        with self._lock:
+            self._refill()
+            return {
+                'tokens': self._tokens,
+                'capacity': self.capacity,
+                'total_weight': self.total_weight,
+                'total_wait_sec': self.total_wait,
+            }
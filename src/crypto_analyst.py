@@ -7,21 +7,26 @@
 import sys
 import os
 import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+if (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.config.exchange_api import MEXCAPI
-from src.data.advanced_database import AdvancedDatabase
-from src.data.timeseries_storage import TimeSeriesStorage
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
+import time
 
 
 class CryptoAnalyst:
     """仮想通貨分析アシスタント"""
 
     def __init__(self):
+        # requests / pandas を含む重い依存は、--help などで起動時間を払わないよう使う時に読み込む
+        from src.config.exchange_api import MEXCAPI
+        from src.data.advanced_database import AdvancedDatabase
+        from src.data.timeseries_storage import TimeSeriesStorage
+
         self.api = MEXCAPI()
         self.db = AdvancedDatabase()
         self.storage = TimeSeriesStorage()
@@ -30,107 +35,170 @@ class CryptoAnalyst:
         self.news_dir = Path('data/news')
         self.news_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _timed(func, *args):
+        """
+        関数を実行して (結果, 例外, 経過ミリ秒) を返す
+
+        並列実行したステージの失敗をメインスレッド側で扱うため、例外は投げずに返す
+        """
+        start = time.perf_counter()
+        try:
+            result, error = func(*args), None
+        except Exception as e:
+            result, error = None, e
+        return result, error, (time.perf_counter() - start) * 1000
+
+    def _fetch_market_data(self, symbol: str) -> dict:
+        """
+        24時間統計から市場データを作成
+
+        24h統計の lastPrice を現在価格として使う（価格APIを別に呼ばない）
+        """
+        stats = self.api.get_24h_stats(f"{symbol}USDT")
+
+        return {
+            'current': stats['price'],
+            'change_24h': stats.get('price_change_percent', 0),
+            'high_24h': stats.get('high', 0),
+            'low_24h': stats.get('low', 0),
+            'volume': stats.get('volume', 0),
+            'quote_volume': stats.get('quote_volume', 0),
+        }
+
+    def _fetch_chart_data(self, symbol: str) -> list:
+        """日足30本を取得してParquetに保存"""
+        klines = self.api.get_klines(f"{symbol}USDT", interval='1d', limit=30)
+
+        # Parquetに自動保存（SQLiteは使わないのでワーカースレッドで実行してよい）
+        if klines:
+            self.storage.save_price_data(symbol, '1d', klines)
+
+        return klines
+
+    def _load_score(self, symbol: str):
+        """最新の影響力スコアを取得"""
+        cursor = self.db.conn.cursor()
+        cursor.execute('''
+            SELECT
+                relevance_score,
+                importance_score,
+                impact_score,
+                time_decay_factor,
+                final_score,
+                news_count,
+                scoring_date
+            FROM scoring_history
+            WHERE symbol = ?
+            ORDER BY scoring_date DESC
+            LIMIT 1
+        ''', (symbol,))
+
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        return {
+            'relevance': row[0],
+            'importance': row[1],
+            'impact': row[2],
+            'time_decay': row[3],
+            'final': row[4],
+            'news_count': row[5],
+            'date': row[6],
+        }
+
     def get_full_context(self, symbol: str):
         """
         銘柄の全コンテキストを取得
 
         価格、ニュース、スコアなど分析に必要な全情報を一括取得
+
+        取引所APIへの問い合わせ（市場データ・チャート）はワーカースレッドで並列に実行し、
+        その間にメインスレッドでSQLite（ニュース・スコア）を読む。
+        SQLite接続はスレッド間で共有できないため、DB処理はメインスレッドに限定している。
+        各ステージの所要時間は context['timings']（ミリ秒）に入る。
         """
         print("="*80)
         print(f"📊 {symbol} - 分析コンテキスト取得中...")
         print("="*80)
         print()
 
+        total_start = time.perf_counter()
+
         context = {
             'symbol': symbol,
             'timestamp': datetime.now().isoformat(),
         }
+        timings = {}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # ネットワーク待ちのステージを先に投げておく
+            market_future = executor.submit(self._timed, self._fetch_market_data, symbol)
+            chart_future = executor.submit(self._timed, self._fetch_chart_data, symbol)
+
+            # 2. 最近のニュース（メインスレッド）
+            news_list, news_error, timings['news'] = self._timed(
+                self.db.get_recent_news, symbol, 10, 30)
+
+            # 3. 影響力スコア（メインスレッド）
+            score, score_error, timings['score'] = self._timed(self._load_score, symbol)
+
+            market, market_error, timings['market'] = market_future.result()
+            klines, chart_error, timings['chart'] = chart_future.result()
 
         # 1. 現在の市場データ
         print("💰 [1/4] 市場データ取得中...")
-        try:
-            price = self.api.get_price(f"{symbol}USDT")
-            stats = self.api.get_24h_stats(f"{symbol}USDT")
-
-            context['price'] = {
-                'current': price,
-                'change_24h': stats.get('price_change_percent', 0),
-                'high_24h': stats.get('high', 0),
-                'low_24h': stats.get('low', 0),
-                'volume': stats.get('volume', 0),
-                'quote_volume': stats.get('quote_volume', 0),
-            }
-            print(f"   ✓ 現在価格: ${price:,.2f}")
-            print(f"   ✓ 24h変動: {stats.get('price_change_percent', 0):+.2f}%")
-        except Exception as e:
-            print(f"   ✗ 価格データ取得失敗: {e}")
+        if market_error is None:
+            context['price'] = market
+            print(f"   ✓ 現在価格: ${market['current']:,.2f}")
+            print(f"   ✓ 24h変動: {market['change_24h']:+.2f}%")
+        else:
+            print(f"   ✗ 価格データ取得失敗: {market_error}")
             context['price'] = None
 
         # 2. 最近のニュース
         print("\n📰 [2/4] ニュース取得中...")
-        news_list = self.db.get_recent_news(symbol, limit=10, days=30)
+        if news_error is not None:
+            raise news_error
         context['news'] = [dict(n) for n in news_list]
         print(f"   ✓ 取得件数: {len(news_list)}件")
 
         # ニュース原文をMarkdownで保存
         if news_list:
             print(f"   💾 ニュースをMarkdownで保存中...")
-            for news in news_list:
-                self.save_news_to_markdown(symbol, dict(news))
+            for news in context['news']:
+                self.save_news_to_markdown(symbol, news)
             print(f"   ✓ 保存完了")
 
         # 3. 影響力スコア
         print("\n📈 [3/4] スコアリング情報取得中...")
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            SELECT
-                relevance_score,
-                importance_score,
-                impact_score,
-                time_decay_factor,
-                final_score,
-                news_count,
-                scoring_date
-            FROM scoring_history
-            WHERE symbol = ?
-            ORDER BY scoring_date DESC
-            LIMIT 1
-        ''', (symbol,))
-
-        row = cursor.fetchone()
-        if row:
-            context['score'] = {
-                'relevance': row[0],
-                'importance': row[1],
-                'impact': row[2],
-                'time_decay': row[3],
-                'final': row[4],
-                'news_count': row[5],
-                'date': row[6],
-            }
-            print(f"   ✓ 最終スコア: {row[4]:.3f}")
+        if score_error is not None:
+            raise score_error
+        context['score'] = score
+        if score:
+            print(f"   ✓ 最終スコア: {score['final']:.3f}")
         else:
-            context['score'] = None
             print(f"   ✗ スコアデータなし")
 
         # 4. 価格履歴（チャート用）
         print("\n📉 [4/4] チャートデータ取得中...")
-        try:
-            klines = self.api.get_klines(f"{symbol}USDT", interval='1d', limit=30)
+        if chart_error is None:
             context['chart'] = klines
             print(f"   ✓ 取得期間: 30日分")
-
-            # Parquetに自動保存
-            if klines:
-                print(f"   💾 Parquetに保存中...")
-                self.storage.save_price_data(symbol, '1d', klines)
-        except Exception as e:
-            print(f"   ✗ チャートデータ取得失敗: {e}")
+        else:
+            print(f"   ✗ チャートデータ取得失敗: {chart_error}")
             context['chart'] = []
 
+        timings['total'] = (time.perf_counter() - total_start) * 1000
+        context['timings'] = timings
+
         print()
         print("="*80)
         print("✅ コンテキスト取得完了")
+        print(f"   所要時間: {timings['total']:.0f}ms "
+              f"(市場 {timings['market']:.0f}ms / ニュース {timings['news']:.0f}ms / "
+              f"スコア {timings['score']:.0f}ms / チャート {timings['chart']:.0f}ms)")
         print("="*80)
 
         return context
@@ -6,21 +6,291 @@
 
 import sqlite3
 import json
+import re
+import zlib
+import unicodedata
+from functools import lru_cache
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import os
 
 
+# PRAGMA journal_mode / synchronous に指定できる値
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# 全文検索の列の重み（bm25: タイトル / 本文 / キーワード）
+NEWS_FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+# 埋め込みの次元数（特徴ハッシングのバケット数）
+NEWS_EMBEDDING_DIM = 256
+
+# 埋め込み検索で新しさを混ぜる割合と半減期（日）
+NEWS_RECENCY_WEIGHT = 0.3
+NEWS_RECENCY_HALF_LIFE = 7.0
+
+# 日本語（ひらがな・カタカナ・漢字）の連続部分と、それ以外の英数字の単語
+_CJK_CHARS = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uff66-\uff9f'
+_TOKEN_PATTERN = re.compile(f'[{_CJK_CHARS}]+|[^\\W_{_CJK_CHARS}]+')
+_CJK_PATTERN = re.compile(f'[{_CJK_CHARS}]')
+
+
+def fts_tokens(text: str) -> List[str]:
+    """
+    全文検索用に分かち書き
+
+    FTS5 の unicode61 トークナイザーは日本語の連続部分を1語として扱うので、
+    日本語は2文字ずつずらしたバイグラムに分ける（英数字は単語のまま、小文字化）
+
+    例: 'ビットコインETF承認' → ['ビッ', 'ット', 'トコ', 'コイ', 'イン', 'etf', '承認']
+    """
+    tokens = []
+
+    for word in _TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        if _CJK_PATTERN.match(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+
+    return tokens
+
+
+def fts_query(terms: List[str]) -> str:
+    """
+    検索語のリストを FTS5 の MATCH 式に変換（いずれかを含む = OR、bm25で順位付け）
+
+    日本語の語はバイグラムのフレーズ検索（連続して出現する場合だけ一致）、
+    1文字の日本語は前方一致で検索する
+    """
+    clauses = []
+
+    for term in terms:
+        tokens = fts_tokens(term)
+        if not tokens:
+            continue
+
+        if len(tokens) == 1 and len(tokens[0]) == 1 and _CJK_PATTERN.match(tokens[0]):
+            clauses.append(f'"{tokens[0]}"*')
+        else:
+            clauses.append('"' + ' '.join(tokens) + '"')
+
+    return ' OR '.join(clauses)
+
+
+@lru_cache(maxsize=65536)
+def _token_bucket(token: str) -> Tuple[int, int]:
+    """語のハッシュ値と符号。プロセスをまたいで同じ値になるよう crc32 を使う"""
+    h = zlib.crc32(token.encode('utf-8'))
+    return h, 1 if h & 0x80000000 else -1
+
+
+class HashingEmbedder:
+    """
+    特徴ハッシングによるニュースの埋め込み（CPUのみ、学習・外部モデル不要）
+
+    fts_tokens の語（日本語はバイグラム）を符号付きハッシュで dim 次元に集約し、
+    1 + log(tf) で重み付けしてL2正規化する（内積 = コサイン類似度）
+
+    同じ name / dim / embed(texts) を持つオブジェクトなら、ローカルの文埋め込みモデルなどに
+    差し替えられる（AdvancedDatabase(embedder=...)）。name が変わると埋め込みは作り直される
+    """
+
+    def __init__(self, dim: int = NEWS_EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f'hashing-v1-{dim}'
+
+    def embed(self, texts: List[str]):
+        """
+        Args:
+            texts: テキストのリスト
+
+        Returns:
+            (len(texts), dim) の float32 行列（語がないテキストはゼロベクトル）
+        """
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for i, text in enumerate(texts):
+            counts = {}
+            for token in fts_tokens(text):
+                counts[token] = counts.get(token, 0) + 1
+
+            for token, tf in counts.items():
+                h, sign = _token_bucket(token)
+                vectors[i, h % self.dim] += sign * (1.0 + np.log(tf))
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def news_embedding_text(title: str, content: str, keywords) -> str:
+    """埋め込みに使うテキスト（タイトルとキーワードは2回含めて本文より重くする）"""
+    if isinstance(keywords, str):
+        try:
+            keywords = json.loads(keywords)
+        except ValueError:
+            keywords = [keywords]
+
+    keywords = ' '.join(str(k) for k in keywords or [])
+    return '\n'.join([title or '', title or '', keywords, keywords, content or ''])
+
+
+class NewsVectorIndex:
+    """
+    ニュース埋め込みの総当たり検索インデックス
+
+    news_embeddings の float32 ブロブをメモリ上の行列にまとめ、内積で上位k件を求める
+    （256次元 × 10万件で約100MB、1クエリ数ミリ秒）。refresh() は前回以降に追加された行だけを読む
+    """
+
+    def __init__(self, dim: int):
+        import numpy as np
+
+        self.dim = dim
+        self.news_ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.symbols = np.empty(0, dtype=object)
+        self.published = np.empty(0, dtype=np.float64)   # 公開日時（ユリウス日）
+        self.positions = {}                                # news_id → 行番号
+        self.last_rowid = 0
+
+    def __len__(self) -> int:
+        return len(self.news_ids)
+
+    def refresh(self, conn: sqlite3.Connection, model: str):
+        """前回以降に追加・更新された埋め込みを取り込む"""
+        import numpy as np
+
+        rows = conn.execute('''
+            SELECT e.id, e.news_id, e.embedding_vector, n.symbol, julianday(n.published_date)
+            FROM news_embeddings e
+            JOIN news n ON n.id = e.news_id
+            WHERE e.model = ? AND e.id > ?
+            ORDER BY e.id
+        ''', (model, self.last_rowid)).fetchall()
+
+        if not rows:
+            return
+
+        self.last_rowid = rows[-1][0]
+
+        new_ids, new_vectors, new_symbols, new_published = [], [], [], []
+        for _, news_id, blob, symbol, published in rows:
+            vector = np.frombuffer(blob, dtype=np.float32)
+            published = published if published is not None else np.nan
+
+            position = self.positions.get(news_id)
+            if position is not None:
+                # 埋め込み直された行は上書き
+                self.matrix[position] = vector
+                self.symbols[position] = symbol
+                self.published[position] = published
+                continue
+
+            self.positions[news_id] = len(self.news_ids) + len(new_ids)
+            new_ids.append(news_id)
+            new_vectors.append(vector)
+            new_symbols.append(symbol)
+            new_published.append(published)
+
+        if new_ids:
+            self.news_ids = np.concatenate([self.news_ids, np.array(new_ids, dtype=np.int64)])
+            self.matrix = np.vstack([self.matrix, np.stack(new_vectors)])
+            self.symbols = np.concatenate([self.symbols, np.array(new_symbols, dtype=object)])
+            self.published = np.concatenate([self.published, np.array(new_published, dtype=np.float64)])
+
+    def vector(self, news_id: int):
+        """登録済みニュースの埋め込み（なければNone）"""
+        position = self.positions.get(news_id)
+        return None if position is None else self.matrix[position]
+
+    def search(self, query, limit: int = 10, symbol: str = None, now: float = None,
+               days_back: float = None, recency_weight: float = 0.0,
+               half_life: float = NEWS_RECENCY_HALF_LIFE, exclude_id: int = None) -> List[Tuple[int, float, float]]:
+        """
+        コサイン類似度（+ 新しさ）で上位k件を検索
+
+        score = similarity × (1 - recency_weight + recency_weight × 0.5 ** (days_old / half_life))
+
+        Args:
+            query: 正規化済みのクエリベクトル
+            symbol: 銘柄で絞り込み
+            now: 現在時刻（ユリウス日、days_back / recency_weight を使う場合は必須）
+            days_back: この日数以内に公開されたものだけ
+            recency_weight: 新しさを混ぜる割合（0 = 類似度のみ）
+            half_life: 新しさの半減期（日）
+            exclude_id: 除外するニュースID（類似記事検索で自分自身を除く）
+
+        Returns:
+            [(news_id, score, similarity), ...]（score の降順、類似度が正のものだけ）
+        """
+        import numpy as np
+
+        if not len(self.news_ids):
+            return []
+
+        mask = np.ones(len(self.news_ids), dtype=bool)
+        if symbol:
+            mask &= self.symbols == symbol
+        if days_back is not None:
+            mask &= (now - self.published) <= days_back
+        if exclude_id is not None and exclude_id in self.positions:
+            mask[self.positions[exclude_id]] = False
+
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        similarity = self.matrix[candidates] @ np.asarray(query, dtype=np.float32)
+        score = similarity.astype(np.float64)
+
+        if recency_weight:
+            decay = np.nan_to_num(0.5 ** (np.maximum(now - self.published[candidates], 0) / half_life))
+            score = score * (1.0 - recency_weight + recency_weight * decay)
+
+        k = min(limit, len(candidates))
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind='stable')]
+
+        return [(int(self.news_ids[candidates[i]]), float(score[i]), float(similarity[i]))
+                for i in top if similarity[i] > 0]
+
+
 class AdvancedDatabase:
     """高度な分析用データベース"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, journal_mode: str = 'WAL', synchronous: str = 'NORMAL',
+                 embedder=None, snapshot_dir: str = None):
+        """
+        Args:
+            db_path: DBファイルのパス
+            journal_mode: ジャーナルモード（WAL: 書き込み中も読み込みをブロックしない）
+            synchronous: fsyncの頻度（OFF / NORMAL / FULL / EXTRA）
+                         WALではNORMALでも破損はせず、電源断時に直近のコミットが失われうるだけ
+            embedder: ニュースの埋め込み（デフォルト: HashingEmbedder）
+            snapshot_dir: 市場スナップショットの保存先（デフォルト: src/data/timeseries）
+        """
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), 'advanced_trading.db')
 
+        journal_mode = journal_mode.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"journal_mode は {', '.join(JOURNAL_MODES)} のいずれかを指定してください: {journal_mode}")
+
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous は {', '.join(SYNCHRONOUS_MODES)} のいずれかを指定してください: {synchronous}")
+
         self.db_path = db_path
+        self.embedder = embedder or HashingEmbedder()
+        self.snapshot_dir = snapshot_dir
+        self._vector_index = None
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f'PRAGMA journal_mode={journal_mode}')
+        self.conn.execute(f'PRAGMA synchronous={synchronous}')
         self._create_tables()
 
     def _create_tables(self):
@@ -67,6 +337,20 @@ class AdvancedDatabase:
             )
         ''')
 
+        # ニュースの全文検索インデックス（rowid = news.id、分かち書き済みのテキストを保存）
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                title, content, keywords,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+
+        # 銘柄・日付での絞り込み用
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_news_symbol_published
+            ON news(symbol, published_date DESC)
+        ''')
+
         # 3. ニュース埋め込みテーブル（RAG用）
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS news_embeddings (
@@ -79,6 +363,16 @@ class AdvancedDatabase:
             )
         ''')
 
+        # embedding_vector は float32 のブロブ、model は埋め込みの種類（既存DBには列を追加）
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(news_embeddings)')]
+        if 'model' not in columns:
+            cursor.execute('ALTER TABLE news_embeddings ADD COLUMN model TEXT')
+
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_news_embeddings_news_model
+            ON news_embeddings(news_id, model)
+        ''')
+
         # 4. 分析履歴テーブル
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS analysis_history (
@@ -172,6 +466,9 @@ class AdvancedDatabase:
 
         self.conn.commit()
 
+        self._sync_news_fts()
+        self._sync_news_embeddings()
+
     # ========================================
     # 銘柄情報の操作
     # ========================================
@@ -237,9 +534,146 @@ class AdvancedDatabase:
             news_data.get('impact_score', 0.5),
             json.dumps(news_data.get('keywords', [])),
         ))
+        news_id = cursor.lastrowid
+
+        # 全文検索インデックス・埋め込みも同じトランザクションで更新
+        row = (news_id, news_data.get('title'), news_data.get('content'), news_data.get('keywords', []))
+        self._index_news(cursor, [row])
+        self._embed_news(cursor, [row])
 
         self.conn.commit()
-        return cursor.lastrowid
+        return news_id
+
+    def _index_news(self, cursor, rows: List[Tuple]):
+        """
+        ニュースを全文検索インデックスに追加
+
+        Args:
+            rows: [(news_id, title, content, keywords), ...]（keywords はリストまたはJSON文字列）
+        """
+        entries = []
+        for news_id, title, content, keywords in rows:
+            if isinstance(keywords, str):
+                try:
+                    keywords = json.loads(keywords)
+                except ValueError:
+                    keywords = [keywords]
+
+            entries.append((
+                news_id,
+                ' '.join(fts_tokens(title)),
+                ' '.join(fts_tokens(content)),
+                ' '.join(fts_tokens(' '.join(str(k) for k in keywords or []))),
+            ))
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO news_fts (rowid, title, content, keywords)
+            VALUES (?, ?, ?, ?)
+        ''', entries)
+
+    def _sync_news_fts(self):
+        """
+        インデックスされていないニュースを全文検索インデックスに追加
+
+        add_news 以外の経路で追加された行（インデックス導入前に作ったDBなど）を起動時に取り込む
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute('SELECT COALESCE(MAX(rowid), 0) FROM news_fts')
+        indexed_id = cursor.fetchone()[0]
+
+        cursor.execute('SELECT id, title, content, keywords FROM news WHERE id > ? ORDER BY id', (indexed_id,))
+        rows = [tuple(row) for row in cursor.fetchall()]
+
+        if rows:
+            self._index_news(cursor, rows)
+            self.conn.commit()
+
+    def _embed_news(self, cursor, rows: List[Tuple]):
+        """
+        ニュースの埋め込みを float32 のブロブで保存（同じ news_id・モデルの行は置き換え）
+
+        Args:
+            rows: [(news_id, title, content, keywords), ...]（keywords はリストまたはJSON文字列）
+        """
+        vectors = self.embedder.embed([news_embedding_text(title, content, keywords)
+                                       for _, title, content, keywords in rows])
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO news_embeddings (news_id, embedding_vector, keywords, model)
+            VALUES (?, ?, ?, ?)
+        ''', [
+            (news_id, vector.tobytes(), keywords if isinstance(keywords, str) else json.dumps(keywords or []),
+             self.embedder.name)
+            for (news_id, _, _, keywords), vector in zip(rows, vectors)
+        ])
+
+    def _sync_news_embeddings(self, batch_size: int = 1000):
+        """
+        埋め込みのないニュースを埋め込む
+
+        埋め込み導入前に作ったDBや、埋め込みのモデル（embedder.name）を変えた場合に起動時に取り込む
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute('SELECT COALESCE(MAX(news_id), 0) FROM news_embeddings WHERE model = ?',
+                       (self.embedder.name,))
+        embedded_id = cursor.fetchone()[0]
+
+        cursor.execute('SELECT id, title, content, keywords FROM news WHERE id > ? ORDER BY id', (embedded_id,))
+        while True:
+            rows = [tuple(row) for row in cursor.fetchmany(batch_size)]
+            if not rows:
+                break
+            self._embed_news(self.conn.cursor(), rows)
+
+        self.conn.commit()
+
+    def search_news(self, query, symbol: str = None, start_date: str = None,
+                    end_date: str = None, limit: int = 20) -> List[Dict]:
+        """
+        ニュースを全文検索（bm25で順位付け）
+
+        Args:
+            query: 検索語（文字列、または検索語のリスト = いずれかを含む）
+            symbol: 銘柄で絞り込み
+            start_date: この日時以降に公開（ISO形式）
+            end_date: この日時以前に公開（ISO形式）
+            limit: 取得件数
+
+        Returns:
+            ニュースのリスト（関連度順、'relevance' = bm25スコアの符号反転、大きいほど関連）
+        """
+        match = fts_query([query] if isinstance(query, str) else list(query))
+        if not match:
+            return []
+
+        conditions = ['news_fts MATCH ?']
+        params = [match]
+
+        if symbol:
+            conditions.append('n.symbol = ?')
+            params.append(symbol)
+        if start_date:
+            conditions.append('n.published_date >= ?')
+            params.append(start_date)
+        if end_date:
+            # 日付だけの指定ならその日の終わりまで含める
+            conditions.append("n.published_date < date(?, '+1 day')" if len(end_date) == 10
+                              else 'n.published_date <= ?')
+            params.append(end_date)
+
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT n.*, -bm25(news_fts, ?, ?, ?) AS relevance
+            FROM news_fts
+            JOIN news n ON n.id = news_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY bm25(news_fts, ?, ?, ?)
+            LIMIT ?
+        ''', (*NEWS_FTS_WEIGHTS, *params, *NEWS_FTS_WEIGHTS, limit))
+
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_recent_news(self, symbol: str = None, limit: int = 10, days: int = 30) -> List[Dict]:
         """最近のニュースを取得"""
@@ -268,37 +702,142 @@ class AdvancedDatabase:
     # ========================================
 
     def add_news_embedding(self, news_id: int, keywords: List[str]) -> int:
-        """ニュースの埋め込み（キーワードベース）を追加"""
+        """
+        ニュースの埋め込みを別のキーワードで作り直して保存
+
+        add_news が保存時に news.keywords で埋め込むので、通常は呼ぶ必要はない。
+        保存後にキーワードを差し替えて埋め込み直したいときに使う。
+
+        Args:
+            news_id: ニュースID
+            keywords: キーワード（タイトル・本文と一緒に埋め込む）
+
+        Returns:
+            書き込んだ埋め込みの行ID
+        """
         cursor = self.conn.cursor()
 
-        cursor.execute('''
-            INSERT INTO news_embeddings (news_id, keywords)
-            VALUES (?, ?)
-        ''', (news_id, json.dumps(keywords)))
+        cursor.execute('SELECT title, content FROM news WHERE id = ?', (news_id,))
+        row = cursor.fetchone()
+        title, content = (row['title'], row['content']) if row else (None, None)
 
+        self._embed_news(cursor, [(news_id, title, content, keywords)])
         self.conn.commit()
-        return cursor.lastrowid
 
-    def search_relevant_news(self, symbol: str, keywords: List[str],
-                            days_back: int = 30, limit: int = 10) -> List[Dict]:
-        """関連ニュースを検索（キーワードベース + 時間重み付け）"""
-        cursor = self.conn.cursor()
+        # executemany の後の lastrowid は当てにならないので引き直す
+        cursor.execute('SELECT rowid FROM news_embeddings WHERE news_id = ? AND model = ?',
+                       (news_id, self.embedder.name))
+        return cursor.fetchone()[0]
 
-        # キーワードマッチングでスコアリング
-        keyword_pattern = '%' + '%'.join(keywords) + '%'
+    def _vector_search(self, query, symbol: str = None, days_back: float = None, limit: int = 10,
+                       recency_weight: float = 0.0, half_life: float = NEWS_RECENCY_HALF_LIFE,
+                       exclude_id: int = None) -> List[Dict]:
+        """
+        埋め込みの類似度で検索してニュースの行を返す
 
-        cursor.execute('''
+        Args:
+            query: 検索語（文字列・リスト）またはニュースID（その記事に似た記事）
+
+        Returns:
+            ニュースのリスト（'similarity' = コサイン類似度、'relevance' = 新しさを混ぜたスコア、'days_old'）
+        """
+        if self._vector_index is None:
+            self._vector_index = NewsVectorIndex(self.embedder.dim)
+        index = self._vector_index
+        index.refresh(self.conn, self.embedder.name)
+
+        if isinstance(query, int):
+            vector = index.vector(query)
+            if vector is None:
+                return []
+            exclude_id = query
+        else:
+            text = query if isinstance(query, str) else ' '.join(query)
+            vector = self.embedder.embed([text])[0]
+            if not vector.any():
+                return []
+
+        now = self.conn.execute("SELECT julianday('now')").fetchone()[0]
+        hits = index.search(vector, limit=limit, symbol=symbol, now=now, days_back=days_back,
+                            recency_weight=recency_weight, half_life=half_life, exclude_id=exclude_id)
+        if not hits:
+            return []
+
+        ids = [news_id for news_id, _, _ in hits]
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
             SELECT
                 n.*,
                 (julianday('now') - julianday(n.published_date)) as days_old,
                 n.importance_score * n.impact_score as base_score
             FROM news n
-            WHERE n.symbol = ?
-            AND (n.title LIKE ? OR n.content LIKE ? OR n.keywords LIKE ?)
+            WHERE n.id IN ({','.join('?' * len(ids))})
+        ''', ids)
+        rows = {row['id']: dict(row) for row in cursor.fetchall()}
+
+        results = []
+        for news_id, score, similarity in hits:
+            if news_id in rows:
+                results.append(dict(rows[news_id], similarity=similarity, relevance=score))
+
+        return results
+
+    def search_similar_news(self, query, symbol: str = None, days_back: float = None,
+                            limit: int = 10) -> List[Dict]:
+        """
+        埋め込みのコサイン類似度で似たニュースを検索
+
+        Args:
+            query: 検索テキスト（文字列・リスト）またはニュースID（その記事に似た記事、自分自身は除く）
+            symbol: 銘柄で絞り込み
+            days_back: この日数以内に公開されたものだけ
+            limit: 取得件数
+
+        Returns:
+            ニュースのリスト（類似度順、'similarity' = コサイン類似度）
+        """
+        return self._vector_search(query, symbol=symbol, days_back=days_back, limit=limit)
+
+    def search_relevant_news(self, symbol: str, keywords: List[str],
+                            days_back: int = 30, limit: int = 10, method: str = 'fts',
+                            recency_weight: float = NEWS_RECENCY_WEIGHT,
+                            half_life: float = NEWS_RECENCY_HALF_LIFE) -> List[Dict]:
+        """
+        関連ニュースを検索
+
+        Args:
+            method: 'fts' = 全文検索インデックス（bm25で順位付け + 重要度・新しさ）
+                    'vector' = 埋め込みのコサイン類似度 × 新しさ（キーワードを含まない記事も拾う）
+            recency_weight: method='vector' で新しさを混ぜる割合（0 = 類似度のみ）
+            half_life: method='vector' での新しさの半減期（日）
+        """
+        if method == 'vector':
+            return self._vector_search(keywords, symbol=symbol, days_back=days_back, limit=limit,
+                                       recency_weight=recency_weight, half_life=half_life)
+        if method != 'fts':
+            raise ValueError(f"method は 'fts' か 'vector' を指定してください: {method}")
+
+        match = fts_query(keywords)
+        if not match:
+            return []
+
+        cursor = self.conn.cursor()
+
+        # いずれかのキーワードを含むニュースを関連度順に
+        cursor.execute('''
+            SELECT
+                n.*,
+                (julianday('now') - julianday(n.published_date)) as days_old,
+                n.importance_score * n.impact_score as base_score,
+                -bm25(news_fts, ?, ?, ?) as relevance
+            FROM news_fts
+            JOIN news n ON n.id = news_fts.rowid
+            WHERE news_fts MATCH ?
+            AND n.symbol = ?
             AND n.published_date >= datetime('now', '-' || ? || ' days')
-            ORDER BY base_score DESC, days_old ASC
+            ORDER BY relevance DESC, base_score DESC, days_old ASC
             LIMIT ?
-        ''', (symbol, keyword_pattern, keyword_pattern, keyword_pattern, days_back, limit))
+        ''', (*NEWS_FTS_WEIGHTS, match, symbol, days_back, limit))
 
         return [dict(row) for row in cursor.fetchall()]
 
@@ -385,6 +924,35 @@ class AdvancedDatabase:
         self.conn.commit()
         return cursor.lastrowid
 
+    def add_scoring_results(self, rows: List[Dict]) -> int:
+        """
+        スコアリング結果を一括保存（1トランザクション）
+
+        Args:
+            rows: add_scoring_result と同じ形式の辞書のリスト
+
+        Returns:
+            保存件数
+        """
+        params = [
+            (row.get('symbol'), row.get('relevance_score'), row.get('importance_score'),
+             row.get('impact_score'), row.get('time_decay_factor'), row.get('final_score'),
+             row.get('news_count'))
+            for row in rows
+        ]
+        if not params:
+            return 0
+
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO scoring_history
+                (symbol, relevance_score, importance_score, impact_score,
+                 time_decay_factor, final_score, news_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', params)
+
+        return len(params)
+
     # ========================================
     # 価格スナップショット
     # ========================================
@@ -402,33 +970,70 @@ class AdvancedDatabase:
         self.conn.commit()
         return cursor.lastrowid
 
+    def save_price_snapshots(self, rows: List[Dict]) -> int:
+        """
+        価格スナップショットを一括保存（1トランザクション）
+
+        Args:
+            rows: [{'symbol', 'price', 'change_24h', 'volume', 'quote_volume', 'high_24h', 'low_24h'}, ...]
+                  symbol と price 以外は省略可
+
+        Returns:
+            保存件数
+        """
+        params = [
+            (row['symbol'], row['price'], row.get('change_24h'), row.get('volume'),
+             row.get('quote_volume'), row.get('high_24h'), row.get('low_24h'))
+            for row in rows
+        ]
+        if not params:
+            return 0
+
+        # with でまとめてコミット（失敗時はロールバック）
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO price_snapshots
+                (symbol, price, change_24h, volume, quote_volume, high_24h, low_24h)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', params)
+
+        return len(params)
+
+    def _snapshot_store(self):
+        """
+        市場スナップショットストア（スキャン結果の保存先、呼ぶたびに最新値テーブルを読み直す）
+
+        MarketScanner はデフォルトで price_snapshots テーブルに書かないので、価格の読み出しはこちらから行う
+        """
+        try:
+            from src.data.snapshot_store import SnapshotStore
+        except ImportError:
+            from data.snapshot_store import SnapshotStore
+
+        return SnapshotStore(self.snapshot_dir)
+
+    @staticmethod
+    def _snapshot_records(df) -> List[Dict]:
+        """スナップショットのDataFrameを price_snapshots と同じ形式の辞書のリストに変換"""
+        if df.empty:
+            return []
+
+        df = df.rename(columns={'scan_time': 'timestamp'})
+        df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict('records')
+
     def get_latest_prices(self, limit: int = 50) -> List[Dict]:
-        """最新の価格データを取得"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT
-                symbol,
-                price,
-                change_24h,
-                quote_volume,
-                timestamp
-            FROM price_snapshots
-            WHERE timestamp >= datetime('now', '-1 hour')
-            ORDER BY quote_volume DESC
-            LIMIT ?
-        ''', (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+        """最新の価格データを取得（直近1時間にスキャンされた銘柄、出来高順）"""
+        latest = self._snapshot_store().top_volume(limit=limit, max_age_minutes=60)
+        latest = latest.reset_index()[['symbol', 'price', 'change_24h', 'quote_volume', 'scan_time']]
+        return self._snapshot_records(latest)
 
     def get_price_history(self, symbol: str, hours: int = 24) -> List[Dict]:
-        """指定銘柄の価格履歴を取得"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM price_snapshots
-            WHERE symbol = ?
-            AND timestamp >= datetime('now', '-' || ? || ' hours')
-            ORDER BY timestamp DESC
-        ''', (symbol, hours))
-        return [dict(row) for row in cursor.fetchall()]
+        """指定銘柄の価格履歴を取得（新しい順）"""
+        history = self._snapshot_store().get_history(symbol, hours=hours)
+        history = history.sort_values('scan_time', ascending=False, ignore_index=True)
+        return self._snapshot_records(history)
 
     def close(self):
         """データベース接続を閉じる"""
@@ -477,5 +1082,8 @@ if __name__ == '__main__':
     results = db.search_relevant_news('BTC', ['bitcoin', '最高値'])
     print(f"  [OK] {len(results)}件のニュースを取得")
 
+    results = db.search_relevant_news('BTC', ['ビットコイン 史上最高値'], method='vector')
+    print(f"  [OK] 埋め込み検索: {len(results)}件のニュースを取得")
+
     print("\n[OK] 全テスト完了！")
     db.close()
@@ -9,8 +9,6 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.data.advanced_database import AdvancedDatabase
-from src.config.exchange_api import MEXCAPI
 from datetime import datetime, timedelta
 import json
 import sqlite3
@@ -20,6 +18,10 @@ class DetailedDataCollector:
     """詳細データ収集システム"""
 
     def __init__(self):
+        # requests を含むAPIクライアントは、--help などで起動時間を払わないよう使う時に読み込む
+        from src.data.advanced_database import AdvancedDatabase
+        from src.config.exchange_api import MEXCAPI
+
         self.db = AdvancedDatabase()
         self.api = MEXCAPI()
         self._extend_tables()
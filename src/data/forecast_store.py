@@ -0,0 +1,183 @@
+"""
+予測結果の列指向ストア
+
+全銘柄のバッチ予測（src/analysis/batch_forecaster.py）の結果を、実行（run）ごとのディレクトリに
+Parquetで保存する。
+
+保存形式:
+    data/timeseries/forecasts/2026-10-18_1d/_run.json           # 実行の設定・開始/終了時刻・集計
+    data/timeseries/forecasts/2026-10-18_1d/BTC.arima.parquet   # 1銘柄 × 1モデル = 1ファイル
+
+- 1行 = 1ホライズン（symbol, model, horizon, value, lower, upper, fit_seconds, ...）
+- 1ジョブ分を一時ファイルに書いてから rename するので、途中で止まっても完了したジョブのファイルだけが残る
+  → 同じ run_id で再実行すると completed_jobs() にあるジョブを飛ばして再開できる
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+
+# 予測結果の列（順序もこの通りに保存）
+FORECAST_COLUMNS = ['run_id', 'symbol', 'interval', 'model', 'horizon', 'value', 'lower', 'upper',
+                    'fit_seconds', 'data_end', 'created_at']
+
+RUN_FILENAME = '_run.json'
+
+
+class ForecastStore:
+    """予測結果の列指向ストア"""
+
+    def __init__(self, data_dir: str = None):
+        """
+        Args:
+            data_dir: 保存先ディレクトリ（デフォルト: src/data/timeseries）
+        """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), 'timeseries')
+
+        self.base_dir = Path(data_dir) / 'forecasts'
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def run_dir(self, run_id: str) -> Path:
+        """実行ごとのディレクトリ"""
+        return self.base_dir / run_id
+
+    # ========================================
+    # 実行情報
+    # ========================================
+
+    def load_run(self, run_id: str) -> Dict:
+        """実行情報（_run.json）を読み込み（なければ空dict）"""
+        try:
+            with open(self.run_dir(run_id) / RUN_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_run(self, run_id: str, **fields) -> Dict:
+        """
+        実行情報を更新してAtomicに書き込み
+
+        Args:
+            **fields: 上書きする項目（config, started_at, finished_at, status, summary など）
+        """
+        run_dir = self.run_dir(run_id)
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        run = self.load_run(run_id)
+        run.update(fields, run_id=run_id)
+
+        temp_path = run_dir / f"{RUN_FILENAME}.tmp.{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(temp_path, run_dir / RUN_FILENAME)
+
+        return run
+
+    def list_runs(self) -> List[Dict]:
+        """実行の一覧（新しい順）"""
+        runs = [self.load_run(d.name) or {'run_id': d.name}
+                for d in self.base_dir.iterdir() if d.is_dir()]
+        return sorted(runs, key=lambda run: run['run_id'], reverse=True)
+
+    # ========================================
+    # 保存・読み込み
+    # ========================================
+
+    def completed_jobs(self, run_id: str) -> Set[Tuple[str, str]]:
+        """書き込み済みの (symbol, model) の一覧"""
+        run_dir = self.run_dir(run_id)
+        if not run_dir.exists():
+            return set()
+
+        return {tuple(path.name[:-len('.parquet')].rsplit('.', 1))
+                for path in run_dir.glob('*.parquet')}
+
+    def save_forecast(self, run_id: str, symbol: str, model: str, interval: str,
+                      values, lower=None, upper=None, fit_seconds: float = None,
+                      data_end=None) -> Path:
+        """
+        1銘柄 × 1モデルの予測を保存
+
+        Args:
+            values: ホライズン1..Hの予測値
+            lower: 予測区間の下限（なければNaN）
+            upper: 予測区間の上限（なければNaN）
+            fit_seconds: 当てはめ + 予測にかかった時間
+            data_end: 予測に使ったデータの最終時刻
+
+        Returns:
+            保存したファイルのパス
+        """
+        values = np.asarray(values, dtype='float64')
+        horizon = len(values)
+
+        def _interval(bound):
+            if bound is None or len(bound) != horizon:
+                return np.full(horizon, np.nan)
+            return np.asarray(bound, dtype='float64')
+
+        df = pd.DataFrame({
+            'run_id': run_id,
+            'symbol': symbol,
+            'interval': interval,
+            'model': model,
+            'horizon': np.arange(1, horizon + 1, dtype='int16'),
+            'value': values,
+            'lower': _interval(lower),
+            'upper': _interval(upper),
+            'fit_seconds': np.float32(fit_seconds if fit_seconds is not None else np.nan),
+            'data_end': pd.Timestamp(data_end) if data_end is not None else pd.NaT,
+            'created_at': pd.Timestamp(datetime.now()),
+        }, columns=FORECAST_COLUMNS)
+
+        run_dir = self.run_dir(run_id)
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        filepath = run_dir / f"{symbol}.{model}.parquet"
+        temp_path = run_dir / f"{filepath.name}.tmp.{os.getpid()}"
+
+        try:
+            df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, filepath)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+
+        return filepath
+
+    def load_forecasts(self, run_id: str = None, symbol: str = None, model: str = None) -> pd.DataFrame:
+        """
+        予測結果を読み込み
+
+        Args:
+            run_id: 実行ID（省略時は最新の実行）
+            symbol: 銘柄で絞り込み
+            model: モデルで絞り込み
+
+        Returns:
+            FORECAST_COLUMNS のDataFrame（該当なしなら空）
+        """
+        if run_id is None:
+            runs = self.list_runs()
+            if not runs:
+                return pd.DataFrame(columns=FORECAST_COLUMNS)
+            run_id = runs[0]['run_id']
+
+        # ファイル名で絞り込み、必要なファイルだけ読む
+        pattern = f"{symbol or '*'}.{model or '*'}.parquet"
+        files = sorted(self.run_dir(run_id).glob(pattern))
+
+        if not files:
+            return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+        return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
@@ -0,0 +1,220 @@
+"""
+インクリメンタル・テクニカル指標エンジン
+
+EMA・Wilder RSI・移動平均・ボリンジャーバンド・MACDを、前回までの状態から
+新しい足の分だけ計算する（全履歴を毎回再計算しない）。
+
+状態（直前のEMA値・RSIの平均上昇/下落幅・直近の終値）は
+データセットの indicators/ ディレクトリに JSON で保存し、
+計算結果は価格データと同じ月別パーティションとして保存する。
+
+    prices/BTC_1m/indicators/_state.json
+    prices/BTC_1m/indicators/_manifest.json
+    prices/BTC_1m/indicators/2025-10.000000.parquet
+
+状態なしで compute() を呼べば全期間の計算になり、
+状態を引き継いで分割計算した結果と一致する。
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+# 指標のディレクトリ名・状態ファイル名
+INDICATOR_DIRNAME = 'indicators'
+STATE_FILENAME = '_state.json'
+
+# 状態ファイルの形式バージョン（計算方法を変えたら上げる → 自動で再計算）
+STATE_VERSION = 1
+
+# 出力する列
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+                     'BB_Mid', 'BB_Upper', 'BB_Lower', 'SMA_20', 'SMA_50', 'EMA_20']
+
+
+def _ewm_continue(values: np.ndarray, alpha: float, prev: Optional[float]) -> np.ndarray:
+    """
+    指数平滑を前回値から続けて計算（adjust=False と同じ漸化式）
+
+    y_t = (1 - alpha) * y_{t-1} + alpha * x_t
+    prev がなければ先頭の値を初期値にする（pandas の ewm(adjust=False) と同じ）
+    """
+    series = pd.Series(values, dtype='float64')
+    if prev is None:
+        return series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+    seeded = pd.concat([pd.Series([prev], dtype='float64'), series], ignore_index=True)
+    return seeded.ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+
+class IncrementalIndicators:
+    """
+    状態を持つテクニカル指標エンジン
+
+    - EMA / MACD: 直前のEMA値から漸化式で続ける
+    - RSI: Wilder の平滑化（alpha = 1/period）で平均上昇幅・下落幅を続ける
+    - 移動平均 / ボリンジャーバンド: 直近 (最大窓 - 1) 本の終値だけを保持して計算
+    """
+
+    def __init__(self, rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+                 macd_signal: int = 9, bb_window: int = 20, bb_std: float = 2,
+                 sma_windows: Tuple[int, int] = (20, 50), ema_span: int = 20):
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.bb_window = bb_window
+        self.bb_std = bb_std
+        self.sma_windows = tuple(sma_windows)
+        self.ema_span = ema_span
+
+        # 移動平均の計算に必要な過去の終値の本数
+        self.tail_length = max(self.sma_windows + (self.bb_window,)) - 1
+
+    @property
+    def params(self) -> Dict:
+        """パラメータ（状態ファイルに記録し、変わったら再計算する）"""
+        return {
+            'rsi_period': self.rsi_period,
+            'macd_fast': self.macd_fast,
+            'macd_slow': self.macd_slow,
+            'macd_signal': self.macd_signal,
+            'bb_window': self.bb_window,
+            'bb_std': self.bb_std,
+            'sma_windows': list(self.sma_windows),
+            'ema_span': self.ema_span,
+        }
+
+    @staticmethod
+    def _alpha(span: int) -> float:
+        """span から平滑化係数を計算（pandas の ewm(span=...) と同じ）"""
+        return 2.0 / (span + 1)
+
+    def compute(self, close: pd.Series, state: Dict = None) -> Tuple[pd.DataFrame, Dict]:
+        """
+        指標を計算
+
+        Args:
+            close: 新しい足の終値（DatetimeIndex付き、時刻順）
+            state: 前回までの状態（Noneなら close を全期間として計算）
+
+        Returns:
+            (指標のDataFrame, 新しい状態) のタプル
+        """
+        state = state or {}
+        values = close.to_numpy(dtype='float64')
+        ema_state = state.get('ema', {})
+
+        # 移動平均・ボリンジャーバンド（保持している直近の終値を前に付けて計算）
+        tail = np.asarray(state.get('tail', []), dtype='float64')
+        extended = pd.Series(np.concatenate([tail, values]))
+        n_tail = len(tail)
+
+        result = {}
+        for window in self.sma_windows:
+            result[f'SMA_{window}'] = extended.rolling(window).mean().to_numpy()[n_tail:]
+
+        bb_mid = extended.rolling(self.bb_window).mean().to_numpy()[n_tail:]
+        bb_dev = extended.rolling(self.bb_window).std().to_numpy()[n_tail:] * self.bb_std
+        result['BB_Mid'] = bb_mid
+        result['BB_Upper'] = bb_mid + bb_dev
+        result['BB_Lower'] = bb_mid - bb_dev
+
+        # EMA / MACD
+        ema = _ewm_continue(values, self._alpha(self.ema_span), ema_state.get('ema'))
+        ema_fast = _ewm_continue(values, self._alpha(self.macd_fast), ema_state.get('fast'))
+        ema_slow = _ewm_continue(values, self._alpha(self.macd_slow), ema_state.get('slow'))
+        macd = ema_fast - ema_slow
+        signal = _ewm_continue(macd, self._alpha(self.macd_signal), ema_state.get('signal'))
+
+        result[f'EMA_{self.ema_span}'] = ema
+        result['MACD'] = macd
+        result['MACD_Signal'] = signal
+        result['MACD_Hist'] = macd - signal
+
+        # Wilder RSI（前回の終値との差分から）
+        rsi_state = state.get('rsi', {})
+        prev_close = rsi_state.get('prev_close')
+        previous = np.concatenate([[prev_close if prev_close is not None else np.nan], values[:-1]])
+        delta = values - previous
+
+        # 最初の足（前の終値なし）は差分がないので平滑化の対象外
+        valid = ~np.isnan(delta)
+        gains = np.where(valid, np.clip(delta, 0, None), np.nan)
+        losses = np.where(valid, np.clip(-delta, 0, None), np.nan)
+
+        alpha = 1.0 / self.rsi_period
+        avg_gain = np.full(len(values), np.nan)
+        avg_loss = np.full(len(values), np.nan)
+        if valid.any():
+            avg_gain[valid] = _ewm_continue(gains[valid], alpha, rsi_state.get('avg_gain'))
+            avg_loss[valid] = _ewm_continue(losses[valid], alpha, rsi_state.get('avg_loss'))
+
+        # period 本の差分が揃うまではNaN
+        count = rsi_state.get('count', 0) + np.cumsum(valid)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        rsi[count < self.rsi_period] = np.nan
+        result['RSI'] = rsi
+
+        indicators = pd.DataFrame(result, index=close.index)[INDICATOR_COLUMNS].astype('float32')
+
+        # 新しい状態
+        last_valid = np.flatnonzero(valid)
+        new_state = {
+            'version': STATE_VERSION,
+            'params': self.params,
+            'last_timestamp': close.index[-1].isoformat() if len(close) else state.get('last_timestamp'),
+            'tail': extended.to_numpy()[-self.tail_length:].tolist() if self.tail_length else [],
+            'ema': {
+                'ema': float(ema[-1]) if len(values) else ema_state.get('ema'),
+                'fast': float(ema_fast[-1]) if len(values) else ema_state.get('fast'),
+                'slow': float(ema_slow[-1]) if len(values) else ema_state.get('slow'),
+                'signal': float(signal[-1]) if len(values) else ema_state.get('signal'),
+            },
+            'rsi': {
+                'prev_close': float(values[-1]) if len(values) else prev_close,
+                'avg_gain': float(avg_gain[last_valid[-1]]) if len(last_valid) else rsi_state.get('avg_gain'),
+                'avg_loss': float(avg_loss[last_valid[-1]]) if len(last_valid) else rsi_state.get('avg_loss'),
+                'count': int(count[-1]) if len(values) else rsi_state.get('count', 0),
+            },
+        }
+
+        return indicators, new_state
+
+    # ========================================
+    # 状態ファイル
+    # ========================================
+
+    def load_state(self, indicator_dir: Path) -> Optional[Dict]:
+        """
+        状態を読み込み
+
+        形式バージョンやパラメータが違う場合はNone（= 全期間を再計算）
+        """
+        state_path = Path(indicator_dir) / STATE_FILENAME
+
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if state.get('version') != STATE_VERSION or state.get('params') != self.params:
+            return None
+
+        return state
+
+    def save_state(self, indicator_dir: Path, state: Dict):
+        """状態をAtomicに書き込み"""
+        state_path = Path(indicator_dir) / STATE_FILENAME
+        temp_path = Path(indicator_dir) / f"{STATE_FILENAME}.tmp.{os.getpid()}"
+
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        os.replace(temp_path, state_path)
@@ -9,8 +9,14 @@
     # 初回実行（30日分取得）
     python sample/data/minute_data_collector.py --symbols BTC,ETH,SOL --days 30
 
+    # 10ページ（1万件）ごとに保存（デフォルトは銘柄ごとに1回）
+    python sample/data/minute_data_collector.py --symbols BTC --days 30 --flush-pages 10
+
     # 2回目以降（差分のみ）
     python sample/data/minute_data_collector.py --symbols BTC,ETH,SOL
+
+    # 8銘柄を並列に更新（ウェイト上限はレートリミッターで共有）
+    python sample/data/minute_data_collector.py --workers 8
 """
 
 import sys
@@ -18,22 +24,193 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import argparse
-import requests
-import pandas as pd
 import time
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from src.data.timeseries_storage import TimeSeriesStorage
+from typing import TYPE_CHECKING
+from src.config.rate_limiter import TokenBucketRateLimiter, request_weight
+from src.lazy_import import lazy_import
+
+# cron から頻繁に起動するので、--help などで読み込み時間を払わないよう最初に使う時に読み込む
+requests = lazy_import('requests')
+pd = lazy_import('pandas')
+
+if TYPE_CHECKING:
+    from src.data.timeseries_storage import TimeSeriesStorage
+
+
+class KlineBuffer:
+    """
+    APIページをまとめてからストレージに書き込むバッファ
+
+    - flush_pages ページごとにコミット（0なら flush() を呼ぶまで溜める = 銘柄ごとに1回）
+    - メモリ上の行数が max_memory_rows を超えたら一時Parquetファイルに退避（スピル）
+    - コミット時はスピルファイルを古い順に1つずつ保存するので、メモリ使用量は上限内に収まる
+    """
+
+    def __init__(self, storage: 'TimeSeriesStorage', symbol: str, interval: str = '1m',
+                 flush_pages: int = 0, max_memory_rows: int = 500000):
+        """
+        Args:
+            storage: 書き込み先ストレージ
+            symbol: 通貨シンボル
+            interval: 時間足
+            flush_pages: 何ページごとにコミットするか（0なら銘柄ごとに1回）
+            max_memory_rows: メモリに保持する最大行数（超えたらスピル）
+        """
+        self.storage = storage
+        self.symbol = symbol
+        self.interval = interval
+        self.flush_pages = flush_pages
+        self.max_memory_rows = max_memory_rows
+
+        self._frames = []
+        self._memory_rows = 0
+        self._pending_pages = 0
+        self._spill_dir = None
+        self._spill_files = []
+
+        # 計測用
+        self.records = 0
+        self.commits = 0
+        self._start_time = time.perf_counter()
+        self._start_bytes = storage.get_write_stats(symbol, interval)['bytes']
+
+    def add(self, page: list):
+        """APIの1ページ分を追加"""
+        if not page:
+            return
+
+        # dictのリストのままだと1行数百バイトになるので、すぐDataFrameにする
+        self._frames.append(pd.DataFrame(page))
+        self._memory_rows += len(page)
+        self._pending_pages += 1
+        self.records += len(page)
+
+        if self._memory_rows >= self.max_memory_rows:
+            self._spill()
+
+        if self.flush_pages and self._pending_pages >= self.flush_pages:
+            self.flush()
+
+    def _spill(self):
+        """メモリ上のページを一時Parquetファイルに退避"""
+        if not self._frames:
+            return
+
+        if self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix=f"spill_{self.symbol}_",
+                                                    dir=self.storage.data_dir))
+
+        spill_path = self._spill_dir / f"{len(self._spill_files):06d}.parquet"
+        pd.concat(self._frames, ignore_index=True).to_parquet(spill_path)
+
+        self._spill_files.append(spill_path)
+        self._frames = []
+        self._memory_rows = 0
+
+    def flush(self):
+        """溜まっているデータをストレージにコミット"""
+        # スピル分（古い順）→ メモリ分の順に保存
+        for spill_path in self._spill_files:
+            self.storage.save_price_data(self.symbol, self.interval, pd.read_parquet(spill_path))
+            self.commits += 1
+
+        if self._frames:
+            self.storage.save_price_data(self.symbol, self.interval,
+                                         pd.concat(self._frames, ignore_index=True))
+            self.commits += 1
+
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+        self._frames = []
+        self._memory_rows = 0
+        self._pending_pages = 0
+        self._spill_dir = None
+        self._spill_files = []
+
+    def report(self) -> dict:
+        """
+        スループットを集計
+
+        Returns:
+            {'records', 'commits', 'elapsed_sec', 'records_per_sec', 'bytes_written'}
+        """
+        elapsed = time.perf_counter() - self._start_time
+        return {
+            'records': self.records,
+            'commits': self.commits,
+            'elapsed_sec': elapsed,
+            'records_per_sec': self.records / elapsed if elapsed > 0 else 0.0,
+            'bytes_written': self.storage.get_write_stats(self.symbol, self.interval)['bytes'] - self._start_bytes,
+        }
 
 
 class MinuteDataCollector:
     """1分足データ収集システム"""
 
-    def __init__(self, data_dir=None):
+    # API呼び出しの最大リトライ回数（429/418を受けたとき）
+    MAX_RETRIES = 3
+
+    def __init__(self, data_dir=None, flush_pages: int = 0, max_buffer_rows: int = 500000,
+                 workers: int = 1, rate_limiter: TokenBucketRateLimiter = None):
+        """
+        Args:
+            data_dir: データ保存先ディレクトリ
+            flush_pages: 何ページごとにストレージへコミットするか（0なら銘柄ごとに1回）
+            max_buffer_rows: メモリに溜める最大行数（超えた分は一時ファイルへ退避）
+            workers: 並列に収集する銘柄数（1なら逐次）
+            rate_limiter: 共有レートリミッター（省略時はBinanceのウェイト上限で作成）
+        """
+        from src.data.timeseries_storage import TimeSeriesStorage
         self.storage = TimeSeriesStorage(data_dir)
         # Binance API（無料、認証不要）
         self.base_url = "https://api.binance.com/api/v3"
 
+        self.flush_pages = flush_pages
+        self.max_buffer_rows = max_buffer_rows
+        self.workers = max(1, workers)
+
+        # 全スレッドで1つのバケットを共有し、IP単位のウェイト上限を守る
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.for_exchange('binance')
+
+        # 並列時は \r による進捗表示が混ざるので出さない
+        self.show_progress = self.workers == 1
+
+        # 銘柄ごとの収集スループット {symbol: report}
+        self.reports = {}
+
+    def _create_buffer(self, symbol: str) -> KlineBuffer:
+        """書き込みバッファを作成"""
+        return KlineBuffer(self.storage, symbol, '1m',
+                           flush_pages=self.flush_pages,
+                           max_memory_rows=self.max_buffer_rows)
+
+    def _finish_buffer(self, symbol: str, buffer: KlineBuffer):
+        """バッファをコミットしてスループットを表示"""
+        buffer.flush()
+        report = buffer.report()
+        self.reports[symbol] = report
+
+        print(f"\n[OK] {symbol} completed: {report['records']} records fetched "
+              f"({report['records_per_sec']:,.0f} records/sec, "
+              f"{report['bytes_written'] / 1024:,.1f}KB written, {report['commits']} commits)")
+
+    def _salvage_buffer(self, symbol: str, buffer: KlineBuffer):
+        """
+        取得が例外で中断したときに、取得済みの分を保存
+
+        保存の失敗はログに残すだけにして、呼び出し側で元の例外をそのまま再送出させる
+        """
+        try:
+            self._finish_buffer(symbol, buffer)
+        except Exception as e:
+            print(f"\n[WARNING] {symbol}: failed to save fetched data after interruption: {e}")
+
     def get_latest_timestamp(self, symbol: str) -> int:
         """
         既存データの最終タイムスタンプを取得
@@ -45,11 +222,11 @@ class MinuteDataCollector:
             最終タイムスタンプ（ミリ秒）、なければNone
         """
         try:
-            df = self.storage.load_price_data(symbol, '1m')
-            if df.empty:
+            # マニフェスト/フッターから取得（データ本体は読まない）
+            last_time = self.storage.get_last_timestamp(symbol, '1m')
+            if last_time is None:
                 return None
             # 最後のタイムスタンプをミリ秒に変換
-            last_time = df.index[-1]
             return int(last_time.timestamp() * 1000)
         except:
             return None
@@ -68,6 +245,7 @@ class MinuteDataCollector:
             価格データのリスト
         """
         endpoint = f"{self.base_url}/klines"
+        path = '/api/v3/klines'
 
         params = {
             'symbol': f"{symbol}USDT",
@@ -81,7 +259,23 @@ class MinuteDataCollector:
             params['endTime'] = end_time
 
         try:
-            response = requests.get(endpoint, params=params, timeout=30)
+            for attempt in range(self.MAX_RETRIES + 1):
+                self.rate_limiter.acquire(request_weight('binance', path, params))
+                response = requests.get(endpoint, params=params, timeout=30)
+
+                # サーバー側の使用済みウェイトでバケットを補正
+                used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M')
+                if used_weight is not None:
+                    self.rate_limiter.sync_used_weight(float(used_weight))
+
+                # 429: レート超過 / 418: IPバン中 → Retry-After の間は全スレッドを止める
+                if response.status_code in (418, 429) and attempt < self.MAX_RETRIES:
+                    retry_after = float(response.headers.get('Retry-After', 60))
+                    print(f"[WARNING] Rate limited ({response.status_code}), waiting {retry_after:.0f}s")
+                    self.rate_limiter.penalize(retry_after)
+                    continue
+                break
+
             response.raise_for_status()
             data = response.json()
 
@@ -125,34 +319,39 @@ class MinuteDataCollector:
 
         total_records = 0
         current_start = start_time
+        buffer = self._create_buffer(symbol)
 
-        # Binance APIは1回1000件まで
-        while current_start < end_time:
-            data = self.fetch_klines(symbol, start_time=current_start, end_time=end_time, limit=1000)
+        try:
+            # Binance APIは1回1000件まで
+            while current_start < end_time:
+                data = self.fetch_klines(symbol, start_time=current_start, end_time=end_time, limit=1000)
 
-            if not data:
-                break
+                if not data:
+                    break
 
-            # 保存
-            self.storage.save_price_data(symbol, '1m', data)
-            total_records += len(data)
+                # バッファに追加（flush_pagesごと、または最後にまとめて保存）
+                buffer.add(data)
+                total_records += len(data)
 
-            # 次のバッチの開始時刻
-            last_timestamp = data[-1]['timestamp']
-            current_start = last_timestamp + 60000  # 1分後
+                # 次のバッチの開始時刻
+                last_timestamp = data[-1]['timestamp']
+                current_start = last_timestamp + 60000  # 1分後
 
-            # 進捗表示
-            progress = ((current_start - start_time) / (end_time - start_time)) * 100
-            print(f"   Progress: {progress:.1f}% ({total_records} records)", end='\r')
+                # 進捗表示
+                if self.show_progress:
+                    progress = ((current_start - start_time) / (end_time - start_time)) * 100
+                    print(f"   Progress: {progress:.1f}% ({total_records} records)", end='\r')
 
-            # API制限対策
-            time.sleep(0.5)
+                # 最新データに追いついたら終了
+                if len(data) < 1000:
+                    break
+        except BaseException:
+            # 中断時も取得済みの分は保存する（保存の失敗で元の例外を隠さない）
+            self._salvage_buffer(symbol, buffer)
+            raise
 
-            # 最新データに追いついたら終了
-            if len(data) < 1000:
-                break
+        self._finish_buffer(symbol, buffer)
 
-        print(f"\n[OK] Completed: {total_records} records fetched")
         return total_records
 
     def collect_incremental_data(self, symbol: str):
@@ -193,33 +392,38 @@ class MinuteDataCollector:
 
         total_records = 0
         current_start = start_time
+        buffer = self._create_buffer(symbol)
 
-        while current_start < end_time:
-            data = self.fetch_klines(symbol, start_time=current_start, end_time=end_time, limit=1000)
+        try:
+            while current_start < end_time:
+                data = self.fetch_klines(symbol, start_time=current_start, end_time=end_time, limit=1000)
 
-            if not data:
-                break
+                if not data:
+                    break
 
-            # 保存
-            self.storage.save_price_data(symbol, '1m', data)
-            total_records += len(data)
+                # バッファに追加（flush_pagesごと、または最後にまとめて保存）
+                buffer.add(data)
+                total_records += len(data)
 
-            # 次のバッチ
-            last_timestamp = data[-1]['timestamp']
-            current_start = last_timestamp + 60000
+                # 次のバッチ
+                last_timestamp = data[-1]['timestamp']
+                current_start = last_timestamp + 60000
 
-            # 進捗表示
-            progress = ((current_start - start_time) / (end_time - start_time)) * 100
-            print(f"   Progress: {progress:.1f}% ({total_records} records)", end='\r')
+                # 進捗表示
+                if self.show_progress:
+                    progress = ((current_start - start_time) / (end_time - start_time)) * 100
+                    print(f"   Progress: {progress:.1f}% ({total_records} records)", end='\r')
 
-            # API制限対策
-            time.sleep(0.5)
+                # 最新データに追いついたら終了
+                if len(data) < 1000:
+                    break
+        except BaseException:
+            # 中断時も取得済みの分は保存する（保存の失敗で元の例外を隠さない）
+            self._salvage_buffer(symbol, buffer)
+            raise
 
-            # 最新データに追いついたら終了
-            if len(data) < 1000:
-                break
+        self._finish_buffer(symbol, buffer)
 
-        print(f"\n[OK] Completed: {total_records} records fetched")
         return total_records
 
     def collect_data(self, symbol: str, days: int = None):
@@ -262,24 +466,54 @@ class MinuteDataCollector:
         print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*80}")
 
-        results = {}
+        print(f"Workers: {self.workers}")
 
-        for i, symbol in enumerate(symbols, 1):
-            print(f"\n[{i}/{len(symbols)}] {symbol}")
-            count = self.collect_data(symbol, days)
-            results[symbol] = count
+        results = {}
+        start = time.perf_counter()
 
-            # 次の通貨の前に少し待機
-            if i < len(symbols):
-                time.sleep(1)
+        # API呼び出しの間隔はレートリミッターが管理するので、固定の待機は入れない
+        if self.workers == 1:
+            for i, symbol in enumerate(symbols, 1):
+                print(f"\n[{i}/{len(symbols)}] {symbol}")
+                results[symbol] = self.collect_data(symbol, days)
+        else:
+            # 銘柄ごとに別ファイルへ書くので、取得と保存を銘柄単位で並列化できる
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self.collect_data, symbol, days): symbol
+                           for symbol in symbols}
+
+                for i, future in enumerate(as_completed(futures), 1):
+                    symbol = futures[future]
+                    try:
+                        results[symbol] = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] {symbol}: {e}")
+                        results[symbol] = 0
+                    print(f"[{i}/{len(symbols)}] {symbol} done")
+
+            # 表示順を入力順に揃える
+            results = {symbol: results[symbol] for symbol in symbols}
+
+        elapsed = time.perf_counter() - start
+        limiter_stats = self.rate_limiter.get_stats()
 
         # サマリー
         print(f"\n{'='*80}")
         print(f"Summary")
         print(f"{'='*80}")
         for symbol, count in results.items():
-            print(f"  {symbol}: {count:,} records")
+            report = self.reports.get(symbol)
+            if report:
+                print(f"  {symbol}: {count:,} records "
+                      f"({report['records_per_sec']:,.0f} records/sec, "
+                      f"{report['bytes_written'] / 1024:,.1f}KB written)")
+            else:
+                print(f"  {symbol}: {count:,} records")
         print(f"  Total: {sum(results.values()):,} records")
+        total_bytes = sum(r['bytes_written'] for r in self.reports.values())
+        print(f"  Written: {total_bytes / 1024:,.1f}KB in {sum(r['commits'] for r in self.reports.values())} commits")
+        print(f"  Elapsed: {elapsed:.1f}s "
+              f"(API weight {limiter_stats['total_weight']:,.0f}, rate-limit wait {limiter_stats['total_wait_sec']:.1f}s)")
         print(f"{'='*80}\n")
 
         return results
@@ -295,23 +529,27 @@ class MinuteDataCollector:
         print(f"Saved Data Summary")
         print(f"{'='*80}")
 
+        # カタログ（メタデータのみ）から1分足の行数・期間を取得
+        catalog = {item['symbol']: item for item in self.storage.get_storage_info()['prices']
+                   if item['interval'] == '1m'}
+
         if symbols is None:
-            # データディレクトリから全ファイルを検索
-            price_dir = self.storage.price_dir
-            files = list(price_dir.glob("*_1m.parquet"))
-            symbols = [f.stem.replace('_1m', '') for f in files]
+            # データディレクトリから全1分足データセットを検索
+            symbols = sorted(catalog)
 
         for symbol in symbols:
             try:
-                df = self.storage.load_price_data(symbol, '1m')
-                if df.empty:
+                item = catalog.get(symbol)
+                if item is None or item['rows'] == 0:
                     print(f"  {symbol}: No data")
                     continue
 
-                first_time = df.index[0].strftime('%Y-%m-%d %H:%M')
-                last_time = df.index[-1].strftime('%Y-%m-%d %H:%M')
-                count = len(df)
-                days = (df.index[-1] - df.index[0]).days
+                start = pd.Timestamp(item['start_date'])
+                end = pd.Timestamp(item['end_date'])
+                first_time = start.strftime('%Y-%m-%d %H:%M')
+                last_time = end.strftime('%Y-%m-%d %H:%M')
+                count = item['rows']
+                days = (end - start).days
 
                 print(f"  {symbol}:")
                 print(f"    Count: {count:,} records")
@@ -352,8 +590,10 @@ def main():
     """コマンドライン実行"""
     # Windows環境でUnicode出力を有効化（ラインバッファリング）
     import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+    if (sys.stdout.encoding or '').lower() != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+    if (sys.stderr.encoding or '').lower() != 'utf-8':
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace', line_buffering=True)
 
     parser = argparse.ArgumentParser(description='1分足データ収集スクリプト')
 
@@ -372,10 +612,22 @@ def main():
     parser.add_argument('--data-dir', type=str, default=None,
                        help='データ保存先ディレクトリ（デフォルト: src/data/timeseries）')
 
+    parser.add_argument('--flush-pages', type=int, default=0,
+                       help='何ページ（1000件）ごとに保存するか（デフォルト: 0 = 銘柄ごとに1回）')
+
+    parser.add_argument('--max-buffer-rows', type=int, default=500000,
+                       help='メモリに溜める最大行数。超えた分は一時ファイルへ退避（デフォルト: 500000）')
+
+    parser.add_argument('--workers', type=int, default=4,
+                       help='並列に収集する銘柄数（デフォルト: 4、1なら逐次）')
+
     args = parser.parse_args()
 
     # 収集システム初期化
-    collector = MinuteDataCollector(data_dir=args.data_dir)
+    collector = MinuteDataCollector(data_dir=args.data_dir,
+                                    flush_pages=args.flush_pages,
+                                    max_buffer_rows=args.max_buffer_rows,
+                                    workers=args.workers)
 
     # 銘柄リスト取得
     if args.symbols:
@@ -38,21 +38,11 @@ class NewsManager:
         Returns:
             保存したファイルパス
         """
-        symbol = news.get('symbol', 'UNKNOWN')
+        filepath = self._markdown_path(news) or (
+            self.base_path / news.get('symbol', 'UNKNOWN') / (datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + '.md'))
 
         # 銘柄ごとのディレクトリ作成
-        symbol_dir = self.base_path / symbol
-        symbol_dir.mkdir(parents=True, exist_ok=True)
-
-        # ファイル名: 公開日時
-        pub_date_str = news.get('published_date', datetime.now().isoformat())
-        try:
-            pub_date = datetime.fromisoformat(pub_date_str.replace('Z', '+00:00'))
-            filename = pub_date.strftime('%Y-%m-%d_%H-%M-%S') + '.md'
-        except:
-            filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + '.md'
-
-        filepath = symbol_dir / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
 
         # Markdown生成
         markdown_content = self._generate_markdown(news)
@@ -63,6 +53,24 @@ class NewsManager:
 
         return str(filepath)
 
+    def _markdown_path(self, news: dict):
+        """
+        ニュースのMarkdownファイルのパス（銘柄/公開日時.md）
+
+        Returns:
+            Path（公開日時を解釈できなければNone）
+        """
+        symbol = news.get('symbol', 'UNKNOWN')
+
+        # ファイル名: 公開日時
+        pub_date_str = news.get('published_date', datetime.now().isoformat())
+        try:
+            pub_date = datetime.fromisoformat(pub_date_str.replace('Z', '+00:00'))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+        return self.base_path / symbol / (pub_date.strftime('%Y-%m-%d_%H-%M-%S') + '.md')
+
     def _generate_markdown(self, news: dict) -> str:
         """
         ニュースからMarkdownを生成
@@ -219,27 +227,31 @@ class NewsManager:
         with open(filepath, 'r', encoding='utf-8') as f:
             return f.read()
 
-    def search_news(self, keyword: str, symbol: str = None) -> List[Path]:
+    def search_news(self, keyword: str, symbol: str = None, start_date: str = None,
+                    end_date: str = None, limit: int = 100) -> List[Path]:
         """
         キーワードでニュースを検索
 
+        ファイルを読まずにデータベースの全文検索インデックスで検索し、
+        エクスポート済みのMarkdownファイルを関連度順に返す
+
         Args:
             keyword: 検索キーワード
             symbol: 銘柄（Noneなら全銘柄）
+            start_date: この日時以降に公開（ISO形式）
+            end_date: この日時以前に公開（ISO形式）
+            limit: 最大件数
 
         Returns:
-            マッチしたファイルのリスト
+            マッチしたファイルのリスト（関連度順）
         """
-        if symbol:
-            files = self.list_news(symbol)
-        else:
-            files = list(self.base_path.rglob('*.md'))
-
         matched = []
-        for file in files:
-            content = file.read_text(encoding='utf-8')
-            if keyword.lower() in content.lower():
-                matched.append(file)
+
+        for news in self.db.search_news(keyword, symbol=symbol, start_date=start_date,
+                                        end_date=end_date, limit=limit):
+            filepath = self._markdown_path(news)
+            if filepath is not None and filepath not in matched and filepath.exists():
+                matched.append(filepath)
 
         return matched
 
@@ -277,6 +289,8 @@ def main():
     parser.add_argument('--days', type=int, default=30, help='過去何日分（デフォルト30）')
     parser.add_argument('--list', action='store_true', help='ニュース一覧表示')
     parser.add_argument('--search', help='キーワード検索')
+    parser.add_argument('--start-date', help='検索: この日付以降に公開（例: 2025-10-01）')
+    parser.add_argument('--end-date', help='検索: この日付以前に公開（例: 2025-10-31）')
     parser.add_argument('--stats', action='store_true', help='統計情報表示')
 
     args = parser.parse_args()
@@ -297,7 +311,8 @@ def main():
             print(f"   {i}. {file.name}")
 
     elif args.search:
-        files = manager.search_news(args.search, symbol=args.symbol)
+        files = manager.search_news(args.search, symbol=args.symbol,
+                                    start_date=args.start_date, end_date=args.end_date)
         print(f"🔍 検索結果: {len(files)}件")
         for i, file in enumerate(files[:20], 1):
             print(f"   {i}. {file.parent.name}/{file.name}")
@@ -0,0 +1,438 @@
+"""
+複数銘柄の終値行列（メモリマップ）
+
+時間足ごとに、全銘柄の終値を 時刻×銘柄 の float32 行列として1つのファイルに保存し、
+np.memmap で読む。相関分析などで銘柄ごとにParquetを読み直さずに済み、
+複数プロセスが同じファイルをページキャッシュ経由で共有できる。
+
+保存形式:
+    data/timeseries/matrix/1d/_meta.json           # 銘柄一覧・行数・各データセットの状態
+    data/timeseries/matrix/1d/close.000003.f32     # 終値（行優先、rows × symbols）
+    data/timeseries/matrix/1d/timestamps.000003.i8 # 時刻（int64ナノ秒、昇順）
+
+- 行列にはその時刻に足がない銘柄はNaNのまま保存し、読み出し時に
+  選んだ銘柄だけで前方埋め（ffill）する（銘柄ごとにParquetを結合した結果と一致）
+- refresh() は各データセットのマニフェストの変化だけを見て、新しい足を末尾に追記する
+- 銘柄の追加・過去データの差し替えなど追記で表せない変更は、新しい世代のファイルを作り直す
+  （読み手は _meta.json の世代と行数を見るので、書き込み途中の行は見えない）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List
+
+
+MATRIX_DIRNAME = 'matrix'
+META_FILENAME = '_meta.json'
+LOCK_FILENAME = '_refresh.lock'
+
+# メタデータの形式バージョン（ファイル形式を変えたら上げる → 自動で作り直す）
+META_VERSION = 1
+
+# これより古いロックファイルは、異常終了したプロセスの残りとみなす（秒）
+LOCK_STALE_SECONDS = 300
+
+
+class PriceMatrix:
+    """
+    時刻×銘柄の終値行列（float32、メモリマップ）
+
+    使い方:
+        matrix = PriceMatrix(storage, '1d')
+        matrix.refresh()                               # 新しい足があれば追記
+        df = matrix.get_frame(['BTC', 'ETH', 'XRP'])   # 選んだ銘柄の終値（前方埋め済み）
+    """
+
+    def __init__(self, storage, interval: str = '1d'):
+        """
+        Args:
+            storage: TimeSeriesStorage
+            interval: 時間足
+        """
+        self.storage = storage
+        self.interval = interval
+        self.matrix_dir = Path(storage.data_dir) / MATRIX_DIRNAME / interval
+        self.matrix_dir.mkdir(parents=True, exist_ok=True)
+
+        # 開いているメモリマップ（メタデータの世代・行数が変わったら開き直す）
+        self._meta = None
+        self._values = None
+        self._timestamps = None
+
+    # ========================================
+    # ファイル・メタデータ
+    # ========================================
+
+    def _paths(self, generation: int):
+        """(終値ファイル, 時刻ファイル) のパス"""
+        return (self.matrix_dir / f"close.{generation:06d}.f32",
+                self.matrix_dir / f"timestamps.{generation:06d}.i8")
+
+    def _load_meta(self) -> Dict:
+        """メタデータを読み込み（なければ・形式が古ければNone）"""
+        try:
+            with open(self.matrix_dir / META_FILENAME, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('version') != META_VERSION or meta.get('interval') != self.interval:
+            return None
+
+        return meta
+
+    def _save_meta(self, meta: Dict):
+        """メタデータをAtomicに書き込み（データファイルを書いた後に呼ぶ）"""
+        meta_path = self.matrix_dir / META_FILENAME
+        temp_path = self.matrix_dir / f"{META_FILENAME}.tmp.{os.getpid()}"
+
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+
+        os.replace(temp_path, meta_path)
+
+    def _acquire_lock(self) -> bool:
+        """
+        更新用のロックを取得（他のプロセスが更新中ならFalse）
+
+        読み出しはロック不要。更新は1プロセスだけが行い、他は既存の行列をそのまま使う
+        """
+        lock_path = self.matrix_dir / LOCK_FILENAME
+
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime < LOCK_STALE_SECONDS:
+                        return False
+                    lock_path.unlink()
+                except OSError:
+                    return False
+
+        return False
+
+    def _release_lock(self):
+        """更新用のロックを解放"""
+        try:
+            (self.matrix_dir / LOCK_FILENAME).unlink()
+        except OSError:
+            pass
+
+    # ========================================
+    # 作成・追記
+    # ========================================
+
+    def _available_symbols(self) -> List[str]:
+        """ストレージにこの時間足のデータがある銘柄"""
+        return [symbol for symbol, interval in self.storage.list_price_datasets()
+                if interval == self.interval]
+
+    def _load_closes(self, symbol: str, start=None) -> pd.Series:
+        """終値列だけを読み込み（start より後の足のみ）"""
+        df = self.storage.load_price_data(symbol, self.interval, start_date=start, columns=['close'])
+        if df is None or df.empty:
+            return pd.Series(dtype='float32')
+
+        close = df['close']
+        if start is not None:
+            close = close[close.index > pd.Timestamp(start)]
+        return close
+
+    def _load_index(self, symbol: str) -> np.ndarray:
+        """時刻だけを読み込み（int64ナノ秒、昇順）"""
+        df = self.storage.load_price_data(symbol, self.interval, columns=[])
+        if df is None or not len(df.index):
+            return np.empty(0, dtype='int64')
+        return np.unique(self._to_ns(df.index))
+
+    @staticmethod
+    def _to_ns(index) -> np.ndarray:
+        """DatetimeIndex を int64 ナノ秒に変換"""
+        return pd.DatetimeIndex(index).as_unit('ns').asi8
+
+    def build(self, symbols: List[str] = None) -> Dict:
+        """
+        行列を作り直す（新しい世代のファイルに書いてからメタデータを切り替える）
+
+        全銘柄の終値を同時にメモリに載せないよう、先に時刻だけを読んで和集合を求め、
+        メモリマップした新しいファイルに1銘柄ずつ列を書き込む。
+
+        Args:
+            symbols: 含める銘柄（省略時はストレージにある全銘柄）
+
+        Returns:
+            {'mode': 'build', 'rows', 'symbols'}
+        """
+        if symbols is None:
+            symbols = self._available_symbols()
+
+        # 1回目: 時刻だけを読んで全銘柄の和集合を作る（足がない時刻はNaNになる）
+        states, last_ns = {}, {}
+        timestamps = np.empty(0, dtype='int64')
+        for symbol in symbols:
+            # 状態を先に取る（読み込み中に追記されても、次回の refresh で拾える）
+            states[symbol] = self.storage.get_dataset_state(symbol, self.interval)
+            index = self._load_index(symbol)
+            if index.size:
+                last_ns[symbol] = index[-1]
+                timestamps = np.union1d(timestamps, index)
+
+        symbols = list(last_ns)
+        rows = len(timestamps)
+
+        old_meta = self._load_meta()
+        generation = (old_meta['generation'] + 1) if old_meta else 0
+        values_path, timestamps_path = self._paths(generation)
+
+        # 2回目: 1銘柄ずつ終値を読んで列を埋める
+        datasets = {}
+        if rows:
+            values = np.memmap(values_path, dtype='float32', mode='w+', shape=(rows, len(symbols)))
+            values[:] = np.nan
+
+            for column, symbol in enumerate(symbols):
+                close = self._load_closes(symbol)
+                # 1回目の後に追記された足は含めない（次回の refresh で追記される）
+                close_ns = self._to_ns(close.index)
+                close = close[close_ns <= last_ns[symbol]]
+                close_ns = close_ns[close_ns <= last_ns[symbol]]
+
+                # 1回目の後に過去の足が差し替わった場合に備え、和集合にない時刻は書かない
+                positions = np.minimum(np.searchsorted(timestamps, close_ns), rows - 1)
+                found = timestamps[positions] == close_ns
+                values[positions[found], column] = close.to_numpy(dtype='float32')[found]
+
+                datasets[symbol] = {
+                    'signature': states[symbol]['signature'],
+                    'rows': int(close.size),
+                    'last_timestamp': (close.index[-1] if close.size
+                                       else pd.Timestamp(last_ns[symbol])).isoformat(),
+                }
+                del close, close_ns, positions
+
+            values.flush()
+            del values
+        else:
+            open(values_path, 'wb').close()
+
+        timestamps.tofile(timestamps_path)
+
+        self._save_meta({
+            'version': META_VERSION,
+            'interval': self.interval,
+            'generation': generation,
+            'symbols': symbols,
+            'rows': rows,
+            'datasets': datasets,
+        })
+
+        # 古い世代を削除（他プロセスが開いていて消せない場合は次回）
+        for path in self.matrix_dir.glob('*.*'):
+            if path.suffix in ('.f32', '.i8') and path not in (values_path, timestamps_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+        return {'mode': 'build', 'rows': rows, 'symbols': len(symbols)}
+
+    def _append(self, meta: Dict, changed: List[str]) -> Dict:
+        """
+        変更のあった銘柄の新しい足を追記
+
+        Returns:
+            結果の辞書。追記で表せない変更ならNone（→ 作り直し）
+        """
+        new_closes = {}
+        for symbol in changed:
+            dataset = meta['datasets'][symbol]
+            state = self.storage.get_dataset_state(symbol, self.interval)
+            close = self._load_closes(symbol, start=dataset['last_timestamp'])
+
+            # 最終時刻より前の足が増えた・消えた（過去データの差し替え）は追記できない
+            if state['rows'] != dataset['rows'] + close.size:
+                return None
+
+            dataset['signature'] = state['signature']
+            if not close.empty:
+                dataset['rows'] += int(close.size)
+                dataset['last_timestamp'] = close.index[-1].isoformat()
+                new_closes[symbol] = close
+
+        if not new_closes:
+            # マニフェストだけ書き換わった（まとめ直し等）
+            self._save_meta(meta)
+            return {'mode': 'none', 'rows': meta['rows'], 'rows_added': 0}
+
+        frame = pd.DataFrame(new_closes).sort_index()
+        new_ts = self._to_ns(frame.index)
+        columns = [meta['symbols'].index(symbol) for symbol in frame.columns]
+
+        values_path, timestamps_path = self._paths(meta['generation'])
+        rows, n_symbols = meta['rows'], len(meta['symbols'])
+        old_ts = np.fromfile(timestamps_path, dtype='int64', count=rows)
+        last_ts = old_ts[-1] if rows else np.iinfo('int64').min
+
+        # 既存の時刻に入る足（他の銘柄より遅れていた銘柄）はその場で書き込む
+        inside = new_ts <= last_ts
+        if inside.any():
+            positions = np.searchsorted(old_ts, new_ts[inside])
+            if (positions >= rows).any() or (old_ts[positions] != new_ts[inside]).any():
+                return None  # 既存の時刻の間に新しい時刻が入る → 作り直し
+
+            values = np.memmap(values_path, dtype='float32', mode='r+', shape=(rows, n_symbols))
+            block = frame.to_numpy(dtype='float32')[inside]
+            for k, column in enumerate(columns):
+                present = ~np.isnan(block[:, k])
+                values[positions[present], column] = block[present, k]
+            values.flush()
+            del values
+
+        # 末尾に追記する行（データ → 時刻 → メタデータの順に書く）
+        appended = ~inside
+        if appended.any():
+            block = np.full((appended.sum(), n_symbols), np.nan, dtype='float32')
+            block[:, columns] = frame.to_numpy(dtype='float32')[appended]
+
+            with open(values_path, 'ab') as f:
+                f.write(np.ascontiguousarray(block).tobytes())
+            with open(timestamps_path, 'ab') as f:
+                f.write(new_ts[appended].tobytes())
+
+            meta['rows'] = rows + int(appended.sum())
+
+        self._save_meta(meta)
+
+        return {'mode': 'append', 'rows': meta['rows'], 'rows_added': int(appended.sum()),
+                'updated_in_place': int(inside.sum())}
+
+    def refresh(self, symbols: List[str] = None) -> Dict:
+        """
+        ストレージの変更を行列に反映
+
+        変更のないデータセットはマニフェストのmtime・サイズを比べるだけで読まない。
+
+        Args:
+            symbols: 必ず含めたい銘柄（ストレージにない銘柄は無視）。省略時はストレージの全銘柄
+
+        Returns:
+            {'mode': 'none' / 'append' / 'build' / 'locked', ...}
+        """
+        available = set(self._available_symbols())
+        wanted = available if symbols is None else (set(symbols) & available)
+
+        meta = self._load_meta()
+
+        # 確認だけなら（ロックなしで）済ませる
+        if meta is not None:
+            missing = wanted - set(meta['symbols'])
+            removed = set(meta['symbols']) - available
+            changed = [
+                symbol for symbol in meta['symbols'] if symbol in available
+                and self.storage.get_dataset_state(symbol, self.interval)['signature']
+                != meta['datasets'][symbol]['signature']
+            ]
+            if not missing and not removed and not changed:
+                return {'mode': 'none', 'rows': meta['rows'], 'rows_added': 0}
+
+        if not self._acquire_lock():
+            # 他のプロセスが更新中 → 既存の行列をそのまま使う
+            return {'mode': 'locked', 'rows': meta['rows'] if meta else 0, 'rows_added': 0}
+
+        try:
+            if meta is not None and not missing and not removed:
+                result = self._append(meta, changed)
+                if result is not None:
+                    return result
+
+            # 作り直し（既存の銘柄も残す）
+            keep = set(meta['symbols']) & available if meta else set()
+            return self.build(sorted(keep | wanted))
+        finally:
+            self._release_lock()
+
+    # ========================================
+    # 読み出し
+    # ========================================
+
+    def _open(self) -> Dict:
+        """メモリマップを開く（メタデータが変わっていれば開き直す）"""
+        meta = self._load_meta()
+        if meta is None:
+            self._meta, self._values, self._timestamps = None, None, None
+            return None
+
+        if (self._meta is None or meta['generation'] != self._meta['generation']
+                or meta['rows'] != self._meta['rows']):
+            values_path, timestamps_path = self._paths(meta['generation'])
+            shape = (meta['rows'], len(meta['symbols']))
+
+            if meta['rows'] and shape[1]:
+                # ファイルが追記で伸びていても、メタデータの行数までしか見ない
+                self._values = np.memmap(values_path, dtype='float32', mode='r', shape=shape)
+                self._timestamps = np.memmap(timestamps_path, dtype='int64', mode='r', shape=(shape[0],))
+            else:
+                self._values = np.empty(shape, dtype='float32')
+                self._timestamps = np.empty(shape[0], dtype='int64')
+
+        self._meta = meta
+        return meta
+
+    @property
+    def symbols(self) -> List[str]:
+        """行列に含まれる銘柄"""
+        meta = self._open()
+        return list(meta['symbols']) if meta else []
+
+    def get_frame(self, symbols: List[str] = None, start_date=None, end_date=None,
+                  fill: bool = True) -> pd.DataFrame:
+        """
+        選んだ銘柄の終値を DataFrame で取得
+
+        選んだ銘柄のどれにも足がない時刻は除き、fill=True なら前方埋めする
+        （銘柄ごとに読み込んで時刻で結合 → ffill した結果と同じ）。
+
+        Args:
+            symbols: 銘柄（省略時は全銘柄）。行列にない銘柄は含まれない
+            start_date: 開始時刻
+            end_date: 終了時刻
+            fill: 欠けている足を前の値で埋めるか
+
+        Returns:
+            DataFrame（DatetimeIndex、列は銘柄、float32）。行列がなければNone
+        """
+        meta = self._open()
+        if meta is None:
+            return None
+
+        if symbols is None:
+            symbols = meta['symbols']
+        symbols = [symbol for symbol in symbols if symbol in meta['symbols']]
+        columns = [meta['symbols'].index(symbol) for symbol in symbols]
+
+        # 期間は時刻の二分探索で行範囲に変換（行列全体は読まない）
+        first, last = 0, meta['rows']
+        if start_date is not None:
+            first = int(np.searchsorted(self._timestamps, self._to_ns([pd.Timestamp(start_date)])[0], 'left'))
+        if end_date is not None:
+            last = int(np.searchsorted(self._timestamps, self._to_ns([pd.Timestamp(end_date)])[0], 'right'))
+
+        values = self._values[first:last, columns]
+        index = pd.DatetimeIndex(np.asarray(self._timestamps[first:last]).view('datetime64[ns]'),
+                                 name='timestamp')
+
+        df = pd.DataFrame(values, index=index, columns=symbols)
+        df = df[df.notna().any(axis=1)]
+
+        return df.ffill() if fill else df
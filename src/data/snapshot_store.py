@@ -0,0 +1,280 @@
+"""
+市場スナップショットの列指向ストア
+
+全銘柄スキャンの結果を、SQLiteの1行ずつではなくParquetにスキャン単位で保存する。
+
+保存形式:
+    data/timeseries/snapshots/latest.parquet                       # 銘柄ごとの最新値
+    data/timeseries/snapshots/raw/2025-10-18/093000_123456.parquet  # 1スキャン = 1ファイル
+    data/timeseries/snapshots/compacted/2025-10-01.parquet          # 間引き済みの日次ファイル
+
+- ランキング・検索は最新値テーブル（メモリ上）だけを見るので銘柄数に比例する時間で済む
+- 履歴は日付ディレクトリ単位で必要な日だけ読む
+- compact() で古いスキャンを1時間ごと等に間引いて日次ファイルにまとめ、保持期間を過ぎたら削除
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+
+# スナップショットの列（順序もこの通りに保存）
+SNAPSHOT_COLUMNS = ['scan_time', 'symbol', 'price', 'change_24h', 'volume',
+                    'quote_volume', 'high_24h', 'low_24h']
+
+LATEST_FILENAME = 'latest.parquet'
+
+
+def _utcnow() -> datetime:
+    """現在時刻（UTC、タイムゾーンなし。SQLiteの CURRENT_TIMESTAMP と同じ基準）"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class SnapshotStore:
+    """市場スナップショットの列指向ストア"""
+
+    def __init__(self, data_dir: str = None):
+        """
+        Args:
+            data_dir: 保存先ディレクトリ（デフォルト: src/data/timeseries）
+        """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), 'timeseries')
+
+        self.base_dir = Path(data_dir) / 'snapshots'
+        self.raw_dir = self.base_dir / 'raw'
+        self.compacted_dir = self.base_dir / 'compacted'
+
+        for d in [self.base_dir, self.raw_dir, self.compacted_dir]:
+            d.mkdir(parents=True, exist_ok=True)
+
+        # 銘柄ごとの最新スナップショット（symbolをインデックスにしたDataFrame）
+        self.latest = self._load_latest()
+
+    # ========================================
+    # 最新値テーブル
+    # ========================================
+
+    def _load_latest(self) -> pd.DataFrame:
+        """最新値テーブルを読み込み"""
+        latest_path = self.base_dir / LATEST_FILENAME
+
+        if latest_path.exists():
+            try:
+                return pd.read_parquet(latest_path)
+            except Exception as e:
+                print(f"[WARNING] 最新値テーブルの読み込みに失敗: {e}")
+
+        # 空でも列の型を揃えておく（nlargest等がそのまま使えるように）
+        empty = {'scan_time': pd.Series(dtype='datetime64[ns]')}
+        empty.update({col: pd.Series(dtype='float64') for col in SNAPSHOT_COLUMNS[2:]})
+        return pd.DataFrame(empty, index=pd.Index([], name='symbol', dtype=str))
+
+    def _save_latest(self):
+        """最新値テーブルをAtomicに書き込み"""
+        latest_path = self.base_dir / LATEST_FILENAME
+        temp_path = self.base_dir / f"{LATEST_FILENAME}.tmp.{os.getpid()}"
+
+        self.latest.to_parquet(temp_path)
+        os.replace(temp_path, latest_path)
+
+    def get_latest(self, max_age_minutes: float = 60) -> pd.DataFrame:
+        """
+        銘柄ごとの最新スナップショットを取得
+
+        Args:
+            max_age_minutes: これより古いスナップショットは除外（Noneなら全件）
+
+        Returns:
+            symbolをインデックスにしたDataFrame
+        """
+        if max_age_minutes is None or self.latest.empty:
+            return self.latest
+
+        cutoff = _utcnow() - timedelta(minutes=max_age_minutes)
+        return self.latest[self.latest['scan_time'] >= cutoff]
+
+    def top_movers(self, limit: int = 20, max_age_minutes: float = 60) -> pd.DataFrame:
+        """24h変動率の上位"""
+        return self.get_latest(max_age_minutes).nlargest(limit, 'change_24h')
+
+    def top_volume(self, limit: int = 20, max_age_minutes: float = 60) -> pd.DataFrame:
+        """24h出来高（USDT）の上位"""
+        return self.get_latest(max_age_minutes).nlargest(limit, 'quote_volume')
+
+    def search(self, query: str, max_age_minutes: float = 60) -> pd.DataFrame:
+        """
+        銘柄を部分一致で検索（出来高順）
+
+        Args:
+            query: 検索文字列（大文字小文字は区別しない）
+        """
+        latest = self.get_latest(max_age_minutes)
+        matched = latest[latest.index.str.contains(query.upper(), regex=False)]
+        return matched.sort_values('quote_volume', ascending=False)
+
+    # ========================================
+    # 保存
+    # ========================================
+
+    def save_snapshot(self, rows: List[Dict], scan_time: datetime = None) -> int:
+        """
+        1スキャン分のスナップショットを保存
+
+        Args:
+            rows: [{'symbol', 'price', 'change_24h', 'volume', 'quote_volume', 'high_24h', 'low_24h'}, ...]
+            scan_time: スキャン時刻（UTC、省略時は現在時刻）
+
+        Returns:
+            保存件数
+        """
+        if not rows:
+            return 0
+
+        if scan_time is None:
+            scan_time = _utcnow()
+
+        df = pd.DataFrame(rows).reindex(columns=SNAPSHOT_COLUMNS)
+        df['scan_time'] = pd.Timestamp(scan_time)
+        df['symbol'] = df['symbol'].astype(str)
+        for col in SNAPSHOT_COLUMNS[2:]:
+            df[col] = df[col].astype('float64')
+
+        # 同じスキャン内の重複は後勝ち
+        df = df.drop_duplicates('symbol', keep='last')
+
+        # 1スキャン = 1ファイル（既存ファイルは書き換えない）
+        day_dir = self.raw_dir / scan_time.strftime('%Y-%m-%d')
+        day_dir.mkdir(exist_ok=True)
+        filepath = day_dir / f"{scan_time.strftime('%H%M%S_%f')}.parquet"
+        temp_path = day_dir / f"{filepath.name}.tmp"
+
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, filepath)
+
+        # 最新値テーブルを更新（今回のスキャンにない銘柄は前回の値を残し、
+        # 過去時刻のスキャンを後から保存した場合は新しい方を優先する）
+        scan = df.set_index('symbol')
+        if self.latest.empty:
+            self.latest = scan
+        else:
+            merged = pd.concat([self.latest, scan]).sort_values('scan_time', kind='stable')
+            self.latest = merged[~merged.index.duplicated(keep='last')]
+        self._save_latest()
+
+        return len(df)
+
+    # ========================================
+    # 履歴
+    # ========================================
+
+    def _day_files(self, day: str) -> List[Path]:
+        """指定日のファイル一覧（間引き済み + 未圧縮）"""
+        files = []
+
+        compacted = self.compacted_dir / f"{day}.parquet"
+        if compacted.exists():
+            files.append(compacted)
+
+        day_dir = self.raw_dir / day
+        if day_dir.exists():
+            files.extend(sorted(day_dir.glob('*.parquet')))
+
+        return files
+
+    def get_history(self, symbol: str = None, hours: float = 24) -> pd.DataFrame:
+        """
+        スナップショット履歴を取得
+
+        Args:
+            symbol: 銘柄シンボル（Noneなら全銘柄）
+            hours: 何時間前まで遡るか
+
+        Returns:
+            DataFrame（scan_time昇順）
+        """
+        end = _utcnow()
+        start = end - timedelta(hours=hours)
+
+        filters = [('scan_time', '>=', pd.Timestamp(start))]
+        if symbol is not None:
+            filters.append(('symbol', '==', symbol))
+
+        # 期間にかかる日のファイルだけを読む
+        frames = []
+        day = start.date()
+        while day <= end.date():
+            for filepath in self._day_files(day.isoformat()):
+                frames.append(pd.read_parquet(filepath, filters=filters))
+            day += timedelta(days=1)
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True).sort_values('scan_time', ignore_index=True)
+
+    # ========================================
+    # 圧縮・保持期間
+    # ========================================
+
+    def compact(self, raw_days: int = 7, interval: str = '1h', retention_days: int = 365) -> Dict:
+        """
+        古いスナップショットを間引いて日次ファイルにまとめる
+
+        Args:
+            raw_days: スキャン単位のまま残す日数
+            interval: 間引き間隔（銘柄ごとに、この間隔内の最後のスナップショットを残す）
+            retention_days: これより古い日次ファイルは削除
+
+        Returns:
+            {'compacted_days', 'rows_before', 'rows_after', 'deleted_days'}
+        """
+        today = _utcnow().date()
+        compact_before = (today - timedelta(days=raw_days)).isoformat()
+        delete_before = (today - timedelta(days=retention_days)).isoformat()
+
+        result = {'compacted_days': 0, 'rows_before': 0, 'rows_after': 0, 'deleted_days': 0}
+
+        for day_dir in sorted(p for p in self.raw_dir.iterdir() if p.is_dir()):
+            day = day_dir.name
+            if day >= compact_before:
+                continue
+
+            files = self._day_files(day)
+            if not files:
+                shutil.rmtree(day_dir, ignore_errors=True)
+                continue
+
+            df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+            # 銘柄×間隔ごとに最後のスナップショットだけを残す
+            df['_bucket'] = df['scan_time'].dt.floor(interval)
+            downsampled = (df.sort_values('scan_time')
+                             .drop_duplicates(['symbol', '_bucket'], keep='last')
+                             .drop(columns='_bucket')
+                             .reset_index(drop=True))
+
+            compacted_path = self.compacted_dir / f"{day}.parquet"
+            temp_path = self.compacted_dir / f"{day}.parquet.tmp"
+            downsampled.to_parquet(temp_path, index=False)
+            os.replace(temp_path, compacted_path)
+            shutil.rmtree(day_dir)
+
+            result['compacted_days'] += 1
+            result['rows_before'] += len(df)
+            result['rows_after'] += len(downsampled)
+
+        # 保持期間を過ぎた日次ファイルを削除
+        for compacted_path in self.compacted_dir.glob('*.parquet'):
+            if compacted_path.stem < delete_before:
+                compacted_path.unlink()
+                result['deleted_days'] += 1
+
+        return result
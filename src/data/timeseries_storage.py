@@ -13,6 +13,22 @@ import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import time
+import threading
+import pyarrow.parquet as pq
+
+from data.indicator_engine import IncrementalIndicators, INDICATOR_DIRNAME
+
+
+# パーティション化データセットのマニフェストファイル名
+MANIFEST_FILENAME = '_manifest.json'
+
+# ストレージ情報のキャッシュ（prices/直下のサイドカーインデックス）
+CATALOG_FILENAME = '_catalog.json'
+
+# パーティション内の行グループサイズ（1分足で約1週間分）
+# 期間指定の読み込みでは、この単位で範囲外のデータを読み飛ばす
+PARTITION_ROW_GROUP_SIZE = 10080
 
 
 class TimeSeriesStorage:
@@ -21,11 +37,19 @@ class TimeSeriesStorage:
 
     - Parquet形式: 圧縮効率が高く、カラム単位で高速読み込み
     - 銘柄ごとにファイル分割: 必要な銘柄だけ読み込み可能
+    - 月別パーティション + マニフェスト: 追記時に既存データを書き換えない
     - DatetimeIndex: 時間軸での操作が高速
     - 数値型最適化: float32で容量削減
     """
 
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, compact_threshold: int = 32,
+                 indicators: bool = True):
+        """
+        Args:
+            data_dir: 保存先ディレクトリ
+            compact_threshold: 同じ月のパーティションがこの数に達したらまとめ直す
+            indicators: 価格データの追記時にテクニカル指標も差分更新するか
+        """
         if data_dir is None:
             data_dir = os.path.join(os.path.dirname(__file__), 'timeseries')
 
@@ -40,68 +64,375 @@ class TimeSeriesStorage:
         for d in [self.price_dir, self.news_dir, self.stats_dir]:
             d.mkdir(exist_ok=True)
 
-    def save_price_data(self, symbol: str, interval: str, data: list):
+        self.compact_threshold = compact_threshold
+
+        # 追記時に差分更新するテクニカル指標（RSI / MACD / ボリンジャーバンド / 移動平均）
+        self.indicator_engine = IncrementalIndicators() if indicators else None
+
+        # 書き込み統計（このインスタンスで書いたファイル数・行数・バイト数、まとめ直し分を含む）
+        # 銘柄ごとの並列書き込みに備えてロックで保護し、データセット別にも集計する
+        self.write_stats = {'files': 0, 'rows': 0, 'bytes': 0}
+        self.dataset_write_stats = {}
+        self._stats_lock = threading.Lock()
+
+    # ========================================
+    # パーティション管理
+    # ========================================
+
+    def _dataset_dir(self, symbol: str, interval: str) -> Path:
+        """パーティション化データセットのディレクトリ（prices/BTC_1m/）"""
+        return self.price_dir / f"{symbol}_{interval}"
+
+    def _legacy_path(self, symbol: str, interval: str) -> Path:
+        """旧形式の単一ファイル（prices/BTC_1m.parquet）"""
+        return self.price_dir / f"{symbol}_{interval}.parquet"
+
+    @staticmethod
+    def _read_footer_range(filepath: Path):
         """
-        価格データをParquet形式で保存（高速化版）
+        Parquetフッターから行数と期間を取得（データ本体は読まない）
 
-        Args:
-            symbol: 銘柄シンボル
-            interval: 時間足（1h, 4h, 1d など）
-            data: 価格データリスト [{'timestamp': ..., 'open': ..., }, ...]
+        Returns:
+            (行数, 開始時刻, 終了時刻) のタプル
+        """
+        metadata = pq.read_metadata(filepath)
+        schema = metadata.schema.to_arrow_schema()
+        column = schema.get_field_index('timestamp')
+
+        start, end = None, None
+        if column >= 0:
+            for i in range(metadata.num_row_groups):
+                stats = metadata.row_group(i).column(column).statistics
+                if stats is None or not stats.has_min_max:
+                    start, end = None, None
+                    break
+                rg_min, rg_max = pd.Timestamp(stats.min), pd.Timestamp(stats.max)
+                start = rg_min if start is None else min(start, rg_min)
+                end = rg_max if end is None else max(end, rg_max)
+
+        if metadata.num_rows > 0 and (start is None or end is None):
+            # 統計情報がないファイルはインデックス列だけ読む
+            index = pd.read_parquet(filepath, columns=[]).index
+            start, end = index.min(), index.max()
+
+        return metadata.num_rows, start, end
+
+    @staticmethod
+    def _part_entry(filepath: Path, rows: int, start, end, month: str = None) -> dict:
+        """マニフェストに記録するパーティション情報"""
+        return {
+            'file': filepath.name,
+            'month': month,
+            'rows': int(rows),
+            'start': start.isoformat() if start is not None else None,
+            'end': end.isoformat() if end is not None else None,
+            'bytes': filepath.stat().st_size,
+        }
 
-        保存形式:
-            data/timeseries/prices/BTC_1h.parquet
-            data/timeseries/prices/BTC_1d.parquet
+    def _rebuild_manifest(self, dataset_dir: Path) -> dict:
         """
-        if not data:
-            return
+        パーティションファイルのフッターからマニフェストを再構築
+
+        マニフェストが壊れた・消えた場合の復旧用
+        """
+        manifest = {'version': 1, 'rows': 0, 'last_timestamp': None, 'next_seq': 0, 'parts': []}
+
+        for filepath in sorted(dataset_dir.glob('*.parquet')):
+            # ファイル名: 2025-10.000012.parquet / legacy.000000.parquet
+            prefix, _, seq = filepath.stem.partition('.')
+            try:
+                rows, start, end = self._read_footer_range(filepath)
+            except Exception:
+                print(f"[WARNING] Unreadable partition skipped: {dataset_dir.name}/{filepath.name}")
+                continue
+
+            month = prefix if prefix != 'legacy' else None
+            manifest['parts'].append(self._part_entry(filepath, rows, start, end, month))
+            if seq.isdigit():
+                manifest['next_seq'] = max(manifest['next_seq'], int(seq) + 1)
+
+        self._refresh_manifest_totals(manifest)
+        return manifest
+
+    @staticmethod
+    def _refresh_manifest_totals(manifest: dict):
+        """マニフェストの総行数・最終タイムスタンプを更新"""
+        manifest['parts'].sort(key=lambda p: p['start'] or '')
+        manifest['rows'] = sum(p['rows'] for p in manifest['parts'])
+        ends = [p['end'] for p in manifest['parts'] if p['end']]
+        manifest['last_timestamp'] = max(ends) if ends else None
+
+    def _load_manifest(self, dataset_dir: Path) -> dict:
+        """マニフェストを読み込み（なければフッターから再構築）"""
+        manifest_path = dataset_dir / MANIFEST_FILENAME
+
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                print(f"[WARNING] Corrupted manifest detected, rebuilding: {dataset_dir.name}")
+
+        return self._rebuild_manifest(dataset_dir)
+
+    def _save_manifest(self, dataset_dir: Path, manifest: dict):
+        """マニフェストをAtomicに書き込み（一時ファイル → rename）"""
+        manifest_path = dataset_dir / MANIFEST_FILENAME
+        temp_path = dataset_dir / f"{MANIFEST_FILENAME}.tmp.{os.getpid()}"
 
-        # Parquetで保存（圧縮あり）
-        filename = f"{symbol}_{interval}.parquet"
-        filepath = self.price_dir / filename
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        os.replace(temp_path, manifest_path)
+
+    def _open_dataset(self, symbol: str, interval: str):
+        """
+        書き込み用にデータセットを開く
+
+        旧形式の単一ファイルがあれば、書き換えずにパーティションの1つとして取り込む
+
+        Returns:
+            (データセットディレクトリ, マニフェスト) のタプル
+        """
+        dataset_dir = self._dataset_dir(symbol, interval)
+        dataset_dir.mkdir(exist_ok=True)
+        manifest = self._load_manifest(dataset_dir)
 
-        # 既存データがあれば最終タイムスタンプを取得
-        last_timestamp = None
-        existing_df = None
-        if filepath.exists():
+        legacy_path = self._legacy_path(symbol, interval)
+        if legacy_path.exists():
             try:
-                existing_df = pd.read_parquet(filepath)
-                if not existing_df.empty:
-                    last_timestamp = existing_df.index[-1]
-            except Exception as e:
-                # 破損ファイルを検出（削除は後で）
-                print(f"[WARNING] Corrupted file detected, will recreate: {filename}")
-                existing_df = None
-                # ファイルを新規作成モードにするため、filepathを一時的にリネーム
-                import time
-                backup_path = filepath.with_suffix(f'.corrupted.{int(time.time())}')
+                rows, start, end = self._read_footer_range(legacy_path)
+            except Exception:
+                # 破損ファイルは退避して新規作成
+                print(f"[WARNING] Corrupted file detected, will recreate: {legacy_path.name}")
+                backup_path = legacy_path.with_suffix(f'.corrupted.{int(time.time())}')
                 try:
-                    filepath.rename(backup_path)
-                except:
+                    legacy_path.rename(backup_path)
+                except OSError:
                     pass  # リネーム失敗してもOK（新規データで上書きする）
+            else:
+                seq = manifest['next_seq']
+                manifest['next_seq'] += 1
+                migrated_path = dataset_dir / f"legacy.{seq:06d}.parquet"
+                os.replace(legacy_path, migrated_path)
+                manifest['parts'].append(self._part_entry(migrated_path, rows, start, end))
+                self._refresh_manifest_totals(manifest)
+                self._save_manifest(dataset_dir, manifest)
+                print(f"[OK] 移行: {legacy_path.name} → {dataset_dir.name}/ ({rows}行)")
+
+        return dataset_dir, manifest
+
+    def _write_part(self, dataset_dir: Path, manifest: dict, month: str,
+                    df: pd.DataFrame) -> dict:
+        """
+        1パーティション分のParquetファイルを書き込み、マニフェストに追加
+
+        Returns:
+            追加したパーティション情報
+        """
+        seq = manifest['next_seq']
+        manifest['next_seq'] += 1
 
-        # DataFrameに変換
-        df = pd.DataFrame(data)
+        filepath = dataset_dir / f"{month}.{seq:06d}.parquet"
+        temp_filepath = dataset_dir / f"{filepath.name}.tmp"
 
-        # タイムスタンプをdatetimeに変換（ミリ秒対応）
-        if 'timestamp' in df.columns:
-            if df['timestamp'].dtype == 'int64':
-                # ミリ秒なら秒に変換
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        try:
+            df.to_parquet(temp_filepath, compression=None,
+                          row_group_size=PARTITION_ROW_GROUP_SIZE)
+
+            # 書き込み成功を検証（フッターの行数のみ確認）
+            written_rows = pq.read_metadata(temp_filepath).num_rows
+            if written_rows != len(df):
+                raise ValueError(f"Verification failed: expected {len(df)} rows, got {written_rows}")
+
+            os.replace(temp_filepath, filepath)
+        except Exception:
+            if temp_filepath.exists():
+                temp_filepath.unlink()
+            raise
+
+        entry = self._part_entry(filepath, len(df), df.index.min(), df.index.max(), month)
+        manifest['parts'].append(entry)
+
+        self._record_write(dataset_dir.name, files=1, bytes=entry['bytes'])
+        return entry
+
+    def _record_write(self, dataset_name: str, files: int = 0, rows: int = 0, bytes: int = 0):
+        """書き込み統計を加算（全体とデータセット別）"""
+        with self._stats_lock:
+            dataset_stats = self.dataset_write_stats.setdefault(
+                dataset_name, {'files': 0, 'rows': 0, 'bytes': 0})
+            for stats in (self.write_stats, dataset_stats):
+                stats['files'] += files
+                stats['rows'] += rows
+                stats['bytes'] += bytes
+
+    def get_write_stats(self, symbol: str = None, interval: str = None) -> dict:
+        """
+        書き込み統計を取得
+
+        Args:
+            symbol: 銘柄シンボル（省略時は全体）
+            interval: 時間足
+
+        Returns:
+            {'files': ..., 'rows': ..., 'bytes': ...}
+        """
+        with self._stats_lock:
+            if symbol is None:
+                return dict(self.write_stats)
+            name = self._dataset_dir(symbol, interval).name
+            return dict(self.dataset_write_stats.get(name, {'files': 0, 'rows': 0, 'bytes': 0}))
+
+    def _compact_month(self, dataset_dir: Path, manifest: dict, month: str):
+        """
+        小さなパーティションが溜まった月を1ファイルにまとめる
+
+        書き換えるのはその月の分だけなので、コストは月のデータ量で頭打ちになる
+        """
+        parts = [p for p in manifest['parts'] if p.get('month') == month]
+        if len(parts) < self.compact_threshold:
+            return
+
+        df = pd.concat([pd.read_parquet(dataset_dir / p['file']) for p in parts])
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+
+        old_files = {p['file'] for p in parts}
+        self._write_part(dataset_dir, manifest, month, df)
+        manifest['parts'] = [p for p in manifest['parts'] if p['file'] not in old_files]
+        self._refresh_manifest_totals(manifest)
+        self._save_manifest(dataset_dir, manifest)
+
+        # マニフェスト更新後に旧ファイルを削除（途中で落ちても読み込みには影響しない）
+        for name in old_files:
+            try:
+                (dataset_dir / name).unlink()
+            except OSError:
+                pass
+
+    def _price_sources(self, symbol: str, interval: str) -> list:
+        """
+        読み込み対象のParquetファイル一覧
+
+        Returns:
+            [(パス, 開始時刻ISO, 終了時刻ISO), ...]（開始時刻順）
+        """
+        sources = []
+
+        dataset_dir = self._dataset_dir(symbol, interval)
+        if dataset_dir.is_dir():
+            manifest = self._load_manifest(dataset_dir)
+            for part in manifest['parts']:
+                sources.append((dataset_dir / part['file'], part['start'], part['end']))
+
+        legacy_path = self._legacy_path(symbol, interval)
+        if legacy_path.exists():
+            sources.append((legacy_path, None, None))
+
+        return sources
+
+    def list_price_datasets(self) -> list:
+        """
+        保存されている銘柄・時間足の一覧
+
+        Returns:
+            [(symbol, interval), ...]
+        """
+        names = set()
+        for path in self.price_dir.iterdir():
+            if path.is_dir():
+                name = path.name
+            elif path.suffix == '.parquet' and '.' not in path.stem:
+                name = path.stem
             else:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                continue
+
+            symbol, sep, interval = name.partition('_')
+            if sep and '_' not in interval:
+                names.add((symbol, interval))
+
+        return sorted(names)
+
+    def get_last_timestamp(self, symbol: str, interval: str):
+        """
+        最終タイムスタンプを取得（データ本体は読まない）
+
+        Returns:
+            pd.Timestamp、データがなければNone
+        """
+        dataset_dir = self._dataset_dir(symbol, interval)
+        legacy_path = self._legacy_path(symbol, interval)
+        candidates = []
+
+        if dataset_dir.is_dir():
+            last_timestamp = self._load_manifest(dataset_dir).get('last_timestamp')
+            if last_timestamp:
+                candidates.append(pd.Timestamp(last_timestamp))
+
+        if legacy_path.exists():
+            _, _, end = self._read_footer_range(legacy_path)
+            if end is not None:
+                candidates.append(end)
+
+        return max(candidates) if candidates else None
+
+    # ========================================
+    # 価格データの保存・読み込み
+    # ========================================
+
+    def save_price_data(self, symbol: str, interval: str, data):
+        """
+        価格データをParquet形式で保存（追記専用パーティション）
 
-            # DatetimeIndexに設定
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
+        Args:
+            symbol: 銘柄シンボル
+            interval: 時間足（1h, 4h, 1d など）
+            data: 価格データリスト [{'timestamp': ..., 'open': ..., }, ...]
+                  または timestamp列を持つDataFrame
+
+        保存形式:
+            data/timeseries/prices/BTC_1m/_manifest.json
+            data/timeseries/prices/BTC_1m/2025-10.000000.parquet
+            data/timeseries/prices/BTC_1m/2025-10.000001.parquet
+
+        既存データは読み直さず、新規行だけを月別パーティションとして追記する。
+        同じ月のファイルが compact_threshold 個に達したら、その月だけをまとめ直す。
+        """
+        if isinstance(data, pd.DataFrame):
+            if data.empty:
+                return
+            df = data.copy()
+        else:
+            if not data:
+                return
+            # DataFrameに変換
+            df = pd.DataFrame(data)
+
+        if 'timestamp' not in df.columns:
+            raise ValueError("timestamp列が必要です")
+
+        # タイムスタンプをdatetimeに変換（ミリ秒対応）
+        if df['timestamp'].dtype == 'int64':
+            # ミリ秒なら秒に変換
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        else:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+        # DatetimeIndexに設定
+        df.set_index('timestamp', inplace=True)
+        df.sort_index(inplace=True)
+
+        dataset_dir, manifest = self._open_dataset(symbol, interval)
 
         # 新規データのみをフィルタ（既存データと重複を除外）
+        last_timestamp = manifest.get('last_timestamp')
+        previous_rows = manifest.get('rows', 0)
         if last_timestamp is not None:
-            df = df[df.index > last_timestamp]
+            df = df[df.index > pd.Timestamp(last_timestamp)]
 
             # 新規データがなければスキップ
             if df.empty:
-                return filepath
+                return dataset_dir
 
         # 数値型を最適化（float64 → float32で容量半分）
         for col in ['open', 'high', 'low', 'close', 'volume', 'quote_volume']:
@@ -111,96 +442,323 @@ class TimeSeriesStorage:
         # 重複を削除
         df = df[~df.index.duplicated(keep='last')]
 
-        # 既存データと結合
-        if existing_df is not None:
-            df = pd.concat([existing_df, df])
-            df.sort_index(inplace=True)
-            # existing_dfを明示的に削除（メモリ解放）
-            del existing_df
-            import gc
-            gc.collect()
-
-        # Atomic write: 一時ファイルに書き込み → 成功したらrename
-        import time
-        import gc
-        temp_filename = f"{symbol}_{interval}.tmp.{int(time.time() * 1000)}.parquet"
-        temp_filepath = self.price_dir / temp_filename
-
+        written_bytes = 0
+        months = []
         try:
-            # 一時ファイルに書き込み（compression無効化でテスト）
-            df.to_parquet(temp_filepath, compression=None)
-
-            # 書き込み成功を検証（読み込みテスト）
-            test_df = pd.read_parquet(temp_filepath)
-            if len(test_df) != len(df):
-                raise ValueError(f"Verification failed: expected {len(df)} rows, got {len(test_df)}")
-
-            # 検証用DataFrameを明示的に削除（ファイルハンドル解放）
-            del test_df
-            gc.collect()
-
-            # 検証成功 → 本ファイルにrename（atomic操作）
-            # Windowsでは既存ファイルがある場合は先に削除（retry付き）
-            if filepath.exists():
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        filepath.unlink()
-                        break
-                    except PermissionError:
-                        if attempt < max_retries - 1:
-                            time.sleep(0.1)  # 100ms待機
-                            gc.collect()  # 強制GC
-                        else:
-                            raise
-
-            temp_filepath.rename(filepath)
-
-            file_size = filepath.stat().st_size / 1024  # KB
-            print(f"[OK] 保存: {filename} ({len(df)}行, {file_size:.1f}KB)")
+            for month, chunk in df.groupby(df.index.strftime('%Y-%m'), sort=True):
+                entry = self._write_part(dataset_dir, manifest, month, chunk)
+                written_bytes += entry['bytes']
+                months.append(month)
+
+            self._refresh_manifest_totals(manifest)
+            self._save_manifest(dataset_dir, manifest)
+
+            for month in months:
+                self._compact_month(dataset_dir, manifest, month)
 
         except Exception as e:
-            # エラー時は一時ファイルを削除
-            if temp_filepath.exists():
-                temp_filepath.unlink()
-            raise RuntimeError(f"Failed to save {filename}: {e}")
+            raise RuntimeError(f"Failed to save {dataset_dir.name}: {e}")
+
+        self._record_write(dataset_dir.name, rows=len(df))
+
+        # テクニカル指標を新しい行の分だけ更新（失敗しても価格データの保存は有効）
+        if self.indicator_engine is not None:
+            try:
+                self._update_indicators(symbol, interval, dataset_dir, df,
+                                        last_timestamp, previous_rows)
+            except Exception as e:
+                print(f"[WARNING] 指標の更新に失敗: {dataset_dir.name}: {e}")
 
-        return filepath
+        print(f"[OK] 保存: {dataset_dir.name} (+{len(df)}行, 計{manifest['rows']}行, {written_bytes / 1024:.1f}KB)")
+
+        return dataset_dir
+
+    # ========================================
+    # テクニカル指標（差分更新・事前計算）
+    # ========================================
+
+    def _write_indicator_frames(self, indicator_dir: Path, manifest: dict, indicators: pd.DataFrame):
+        """指標を月別パーティションとして追記"""
+        months = []
+        for month, chunk in indicators.groupby(indicators.index.strftime('%Y-%m'), sort=True):
+            self._write_part(indicator_dir, manifest, month, chunk)
+            months.append(month)
+
+        self._refresh_manifest_totals(manifest)
+        self._save_manifest(indicator_dir, manifest)
+
+        for month in months:
+            self._compact_month(indicator_dir, manifest, month)
+
+    def rebuild_indicators(self, symbol: str, interval: str):
+        """
+        テクニカル指標を全期間で計算し直す
+
+        状態ファイルがない・価格データと食い違う・パラメータが変わった場合に使う
+        """
+        dataset_dir = self._dataset_dir(symbol, interval)
+        indicator_dir = dataset_dir / INDICATOR_DIRNAME
+        indicator_dir.mkdir(parents=True, exist_ok=True)
+
+        # 既存の指標パーティションは新しいマニフェストを書いた後に削除
+        old_files = [p.name for p in indicator_dir.glob('*.parquet')]
+        manifest = {'version': 1, 'rows': 0, 'last_timestamp': None, 'next_seq': 0, 'parts': []}
+        if old_files:
+            manifest['next_seq'] = self._load_manifest(indicator_dir)['next_seq']
+
+        close = self.load_price_data(symbol, interval, columns=['close'])['close']
+        if close.empty:
+            return
+
+        indicators, state = self.indicator_engine.compute(close)
+        self._write_indicator_frames(indicator_dir, manifest, indicators)
+        self.indicator_engine.save_state(indicator_dir, state)
+
+        for name in old_files:
+            try:
+                (indicator_dir / name).unlink()
+            except OSError:
+                pass
+
+        print(f"[OK] 指標再計算: {dataset_dir.name} ({len(indicators)}行)")
+
+    def _update_indicators(self, symbol: str, interval: str, dataset_dir: Path,
+                           new_rows: pd.DataFrame, previous_last_timestamp, previous_rows: int):
+        """
+        追記した行の分だけテクニカル指標を進める
+
+        状態の最終時刻が追記前の価格データの最終時刻と一致するときだけ差分で計算し、
+        一致しなければ（初回・中断後など）全期間で計算し直す
+        """
+        indicator_dir = dataset_dir / INDICATOR_DIRNAME
+        state = self.indicator_engine.load_state(indicator_dir)
+
+        if previous_rows == 0 and state is None:
+            # 新規データセット: 追記分 = 全期間
+            indicator_dir.mkdir(exist_ok=True)
+            manifest = self._load_manifest(indicator_dir)
+            indicators, state = self.indicator_engine.compute(new_rows['close'])
+        elif state is not None and previous_last_timestamp is not None \
+                and pd.Timestamp(state['last_timestamp']) == pd.Timestamp(previous_last_timestamp):
+            manifest = self._load_manifest(indicator_dir)
+            indicators, state = self.indicator_engine.compute(new_rows['close'], state)
+        else:
+            self.rebuild_indicators(symbol, interval)
+            return
+
+        self._write_indicator_frames(indicator_dir, manifest, indicators)
+
+        # 状態はパーティションの後に書く（途中で落ちたら次回は全期間を再計算）
+        self.indicator_engine.save_state(indicator_dir, state)
+
+    def load_indicators(self, symbol: str, interval: str,
+                        start_date: str = None, end_date: str = None,
+                        columns: list = None) -> pd.DataFrame:
+        """
+        事前計算済みのテクニカル指標を読み込み
+
+        Args:
+            symbol: 銘柄シンボル
+            interval: 時間足
+            start_date: 開始日
+            end_date: 終了日
+            columns: 読み込む列（例: ['RSI', 'MACD']）。Noneなら全列
+
+        Returns:
+            pandas DataFrame（DatetimeIndex付き、RSI / MACD / BB_* / SMA_* / EMA_* 列）
+            指標がまだなければ空のDataFrame
+        """
+        indicator_dir = self._dataset_dir(symbol, interval) / INDICATOR_DIRNAME
+        if not (indicator_dir / MANIFEST_FILENAME).exists():
+            return pd.DataFrame()
+
+        manifest = self._load_manifest(indicator_dir)
+        sources = [(indicator_dir / p['file'], p['start'], p['end']) for p in manifest['parts']]
+        if not sources:
+            return pd.DataFrame()
+
+        return self._read_sources(sources, start_date, end_date, columns)
+
+    def _read_sources(self, sources: list, start_date=None, end_date=None,
+                      columns: list = None) -> pd.DataFrame:
+        """
+        パーティション一覧から期間・列を絞って読み込み
+
+        Args:
+            sources: [(パス, 開始時刻ISO, 終了時刻ISO), ...]
+        """
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+
+        # パーティション単位の枝刈り（期間が重ならないファイルは開かない）
+        selected = [
+            path for path, part_start, part_end in sources
+            if not (start is not None and part_end and pd.Timestamp(part_end) < start)
+            and not (end is not None and part_start and pd.Timestamp(part_start) > end)
+        ]
+
+        # 行グループ単位の枝刈り（Parquetの統計情報を使う）
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', start))
+        if end is not None:
+            filters.append(('timestamp', '<=', end))
+
+        if not selected:
+            # 空でも列構成を揃えて返す
+            selected = [sources[-1][0]]
+
+        frames = [
+            pd.read_parquet(path, columns=columns, filters=filters or None)
+            for path in selected
+        ]
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+
+        if len(frames) > 1:
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+
+        # 日付範囲でフィルタ（統計のない旧ファイル向けの保険）
+        if start is not None:
+            df = df[df.index >= start]
+        if end is not None:
+            df = df[df.index <= end]
+
+        return df
 
     def load_price_data(self, symbol: str, interval: str,
-                       start_date: str = None, end_date: str = None) -> pd.DataFrame:
+                       start_date: str = None, end_date: str = None,
+                       columns: list = None) -> pd.DataFrame:
         """
-        価格データを読み込み
+        価格データを読み込み（パーティションを結合して返す）
+
+        期間指定時はマニフェストの期間で対象外のパーティションを開かず、
+        残りのファイルもtimestamp列の行グループ統計で範囲外の行グループを読み飛ばす。
 
         Args:
             symbol: 銘柄シンボル
             interval: 時間足
             start_date: 開始日（例: '2025-10-01'）
             end_date: 終了日
+            columns: 読み込む列（例: ['close']）。Noneなら全列
 
         Returns:
             pandas DataFrame（DatetimeIndex付き）
         """
-        filename = f"{symbol}_{interval}.parquet"
-        filepath = self.price_dir / filename
+        sources = self._price_sources(symbol, interval)
 
-        if not filepath.exists():
-            print(f"[ERROR] ファイルなし: {filename}")
+        if not sources:
+            print(f"[ERROR] ファイルなし: {symbol}_{interval}")
             return pd.DataFrame()
 
-        df = pd.read_parquet(filepath)
+        return self._read_sources(sources, start_date, end_date, columns)
 
-        # 日付範囲でフィルタ
-        if start_date:
-            df = df[df.index >= start_date]
-        if end_date:
-            df = df[df.index <= end_date]
+    # ========================================
+    # カタログ（メタデータのみのストレージ情報）
+    # ========================================
 
-        return df
+    def _load_catalog(self) -> dict:
+        """カタログ（サイドカーインデックス）を読み込み"""
+        catalog_path = self.price_dir / CATALOG_FILENAME
+
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+            if catalog.get('version') == 1:
+                return catalog
+        except (OSError, ValueError):
+            pass
+
+        return {'version': 1, 'entries': {}}
+
+    def _save_catalog(self, catalog: dict):
+        """カタログをAtomicに書き込み"""
+        catalog_path = self.price_dir / CATALOG_FILENAME
+        temp_path = self.price_dir / f"{CATALOG_FILENAME}.tmp.{os.getpid()}"
+
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(catalog, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, catalog_path)
+        except OSError as e:
+            # キャッシュなので書けなくても致命的ではない
+            print(f"[WARNING] Failed to write catalog: {e}")
+
+    def _catalog_signature(self, symbol: str, interval: str) -> list:
+        """
+        カタログの有効性判定用シグネチャ
+
+        マニフェストと旧形式ファイルの (ファイル名, mtime, サイズ)。
+        どちらかが書き換わればシグネチャが変わり、エントリを作り直す
+        """
+        signature = []
+        for path in [self._dataset_dir(symbol, interval) / MANIFEST_FILENAME,
+                     self._legacy_path(symbol, interval)]:
+            if path.exists():
+                stat = path.stat()
+                signature.append([path.name, stat.st_mtime_ns, stat.st_size])
+        return signature
+
+    def get_dataset_state(self, symbol: str, interval: str) -> dict:
+        """
+        データセットの変更検知用の状態（データ本体は読まない）
+
+        Returns:
+            {'signature', 'rows', 'end'}
+            signature はマニフェスト・旧形式ファイルの (ファイル名, mtime, サイズ)
+        """
+        described = self._describe_dataset(symbol, interval)
+        return {
+            'signature': self._catalog_signature(symbol, interval),
+            'rows': described['rows'],
+            'end': described['end'],
+        }
+
+    def _describe_dataset(self, symbol: str, interval: str) -> dict:
+        """
+        マニフェストとParquetフッターだけからデータセットの概要を作る
+
+        Returns:
+            {'file', 'rows', 'bytes', 'start', 'end'}
+        """
+        dataset_dir = self._dataset_dir(symbol, interval)
+        legacy_path = self._legacy_path(symbol, interval)
+
+        rows, size, starts, ends = 0, 0, [], []
+
+        if dataset_dir.is_dir():
+            manifest_exists = (dataset_dir / MANIFEST_FILENAME).exists()
+            manifest = self._load_manifest(dataset_dir)
+            if not manifest_exists:
+                # 再構築したマニフェストを保存してシグネチャを安定させる
+                self._save_manifest(dataset_dir, manifest)
+
+            rows += manifest['rows']
+            size += sum(p['bytes'] for p in manifest['parts'])
+            starts += [pd.Timestamp(p['start']) for p in manifest['parts'] if p['start']]
+            ends += [pd.Timestamp(p['end']) for p in manifest['parts'] if p['end']]
+
+        if legacy_path.exists():
+            legacy_rows, start, end = self._read_footer_range(legacy_path)
+            rows += legacy_rows
+            size += legacy_path.stat().st_size
+            starts += [start] if start is not None else []
+            ends += [end] if end is not None else []
+
+        return {
+            'file': dataset_dir.name if dataset_dir.is_dir() else legacy_path.name,
+            'rows': rows,
+            'bytes': size,
+            'start': min(starts).isoformat() if starts else None,
+            'end': max(ends).isoformat() if ends else None,
+        }
 
     def get_storage_info(self):
         """
-        ストレージ情報を取得
+        ストレージ情報を取得（メタデータのみ）
+
+        データ本体は読まず、マニフェストとParquetフッターから行数・期間を集計する。
+        結果は prices/_catalog.json にキャッシュし、mtimeとサイズが変わった
+        データセットだけを再集計する。
 
         Returns:
             各銘柄・時間足のファイルサイズと行数
@@ -211,20 +769,50 @@ class TimeSeriesStorage:
             'total_rows': 0
         }
 
-        for filepath in self.price_dir.glob('*.parquet'):
-            df = pd.read_parquet(filepath)
-            size_kb = filepath.stat().st_size / 1024
+        catalog = self._load_catalog()
+        entries = catalog['entries']
+        changed = False
+        seen = set()
+
+        for symbol, interval in self.list_price_datasets():
+            key = f"{symbol}_{interval}"
+            signature = self._catalog_signature(symbol, interval)
+            entry = entries.get(key)
+
+            if entry is None or entry.get('signature') != signature:
+                try:
+                    entry = self._describe_dataset(symbol, interval)
+                except Exception as e:
+                    print(f"[WARNING] Failed to read metadata: {key} ({e})")
+                    continue
+                # マニフェスト再構築でシグネチャが変わることがあるので取り直す
+                entry['signature'] = self._catalog_signature(symbol, interval)
+                entries[key] = entry
+                changed = True
+
+            seen.add(key)
+            size_kb = entry['bytes'] / 1024
 
             info['prices'].append({
-                'file': filepath.name,
-                'rows': len(df),
+                'file': entry['file'],
+                'symbol': symbol,
+                'interval': interval,
+                'rows': entry['rows'],
                 'size_kb': round(size_kb, 1),
-                'start_date': str(df.index.min()),
-                'end_date': str(df.index.max())
+                'start_date': str(pd.Timestamp(entry['start'])) if entry['start'] else 'NaT',
+                'end_date': str(pd.Timestamp(entry['end'])) if entry['end'] else 'NaT'
             })
 
             info['total_size_kb'] += size_kb
-            info['total_rows'] += len(df)
+            info['total_rows'] += entry['rows']
+
+        # 消えたデータセットをカタログから削除
+        for key in set(entries) - seen:
+            del entries[key]
+            changed = True
+
+        if changed:
+            self._save_catalog(catalog)
 
         return info
 
@@ -0,0 +1,47 @@
+"""
+重いライブラリの遅延import
+
+cron から何度も起動するCLIで、--help や軽い処理のときに
+pandas / requests などの読み込み時間を払わないようにする。
+
+使い方:
+    from src.lazy_import import lazy_import
+    pd = lazy_import('pandas')      # この時点では読み込まない
+
+    df = pd.DataFrame(rows)         # 初めて属性にアクセスしたときに読み込む
+
+起動時間の予算は src/tools/startup_benchmark.py で確認する。
+"""
+
+import sys
+import importlib.util
+
+
+def lazy_import(name: str):
+    """
+    モジュールを遅延import
+
+    すでに読み込み済みならそのモジュールを返す。
+    未読み込みなら、最初の属性アクセスまで実行を遅らせたモジュールを返す
+    （sys.modules に登録されるので、後から普通に import しても同じオブジェクトになる）。
+
+    Args:
+        name: モジュール名（例: 'pandas', 'requests'）
+
+    Raises:
+        ModuleNotFoundError: モジュールが見つからない場合（ここで即座に検出する）
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
@@ -7,7 +7,8 @@
 import sys
 import os
 import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+if (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.tools.market_scanner import MarketScanner
@@ -19,13 +20,16 @@ from datetime import datetime
 class AutoMarketUpdater:
     """自動市場データ更新"""
 
-    def __init__(self, interval_minutes: int = 60, min_volume: float = 10000):
+    def __init__(self, interval_minutes: int = 60, min_volume: float = 10000,
+                 synchronous: str = 'NORMAL', save_to_sqlite: bool = False):
         """
         Parameters:
         - interval_minutes: 更新間隔（分）
         - min_volume: 最低出来高（USDT）
+        - synchronous: SQLiteのfsync設定（OFF / NORMAL / FULL / EXTRA、save_to_sqlite=True の時に有効）
+        - save_to_sqlite: スナップショットストアに加えて price_snapshots テーブルにも一括保存するか
         """
-        self.scanner = MarketScanner()
+        self.scanner = MarketScanner(synchronous=synchronous, save_to_sqlite=save_to_sqlite)
         self.interval_minutes = interval_minutes
         self.min_volume = min_volume
         self.run_count = 0
@@ -38,9 +42,17 @@ class AutoMarketUpdater:
         print(f"🔄 自動更新 #{self.run_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*80)
 
-        self.scanner.scan_all_markets(min_volume=self.min_volume)
+        # 全銘柄をスナップショットストアに1ファイルで保存（--sqlite 指定時は price_snapshots にも1トランザクションで）
+        result = self.scanner.scan_all_markets(min_volume=self.min_volume)
 
-        print(f"✅ 更新完了 - 次回: {self.interval_minutes}分後")
+        if result is None:
+            print(f"⚠️  更新失敗 - 次回: {self.interval_minutes}分後")
+            return
+
+        timing = f"スナップショット保存 {result['store_ms']:.0f}ms"
+        if result['sqlite_ms'] is not None:
+            timing += f", SQLite保存 {result['sqlite_ms']:.0f}ms"
+        print(f"✅ 更新完了（{result['saved']}銘柄, {timing}） - 次回: {self.interval_minutes}分後")
 
     def run_continuous(self):
         """定期的にスキャンを実行"""
@@ -87,6 +99,9 @@ def main():
   # 10分ごと、出来高5万以上
   python tools/auto_market_updater.py --continuous --interval 10 --min-volume 50000
 
+  # price_snapshots テーブルにも保存（fsyncは OFF）
+  python tools/auto_market_updater.py --continuous --sqlite --synchronous OFF
+
 推奨設定:
   - 開発中: --interval 10（10分ごと）
   - 通常運用: --interval 60（1時間ごと）
@@ -98,12 +113,18 @@ def main():
     parser.add_argument('--continuous', action='store_true', help='定期的に実行')
     parser.add_argument('--interval', type=int, default=60, help='更新間隔（分）')
     parser.add_argument('--min-volume', type=float, default=10000, help='最低出来高（USDT）')
+    parser.add_argument('--synchronous', type=str, default='NORMAL',
+                        choices=['OFF', 'NORMAL', 'FULL', 'EXTRA'], help='SQLiteのfsync設定（--sqlite 指定時）')
+    parser.add_argument('--sqlite', action='store_true',
+                        help='スナップショットをSQLite（price_snapshots）にも一括保存')
 
     args = parser.parse_args()
 
     updater = AutoMarketUpdater(
         interval_minutes=args.interval,
-        min_volume=args.min_volume
+        min_volume=args.min_volume,
+        synchronous=args.synchronous,
+        save_to_sqlite=args.sqlite
     )
 
     if args.once:
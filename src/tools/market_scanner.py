@@ -1,17 +1,17 @@
 """
 全銘柄市場スキャナー
 
-全銘柄の価格を一括取得してDBに保存
+全銘柄の価格を一括取得してスナップショットストア（Parquet）に保存
 """
 
 import sys
 import os
 import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+# 他のスクリプトから読み込まれたとき、すでに差し替え済みの stdout を二重に包まない
+if (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.config.exchange_api import MEXCAPI
-from src.data.advanced_database import AdvancedDatabase
 from datetime import datetime
 import time
 import argparse
@@ -20,9 +20,21 @@ import argparse
 class MarketScanner:
     """市場全体をスキャンして価格データを収集"""
 
-    def __init__(self):
+    def __init__(self, synchronous: str = 'NORMAL', save_to_sqlite: bool = False):
+        """
+        Parameters:
+        - synchronous: SQLiteのfsync設定（OFF / NORMAL / FULL / EXTRA）
+        - save_to_sqlite: スナップショットストアに加えて price_snapshots テーブルにも保存するか
+        """
+        # requests / pandas を含む重い依存は、--help などで起動時間を払わないよう使う時に読み込む
+        from src.config.exchange_api import MEXCAPI
+        from src.data.advanced_database import AdvancedDatabase
+        from src.data.snapshot_store import SnapshotStore
+
         self.api = MEXCAPI()
-        self.db = AdvancedDatabase()
+        self.db = AdvancedDatabase(synchronous=synchronous)
+        self.store = SnapshotStore()
+        self.save_to_sqlite = save_to_sqlite
 
     def scan_all_markets(self, min_volume: float = 10000):
         """
@@ -30,6 +42,9 @@ class MarketScanner:
 
         Parameters:
         - min_volume: 最低出来高（USDT）
+
+        Returns:
+        - {'saved', 'skipped', 'store_ms', 'sqlite_ms'}（取得失敗時はNone、SQLiteに保存しない場合 sqlite_ms はNone）
         """
         print("="*80)
         print("🔍 全銘柄市場スキャン開始")
@@ -38,13 +53,9 @@ class MarketScanner:
 
         # 全銘柄の24h統計を取得
         print("📊 全銘柄データ取得中...")
-        url = f'{self.api.BASE_URL}/api/v3/ticker/24hr'
 
         try:
-            import requests
-            response = requests.get(url)
-            response.raise_for_status()
-            all_tickers = response.json()
+            all_tickers = self.api.get_all_tickers()
         except Exception as e:
             print(f"❌ データ取得エラー: {e}")
             return
@@ -58,47 +69,52 @@ class MarketScanner:
         print(f"✓ 取得完了: {len(usdt_pairs)}銘柄（出来高 >= ${min_volume:,.0f}）")
         print()
 
-        # DBに保存
-        print("💾 データベース保存中...")
-        saved_count = 0
+        # 変換してからまとめて保存
+        print("💾 データ保存中...")
+        rows = []
         skipped_count = 0
 
         for item in usdt_pairs:
             try:
-                symbol = item['symbol'].replace('USDT', '')
-                price = float(item['lastPrice'])
-                change_24h = float(item['priceChangePercent'])
-                volume = float(item['volume'])
-                quote_volume = float(item['quoteVolume'])
-                high_24h = float(item['highPrice'])
-                low_24h = float(item['lowPrice'])
-
-                self.db.save_price_snapshot(
-                    symbol=symbol,
-                    price=price,
-                    change_24h=change_24h,
-                    volume=volume,
-                    quote_volume=quote_volume,
-                    high_24h=high_24h,
-                    low_24h=low_24h
-                )
-                saved_count += 1
-
-                if saved_count % 50 == 0:
-                    print(f"   処理中: {saved_count}/{len(usdt_pairs)}...")
-
+                rows.append({
+                    'symbol': item['symbol'].replace('USDT', ''),
+                    'price': float(item['lastPrice']),
+                    'change_24h': float(item['priceChangePercent']),
+                    'volume': float(item['volume']),
+                    'quote_volume': float(item['quoteVolume']),
+                    'high_24h': float(item['highPrice']),
+                    'low_24h': float(item['lowPrice']),
+                })
             except Exception as e:
                 skipped_count += 1
                 # エラーは無視して続行
 
+        # スナップショットストア（Parquet、1スキャン = 1ファイル）に保存
+        store_start = time.perf_counter()
+        saved_count = self.store.save_snapshot(rows)
+        store_ms = (time.perf_counter() - store_start) * 1000
+
+        # SQLite（price_snapshots）には全銘柄を1トランザクションで一括保存
+        sqlite_ms = None
+        if self.save_to_sqlite:
+            sqlite_start = time.perf_counter()
+            self.db.save_price_snapshots(rows)
+            sqlite_ms = (time.perf_counter() - sqlite_start) * 1000
+
         print()
         print("="*80)
         print("✅ スキャン完了")
         print("="*80)
-        print(f"保存: {saved_count}銘柄")
+        print(f"保存: {saved_count}銘柄（スナップショット {store_ms:.0f}ms"
+              + (f" / SQLite {sqlite_ms:.0f}ms）" if sqlite_ms is not None else "）"))
         print(f"スキップ: {skipped_count}銘柄")
+        for path, stats in self.api.get_latency_stats().items():
+            print(f"API {path}: 平均 {stats['avg_ms']:.0f}ms / 最大 {stats['max_ms']:.0f}ms "
+                  f"({stats['count']}回, リトライ {stats['retries']}回)")
         print()
 
+        return {'saved': saved_count, 'skipped': skipped_count, 'store_ms': store_ms, 'sqlite_ms': sqlite_ms}
+
     def show_top_movers(self, limit: int = 20):
         """変動率トップを表示"""
         print("="*80)
@@ -106,24 +122,10 @@ class MarketScanner:
         print("="*80)
         print()
 
-        # DBから最新データを取得
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            SELECT
-                symbol,
-                price,
-                change_24h,
-                quote_volume,
-                timestamp
-            FROM price_snapshots
-            WHERE timestamp >= datetime('now', '-1 hour')
-            ORDER BY change_24h DESC
-            LIMIT ?
-        ''', (limit,))
-
-        rows = cursor.fetchall()
-
-        if not rows:
+        # 最新値テーブル（直近1時間）から取得
+        rows = self.store.top_movers(limit=limit)
+
+        if rows.empty:
             print("⚠️ データがありません。先にスキャンを実行してください。")
             print("   python tools/market_scanner.py --scan")
             return
@@ -131,11 +133,10 @@ class MarketScanner:
         print(f"{'順位':<4} {'銘柄':<8} {'価格':<15} {'24h変動':<10} {'出来高(USDT)':<15}")
         print("-"*80)
 
-        for i, row in enumerate(rows, 1):
-            symbol = row[0]
-            price = row[1]
-            change = row[2]
-            volume = row[3]
+        for i, (symbol, row) in enumerate(rows.iterrows(), 1):
+            price = row['price']
+            change = row['change_24h']
+            volume = row['quote_volume']
 
             change_emoji = "🔥" if change >= 10 else "📈" if change >= 5 else "➡️"
 
@@ -150,34 +151,19 @@ class MarketScanner:
         print("="*80)
         print()
 
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            SELECT
-                symbol,
-                price,
-                change_24h,
-                quote_volume,
-                timestamp
-            FROM price_snapshots
-            WHERE timestamp >= datetime('now', '-1 hour')
-            ORDER BY quote_volume DESC
-            LIMIT ?
-        ''', (limit,))
-
-        rows = cursor.fetchall()
-
-        if not rows:
+        rows = self.store.top_volume(limit=limit)
+
+        if rows.empty:
             print("⚠️ データがありません。先にスキャンを実行してください。")
             return
 
         print(f"{'順位':<4} {'銘柄':<8} {'価格':<15} {'24h変動':<10} {'出来高(USDT)':<15}")
         print("-"*80)
 
-        for i, row in enumerate(rows, 1):
-            symbol = row[0]
-            price = row[1]
-            change = row[2]
-            volume = row[3]
+        for i, (symbol, row) in enumerate(rows.iterrows(), 1):
+            price = row['price']
+            change = row['change_24h']
+            volume = row['quote_volume']
 
             change_str = f"{change:+.2f}%"
 
@@ -192,24 +178,9 @@ class MarketScanner:
         print("="*80)
         print()
 
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            SELECT
-                symbol,
-                price,
-                change_24h,
-                quote_volume,
-                high_24h,
-                low_24h,
-                timestamp
-            FROM price_snapshots
-            WHERE symbol LIKE ? AND timestamp >= datetime('now', '-1 hour')
-            ORDER BY quote_volume DESC
-        ''', (f'%{query.upper()}%',))
-
-        rows = cursor.fetchall()
-
-        if not rows:
+        rows = self.store.search(query)
+
+        if rows.empty:
             print(f"⚠️ '{query}'に該当する銘柄が見つかりませんでした。")
             print()
             print("💡 ヒント:")
@@ -220,14 +191,13 @@ class MarketScanner:
         print(f"見つかった銘柄: {len(rows)}件")
         print()
 
-        for row in rows:
-            symbol = row[0]
-            price = row[1]
-            change = row[2]
-            volume = row[3]
-            high = row[4]
-            low = row[5]
-            timestamp = row[6]
+        for symbol, row in rows.iterrows():
+            price = row['price']
+            change = row['change_24h']
+            volume = row['quote_volume']
+            high = row['high_24h']
+            low = row['low_24h']
+            timestamp = row['scan_time'].strftime('%Y-%m-%d %H:%M:%S')
 
             print(f"📊 {symbol}")
             print(f"   価格: ${price:,.8f}")
@@ -249,6 +219,7 @@ def main():
   python tools/market_scanner.py --top-volume        # 出来高ランキング
   python tools/market_scanner.py --search BTC        # 銘柄検索
   python tools/market_scanner.py --scan --show-all   # スキャン後に全て表示
+  python tools/market_scanner.py --compact           # 古いスナップショットを1時間ごとに間引く
         '''
     )
 
@@ -259,10 +230,17 @@ def main():
     parser.add_argument('--min-volume', type=float, default=10000, help='最低出来高（USDT）')
     parser.add_argument('--limit', type=int, default=20, help='表示件数')
     parser.add_argument('--show-all', action='store_true', help='スキャン後に全ランキング表示')
+    parser.add_argument('--synchronous', type=str, default='NORMAL',
+                        choices=['OFF', 'NORMAL', 'FULL', 'EXTRA'], help='SQLiteのfsync設定（--sqlite 指定時）')
+    parser.add_argument('--sqlite', action='store_true',
+                        help='スナップショットをSQLite（price_snapshots）にも保存')
+    parser.add_argument('--compact', action='store_true', help='古いスナップショットを間引いて圧縮')
+    parser.add_argument('--raw-days', type=int, default=7, help='間引かずに残す日数（--compact）')
+    parser.add_argument('--retention-days', type=int, default=365, help='保持日数（--compact）')
 
     args = parser.parse_args()
 
-    scanner = MarketScanner()
+    scanner = MarketScanner(synchronous=args.synchronous, save_to_sqlite=args.sqlite)
 
     # スキャン実行
     if args.scan:
@@ -286,6 +264,13 @@ def main():
     elif args.search:
         scanner.search_symbol(args.search)
 
+    # スナップショットの圧縮・保持期間処理
+    elif args.compact:
+        result = scanner.store.compact(raw_days=args.raw_days, retention_days=args.retention_days)
+        print(f"✅ 圧縮完了: {result['compacted_days']}日分 "
+              f"({result['rows_before']:,}行 → {result['rows_after']:,}行), "
+              f"削除: {result['deleted_days']}日分")
+
     # 引数なし：ヘルプ表示
     else:
         parser.print_help()
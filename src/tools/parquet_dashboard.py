@@ -494,14 +494,15 @@ def show_forecast(df, symbol):
     # 予測実行ボタン
     if st.button("🔮 7日間の価格とリスクを予測", key="run_forecast"):
         with st.spinner("予測計算中...（20-30秒かかります）"):
-            engine = ForecastingEngine()
-
             # 全データを読み込み（予測精度向上のため）
             storage = get_storage()
             full_df = storage.load_price_data(symbol, '1d')
 
+            # 選択したARIMA次数は銘柄ごとにキャッシュし、新しいデータがたまるまで再利用
+            engine = ForecastingEngine(stats_dir=storage.stats_dir)
+
             if len(full_df) >= 100:
-                result = engine.combined_forecast(full_df, periods=7)
+                result = engine.combined_forecast(full_df, periods=7, symbol=symbol, interval='1d')
 
                 # 予測説明
                 st.markdown(engine.explain_forecast(result))
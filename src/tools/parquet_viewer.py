@@ -7,21 +7,25 @@ Parquet閲覧CLIツール
 import sys
 import os
 import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+if (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 # ルートディレクトリをパスに追加
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-import pandas as pd
 from pathlib import Path
 import argparse
 from datetime import datetime
-from src.data.timeseries_storage import TimeSeriesStorage
+from src.lazy_import import lazy_import
+
+# --help などで読み込み時間を払わないよう、最初に使う時に読み込む
+pd = lazy_import('pandas')
 
 
 class ParquetViewer:
     """Parquetデータビューア"""
 
     def __init__(self):
+        from src.data.timeseries_storage import TimeSeriesStorage
         self.storage = TimeSeriesStorage()
 
     def list_all(self):
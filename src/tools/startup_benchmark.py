@@ -0,0 +1,207 @@
+"""
+CLI起動時間ベンチマーク
+
+各エントリーポイントを `python -X importtime -m <module> --help` で起動し、
+import にかかった時間を予算と比較する。cron から何度も起動するツールが
+pandas / requests などの重いライブラリを起動時に読み込むようになったら失敗する。
+
+    python -m src.tools.startup_benchmark              # 全エントリーポイント
+    python -m src.tools.startup_benchmark --entry crypto_analyst --verbose
+
+予算を超えた、または禁止モジュールを読み込んだエントリーポイントがあれば終了コード1
+"""
+
+import sys
+import os
+import io
+if (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+
+# リポジトリのルート（-m で起動するためのカレントディレクトリ）
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# --help で読み込まれてはいけないモジュール（トップレベルのパッケージ名）
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'requests', 'aiohttp',
+                 'torch', 'statsmodels', 'arch', 'sklearn', 'plotly', 'streamlit')
+
+# エントリーポイントと起動時間の予算（ミリ秒、インタプリタ自体の起動分を除く）
+ENTRY_POINTS = {
+    'crypto_analyst': {'module': 'src.crypto_analyst', 'args': ['--help'], 'budget_ms': 50},
+    'market_scanner': {'module': 'src.tools.market_scanner', 'args': ['--help'], 'budget_ms': 30},
+    'auto_market_updater': {'module': 'src.tools.auto_market_updater', 'args': ['--help'], 'budget_ms': 30},
+    'parquet_viewer': {'module': 'src.tools.parquet_viewer', 'args': ['--help'], 'budget_ms': 30},
+    'news_fetcher': {'module': 'src.tools.news_fetcher', 'args': ['--help'], 'budget_ms': 40},
+    'minute_data_collector': {'module': 'src.data.minute_data_collector', 'args': ['--help'], 'budget_ms': 50},
+    'detailed_data_collector': {'module': 'src.data.detailed_data_collector', 'args': ['--help'], 'budget_ms': 40},
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    -X importtime の出力を解析
+
+    Returns:
+        [{'module', 'self_us', 'cumulative_us', 'depth'}]（出力順 = 読み込み完了順）
+    """
+    records = []
+
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # ヘッダー行
+
+        name = parts[2]
+        # 名前の前は空白1つ + 階層ごとに2つ
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        records.append({
+            'module': name.strip(),
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1]),
+            'depth': depth,
+        })
+
+    return records
+
+
+def run_importtime(argv: List[str]) -> List[Dict]:
+    """
+    python -X importtime でコマンドを実行して import 記録を取得
+
+    Args:
+        argv: python に渡す引数（例: ['-m', 'src.crypto_analyst', '--help']）
+
+    Raises:
+        RuntimeError: コマンドが異常終了した場合
+    """
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    # .pyc を書けるようにして、2回目以降の計測にコンパイル時間を含めない
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + argv,
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, encoding='utf-8', errors='replace'
+    )
+
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''
+        raise RuntimeError(f"終了コード {result.returncode}: {last_line}")
+
+    return parse_importtime(result.stderr)
+
+
+def measure_baseline() -> set:
+    """インタプリタ起動だけで読み込まれるトップレベルのモジュール（site など）"""
+    return {r['module'] for r in run_importtime(['-c', 'pass']) if r['depth'] == 0}
+
+
+def measure_entry(module: str, args: List[str], baseline: set, repeat: int = 3) -> Dict:
+    """
+    エントリーポイントの import 時間を計測（repeat回のうち最小値）
+
+    Returns:
+        {'total_ms', 'heavy', 'slowest'}
+            total_ms: インタプリタ起動分を除いた import 時間
+            heavy: 読み込まれた HEAVY_MODULES
+            slowest: トップレベルで重かった import [(モジュール名, ミリ秒)]
+    """
+    best = None
+
+    for _ in range(max(1, repeat)):
+        records = run_importtime(['-m', module] + args)
+        top_level = [r for r in records if r['depth'] == 0 and r['module'] not in baseline]
+        total_us = sum(r['cumulative_us'] for r in top_level)
+
+        if best is None or total_us < best['total_us']:
+            loaded = {r['module'].split('.')[0] for r in records}
+            best = {
+                'total_us': total_us,
+                'heavy': sorted(loaded & set(HEAVY_MODULES)),
+                'slowest': sorted(((r['module'], r['cumulative_us'] / 1000) for r in top_level),
+                                  key=lambda item: item[1], reverse=True)[:5],
+            }
+
+    return {
+        'total_ms': best['total_us'] / 1000,
+        'heavy': best['heavy'],
+        'slowest': best['slowest'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='CLI起動時間ベンチマーク（import時間の予算チェック）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python -m src.tools.startup_benchmark                          # 全エントリーポイント
+  python -m src.tools.startup_benchmark --entry crypto_analyst   # 1つだけ
+  python -m src.tools.startup_benchmark --verbose                # 重い import の内訳も表示
+  python -m src.tools.startup_benchmark --scale 2                # 遅いマシン向けに予算を2倍
+        '''
+    )
+    parser.add_argument('--entry', action='append', choices=sorted(ENTRY_POINTS),
+                        help='計測するエントリーポイント（複数指定可、省略時は全て）')
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（最小値を採用、デフォルト: 3）')
+    parser.add_argument('--scale', type=float, default=1.0, help='予算の倍率（デフォルト: 1.0）')
+    parser.add_argument('--verbose', action='store_true', help='重いimportの内訳を表示')
+
+    args = parser.parse_args()
+    entries = args.entry or list(ENTRY_POINTS)
+
+    print("=" * 80)
+    print("⏱️  CLI起動時間ベンチマーク（python -X importtime）")
+    print("=" * 80)
+    print()
+
+    baseline = measure_baseline()
+    failures = 0
+
+    for name in entries:
+        entry = ENTRY_POINTS[name]
+        budget_ms = entry['budget_ms'] * args.scale
+
+        try:
+            result = measure_entry(entry['module'], entry['args'], baseline, args.repeat)
+        except RuntimeError as e:
+            print(f"[ERROR] {name}: 起動に失敗 ({e})")
+            failures += 1
+            continue
+
+        problems = []
+        if result['total_ms'] > budget_ms:
+            problems.append(f"予算超過 (+{result['total_ms'] - budget_ms:.1f}ms)")
+        if result['heavy']:
+            problems.append(f"重いモジュールを読み込み: {', '.join(result['heavy'])}")
+
+        status = '[NG]' if problems else '[OK]'
+        print(f"{status} {name:<25} {result['total_ms']:7.1f}ms / 予算 {budget_ms:.0f}ms"
+              + (f"  ← {' / '.join(problems)}" if problems else ''))
+
+        if args.verbose or problems:
+            for module, ms in result['slowest']:
+                print(f"       {module:<40} {ms:7.1f}ms")
+
+        if problems:
+            failures += 1
+
+    print()
+    if failures:
+        print(f"❌ {failures}件のエントリーポイントが予算を超えました")
+        sys.exit(1)
+
+    print("✅ 全エントリーポイントが予算内です")
+
+
+if __name__ == '__main__':
+    main()